@@ -0,0 +1,134 @@
+import hashlib
+from collections import OrderedDict
+
+class CachedResponse:
+    """
+    Serialized response body with its strong ETag
+    """
+    
+    def __init__(self, body, media_type):
+        self.body = body
+        self.media_type = media_type
+        self.etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+    
+    def matches(self, if_none_match):
+        """
+        Check an If-None-Match header against the ETag
+        
+        Args:
+            if_none_match (str): Header value, possibly a list of ETags
+        
+        Returns:
+            bool: True if the client already has this body
+        """
+        if not if_none_match:
+            return False
+        tags = [tag.strip() for tag in if_none_match.split(',')]
+        return '*' in tags or self.etag in tags
+
+class ResponseCache:
+    """
+    LRU cache of serialized API responses with a memory budget
+    
+    Entries are keyed by path and normalized query parameters and belong
+    to one dataset version; the whole cache is dropped as soon as a
+    request sees a different version.
+    """
+    
+    def __init__(self, max_entries=1024, max_bytes=64 * 1024 * 1024):
+        """
+        Initialize the cache
+        
+        Args:
+            max_entries (int): Maximum number of cached responses
+            max_bytes (int): Maximum total size of the cached bodies
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.version = None
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+    
+    @staticmethod
+    def make_key(path, query_items):
+        """
+        Build a cache key from a path and its query parameters
+        
+        Parameters are sorted and empty values dropped, since the endpoints
+        treat an empty parameter like a missing one.
+        
+        Args:
+            path (str): Request path
+            query_items (list): (name, value) pairs of the query string
+        
+        Returns:
+            tuple: Cache key
+        """
+        return (path, tuple(sorted((name, value) for name, value in query_items if value != '')))
+    
+    def _check_version(self, version):
+        if version != self.version:
+            self._entries.clear()
+            self.size = 0
+            self.version = version
+    
+    def get(self, key, version):
+        """
+        Get a cached response
+        
+        Args:
+            key (tuple): Cache key
+            version (str): Current dataset version
+        
+        Returns:
+            CachedResponse: Cached response, or None on a miss
+        """
+        self._check_version(version)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+    
+    def put(self, key, version, body, media_type):
+        """
+        Store a response, evicting the least recently used ones if needed
+        
+        Args:
+            key (tuple): Cache key
+            version (str): Dataset version the body was computed from
+            body (bytes): Serialized body
+            media_type (str): Media type of the body
+        
+        Returns:
+            CachedResponse: The stored entry
+        """
+        entry = CachedResponse(body, media_type)
+        self._check_version(version)
+        
+        # Bodies larger than the whole budget are served but not kept
+        if len(body) > self.max_bytes:
+            return entry
+        
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self.size -= len(previous.body)
+        
+        self._entries[key] = entry
+        self.size += len(body)
+        
+        while self.size > self.max_bytes or len(self._entries) > self.max_entries:
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= len(evicted.body)
+            self.evictions += 1
+        
+        return entry
+    
+    def __len__(self):
+        return len(self._entries)
\ No newline at end of file
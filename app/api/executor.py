@@ -0,0 +1,126 @@
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from app.utils.profiling import bind_thread
+
+class PoolSaturatedError(Exception):
+    """Raised when every worker is busy and the queue is full"""
+
+class PoolTimeoutError(Exception):
+    """Raised when a call does not finish within the request timeout"""
+
+# Backend objects of a process-pool worker, built once by _init_worker
+_worker_targets = {}
+
+def _init_worker(factory, args):
+    _worker_targets.update(factory(*args))
+
+def _call_target(name, method, args, kwargs):
+    return getattr(_worker_targets[name], method)(*args, **kwargs)
+
+class WorkerPool:
+    """
+    Bounded pool that runs blocking analytics calls off the event loop
+    
+    At most ``max_workers`` calls run at once and at most ``max_queue``
+    more wait for a worker; further calls are rejected immediately with
+    PoolSaturatedError instead of piling up. In thread mode calls run
+    against the shared backend objects. In process mode every worker
+    builds its own backend with ``factory`` and bound methods of
+    registered objects are dispatched to it by name.
+    """
+    
+    def __init__(self, kind='thread', max_workers=4, max_queue=32, timeout=30.0, factory=None, factory_args=()):
+        """
+        Initialize the pool
+        
+        Args:
+            kind (str): 'thread' or 'process'
+            max_workers (int): Number of workers
+            max_queue (int): Number of calls allowed to wait for a worker
+            timeout (float): Seconds a request waits for its call
+            factory (callable, optional): Builds the backend of a process
+                worker; must return a dict of named objects
+            factory_args (tuple, optional): Arguments for the factory
+        """
+        if kind not in ('thread', 'process'):
+            raise ValueError(f"Unknown executor kind: {kind}")
+        if kind == 'process' and factory is None:
+            raise ValueError("A process pool needs a backend factory")
+        
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self._names = {}
+        
+        if kind == 'thread':
+            self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='analytics')
+        else:
+            self._executor = ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=_init_worker,
+                initargs=(factory, factory_args)
+            )
+    
+    def register(self, name, target):
+        """
+        Register a backend object so process workers can resolve its methods
+        
+        Args:
+            name (str): Name of the object in the factory result
+            target: Object in this process
+        """
+        self._names[id(target)] = name
+    
+    async def run(self, fn, *args, **kwargs):
+        """
+        Run a blocking call in the pool
+        
+        Args:
+            fn (callable): Function or bound method of a registered object
+            *args: Positional arguments for the call
+            **kwargs: Keyword arguments for the call
+        
+        Returns:
+            Result of the call
+        
+        Raises:
+            PoolSaturatedError: If all workers and queue slots are taken
+            PoolTimeoutError: If the call takes longer than the timeout
+        """
+        if not self._slots.acquire(blocking=False):
+            raise PoolSaturatedError("All analytics workers are busy")
+        
+        try:
+            future = self._submit(fn, args, kwargs)
+        except BaseException:
+            self._slots.release()
+            raise
+        
+        # The slot is held until the call really finishes, even after a timeout
+        future.add_done_callback(lambda _: self._slots.release())
+        
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+        except asyncio.TimeoutError:
+            raise PoolTimeoutError(f"Request did not finish within {self.timeout:g} seconds")
+    
+    def _submit(self, fn, args, kwargs):
+        if self.kind == 'thread':
+            # Keep context variables of the request visible in the worker
+            context = contextvars.copy_context()
+            return self._executor.submit(context.run, bind_thread(functools.partial(fn, *args, **kwargs)))
+        
+        target = getattr(fn, '__self__', None)
+        name = self._names.get(id(target))
+        if name is None:
+            raise ValueError(f"{fn!r} is not a method of a registered backend object")
+        return self._executor.submit(_call_target, name, fn.__name__, args, kwargs)
+    
+    def shutdown(self):
+        """Stop accepting calls and release the workers"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
\ No newline at end of file
@@ -1,7 +1,19 @@
-from fastapi import APIRouter, Query, HTTPException, Body
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Query, HTTPException, Body, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from typing import Optional, List, Dict, Any
 from pydantic import BaseModel
+import io
+import json
+import base64
+import hashlib
+import pandas as pd
+from app.api.executor import WorkerPool, PoolSaturatedError, PoolTimeoutError
+from app.api.cache import ResponseCache
+from app.api.serialization import FrameResponse, FRAME_FORMATS
+from app.utils.metrics import registry
+from app.utils.profiling import is_profiling
+from app.config import settings as default_settings
 
 class YieldPredictionInput(BaseModel):
     region: str
@@ -10,15 +22,203 @@ class YieldPredictionInput(BaseModel):
     irrigation: float
     fertilizer: float
 
-def setup_routes(app, data_processor, yield_analyzer):
+# GET endpoints whose responses only depend on the query and the dataset
+CACHED_PATHS = {
+    '/api/regions', '/api/crops', '/api/soil-types', '/api/seasons',
+    '/api/yield-by-region', '/api/yield-by-factor', '/api/yield-trend',
+    '/api/correlation-matrix', '/api/factor-impact', '/api/factor-impact/all',
+    '/api/regional-insights', '/api/crop-insights', '/api/improvement-strategies',
+    '/api/dashboard/region', '/api/dashboard/crop', '/api/drilldown'
+}
+
+# Columns of /api/rows filters and the query parameters that set them
+ROW_FILTERS = {
+    'region': 'Agro-Climatic Zone',
+    'crop': 'Crop',
+    'season': 'Season',
+    'soil': 'Soil Type',
+    'state': 'State',
+    'district': 'District'
+}
+
+# Drill-down levels of /api/drilldown, from the top
+GEO_LEVELS = {
+    'zone': 'Agro-Climatic Zone',
+    'state': 'State',
+    'district': 'District'
+}
+
+# Sort keys of /api/drilldown and the columns they sort by
+GEO_SORT_KEYS = {
+    'yield': 'Average Yield',
+    'weighted_yield': 'Weighted Yield',
+    'area': 'Area (ha)',
+    'production': 'Production (tonnes)',
+    'count': 'Sample Count'
+}
+
+def _encode_cursor(version, offset, query_hash):
+    payload = json.dumps({'v': version, 'o': offset, 'q': query_hash}).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip('=')
+
+def _decode_cursor(cursor):
+    """
+    Decode a pagination cursor of /api/rows
+    
+    Args:
+        cursor (str): Cursor from the X-Next-Cursor header
+        
+    Returns:
+        dict: Dataset version 'v', candidate offset 'o' and query hash 'q'
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        if not isinstance(payload.get('o'), int) or payload['o'] < 0:
+            raise ValueError
+        return payload
+    except (ValueError, TypeError, AttributeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def _serialize_rows(chunks, fmt, columns):
+    """
+    Serialize dataframe chunks to CSV or NDJSON as they are produced
+    
+    Args:
+        chunks (iterable): DataFrames of rows
+        fmt (str): 'csv' or 'ndjson'
+        columns (list): Dataset columns, for the header of an empty CSV
+        
+    Yields:
+        bytes: Serialized chunk
+    """
+    header = True
+    for chunk in chunks:
+        if fmt == 'csv':
+            yield chunk.to_csv(index=False, header=header).encode()
+            header = False
+        elif len(chunk):
+            yield (chunk.to_json(orient='records', lines=True).rstrip('\n') + '\n').encode()
+            
+    if fmt == 'csv' and header:
+        yield pd.DataFrame(columns=columns).to_csv(index=False).encode()
+
+def _check_frame_format(fmt):
+    if fmt not in FRAME_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Format must be one of {', '.join(FRAME_FORMATS)}")
+
+def _is_ndjson(request):
+    content_type = request.headers.get('content-type', '')
+    return 'ndjson' in content_type or 'jsonlines' in content_type
+
+async def _read_ndjson(request, max_rows):
+    """
+    Parse a newline-delimited JSON body as it streams in
+    
+    Args:
+        request: Incoming request
+        max_rows (int): Maximum number of rows accepted
+        
+    Returns:
+        list: Parsed rows; None for lines that are not valid JSON
+    """
+    records = []
+    buffer = b''
+    
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b'\n')
+        for line in lines:
+            _append_json_line(records, line)
+        if len(records) > max_rows:
+            raise HTTPException(status_code=413, detail=f"Batch is limited to {max_rows} rows")
+            
+    _append_json_line(records, buffer)
+    return records
+
+def _append_json_line(records, line):
+    line = line.strip()
+    if not line:
+        return
+    try:
+        records.append(json.loads(line))
+    except ValueError:
+        records.append(None)
+
+def setup_routes(app, data_processor, yield_analyzer, executor=None, cache=None, settings=None):
     """
     Set up all API routes
     
+    Analytics and prediction calls run in a bounded worker pool so a slow
+    call never blocks the event loop. Requests get a 503 when the pool is
+    saturated and a 504 when their call exceeds the request timeout.
+    Responses of the analytics endpoints are cached per dataset version
+    and carry strong ETags, so repeated requests are answered without
+    recomputation and revalidations get a 304.
+    
     Args:
         app: FastAPI application
         data_processor: DataProcessor instance
         yield_analyzer: YieldAnalyzer instance
+        executor (WorkerPool, optional): Pool for blocking calls; a thread
+            pool configured from the settings is created when omitted
+        cache (ResponseCache, optional): Response cache; one configured
+            from the settings is created when omitted
+        settings (Settings, optional): Application settings, read from the
+            environment when omitted
     """
+    settings = settings or default_settings
+    if executor is None:
+        executor = WorkerPool(
+            kind='thread',
+            max_workers=settings.max_workers,
+            max_queue=settings.max_queue,
+            timeout=settings.request_timeout
+        )
+    executor.register('data_processor', data_processor)
+    executor.register('yield_analyzer', yield_analyzer)
+    
+    @app.exception_handler(PoolSaturatedError)
+    async def pool_saturated_handler(request, exc):
+        return JSONResponse(status_code=503, content={"error": str(exc)}, headers={"Retry-After": "1"})
+    
+    @app.exception_handler(PoolTimeoutError)
+    async def pool_timeout_handler(request, exc):
+        return JSONResponse(status_code=504, content={"error": str(exc)})
+    
+    @app.on_event("shutdown")
+    async def shutdown_executor():
+        executor.shutdown()
+    
+    if cache is None:
+        cache = ResponseCache(max_entries=settings.cache_max_entries, max_bytes=settings.cache_max_bytes)
+    
+    registry.callback('agri_response_cache_entries', 'Responses held by the response cache', lambda: len(cache._entries))
+    registry.callback('agri_response_cache_bytes', 'Size of the cached response bodies', lambda: cache.size)
+    registry.callback('agri_response_cache_hits', 'Responses served from the cache', lambda: cache.hits, kind='counter')
+    registry.callback('agri_response_cache_misses', 'Cacheable requests that missed the cache', lambda: cache.misses, kind='counter')
+    registry.callback('agri_response_cache_evictions', 'Responses evicted from the cache', lambda: cache.evictions, kind='counter')
+    
+    @app.middleware("http")
+    async def response_cache_middleware(request, call_next):
+        # Profiled requests always run their handler
+        if request.method != 'GET' or request.url.path not in CACHED_PATHS or is_profiling():
+            return await call_next(request)
+            
+        key = ResponseCache.make_key(request.url.path, request.query_params.multi_items())
+        version = getattr(data_processor, 'version', None)
+        entry = cache.get(key, version)
+        
+        if entry is None:
+            response = await call_next(request)
+            if response.status_code != 200:
+                return response
+            body = b''.join([chunk async for chunk in response.body_iterator])
+            entry = cache.put(key, version, body, response.media_type or response.headers.get('content-type'))
+            
+        headers = {'ETag': entry.etag, 'Cache-Control': 'no-cache'}
+        if entry.matches(request.headers.get('if-none-match')):
+            return Response(status_code=304, headers=headers)
+        return Response(content=entry.body, media_type=entry.media_type, headers=headers)
     
     @app.get("/api/regions", response_model=List[str])
     async def api_regions():
@@ -45,18 +245,25 @@ def setup_routes(app, data_processor, yield_analyzer):
         return seasons
     
     @app.get("/api/yield-by-region", response_model=List[Dict[str, Any]])
-    async def api_yield_by_region(crop: Optional[str] = None):
+    async def api_yield_by_region(
+        crop: Optional[str] = None,
+        format: str = Query('records', description="Response layout: 'records' or 'columnar'")
+    ):
         """Get average yield by region"""
-        data = data_processor.get_yield_by_region(crop=crop)
-        return data.to_dict(orient='records')
+        _check_frame_format(format)
+        data = await executor.run(data_processor.get_yield_by_region, crop=crop)
+        return FrameResponse(data, format)
     
     @app.get("/api/yield-by-factor", response_model=List[Dict[str, Any]])
     async def api_yield_by_factor(
         factor: str = Query(..., description="Factor to group by"),
         region: Optional[str] = None,
-        crop: Optional[str] = None
+        crop: Optional[str] = None,
+        bins: int = Query(5, ge=1, le=50, description="Number of quantile bins for numeric factors"),
+        format: str = Query('records', description="Response layout: 'records' or 'columnar'")
     ):
         """Get yield data grouped by a specific factor"""
+        _check_frame_format(format)
         if not factor:
             raise HTTPException(status_code=400, detail="Factor parameter is required")
         
@@ -72,8 +279,10 @@ def setup_routes(app, data_processor, yield_analyzer):
                     }
                 )
                 
-            data = data_processor.get_yield_by_factor(factor, region=region, crop=crop)
-            return data.to_dict(orient='records')
+            data = await executor.run(data_processor.get_yield_by_factor, factor, region=region, crop=crop, bins=bins)
+            return FrameResponse(data, format)
+        except (PoolSaturatedError, PoolTimeoutError):
+            raise
         except Exception as e:
             return JSONResponse(
                 status_code=500,
@@ -83,11 +292,13 @@ def setup_routes(app, data_processor, yield_analyzer):
     @app.get("/api/yield-trend", response_model=List[Dict[str, Any]])
     async def api_yield_trend(
         region: Optional[str] = None,
-        crop: Optional[str] = None
+        crop: Optional[str] = None,
+        format: str = Query('records', description="Response layout: 'records' or 'columnar'")
     ):
         """Get yield trend over years"""
-        data = data_processor.get_yield_trend(region=region, crop=crop)
-        return data.to_dict(orient='records')
+        _check_frame_format(format)
+        data = await executor.run(data_processor.get_yield_trend, region=region, crop=crop)
+        return FrameResponse(data, format)
     
     @app.get("/api/correlation-matrix", response_model=Dict[str, Dict[str, float]])
     async def api_correlation_matrix(
@@ -95,8 +306,8 @@ def setup_routes(app, data_processor, yield_analyzer):
         crop: Optional[str] = None
     ):
         """Get correlation matrix between yield and factors"""
-        data = data_processor.get_correlation_matrix(region=region, crop=crop)
-        return data.to_dict()
+        data = await executor.run(data_processor.get_correlation_matrix, region=region, crop=crop)
+        return FrameResponse(data, 'columns')
     
     @app.get("/api/factor-impact", response_model=Dict[str, float])
     async def api_factor_impact(
@@ -104,9 +315,57 @@ def setup_routes(app, data_processor, yield_analyzer):
         crop: Optional[str] = None
     ):
         """Get the impact of each factor on yield"""
-        data = data_processor.get_factor_impact(region=region, crop=crop)
+        data = await executor.run(data_processor.get_factor_impact, region=region, crop=crop)
         return data
     
+    @app.get("/api/factor-impact/all", response_model=List[Dict[str, Any]])
+    async def api_factor_impact_all(
+        format: str = Query('records', description="Response layout: 'records' or 'columnar'")
+    ):
+        """Get the impact of each factor on yield for every region and crop"""
+        _check_frame_format(format)
+        data = await executor.run(data_processor.get_all_factor_impacts)
+        return FrameResponse(data, format)
+    
+    @app.get("/api/drilldown", response_model=Dict[str, Any])
+    async def api_drilldown(
+        level: str = Query('zone', description="Level to list: 'zone', 'state' or 'district'"),
+        zone: Optional[str] = None,
+        state: Optional[str] = None,
+        crop: Optional[str] = None,
+        sort: Optional[str] = Query(None, description="Sort key; zone, state and district order by default"),
+        order: Optional[str] = Query(None, description="'asc' or 'desc'; descending for sort keys by default"),
+        offset: int = Query(0, ge=0),
+        limit: int = Query(100, ge=1, le=1000),
+        format: str = Query('records', description="Items layout: 'records' or 'columnar'")
+    ):
+        """
+        Get the yield and production of the zones, states or districts
+        
+        The zone narrows states and districts, and the state narrows
+        districts. Groups come from precomputed per-level totals, so a
+        top-N ranking reads no rows.
+        """
+        _check_frame_format(format)
+        if level not in GEO_LEVELS:
+            raise HTTPException(status_code=400, detail=f"Level must be one of {', '.join(GEO_LEVELS)}")
+        if sort is not None and sort not in GEO_SORT_KEYS:
+            raise HTTPException(status_code=400, detail=f"Sort must be one of {', '.join(GEO_SORT_KEYS)}")
+        if order not in (None, 'asc', 'desc'):
+            raise HTTPException(status_code=400, detail="Order must be asc or desc")
+            
+        depth = list(GEO_LEVELS).index(level)
+        if (zone and depth < 1) or (state and depth < 2):
+            raise HTTPException(status_code=400, detail="The zone filters states and districts, the state filters districts")
+            
+        ascending = order == 'asc' if order else sort is None
+        page, total = await executor.run(
+            data_processor.get_geo_rollup, GEO_LEVELS[level],
+            filters={'Agro-Climatic Zone': zone, 'State': state}, crop=crop,
+            sort_by=GEO_SORT_KEYS.get(sort), ascending=ascending, offset=offset, limit=limit
+        )
+        return FrameResponse(page, format, meta={'level': level, 'total': total, 'offset': offset, 'limit': limit})
+    
     @app.get("/api/regional-insights", response_model=Dict[str, Any])
     async def api_regional_insights(
         region: str = Query(..., description="Agro-climatic zone"),
@@ -116,7 +375,7 @@ def setup_routes(app, data_processor, yield_analyzer):
         if not region:
             raise HTTPException(status_code=400, detail="Region parameter is required")
             
-        insights = yield_analyzer.get_regional_insights(region, crop=crop)
+        insights = await executor.run(yield_analyzer.get_regional_insights, region, crop=crop)
         return insights
     
     @app.get("/api/crop-insights", response_model=Dict[str, Any])
@@ -128,18 +387,42 @@ def setup_routes(app, data_processor, yield_analyzer):
         if not crop:
             raise HTTPException(status_code=400, detail="Crop parameter is required")
             
-        insights = yield_analyzer.get_crop_insights(crop, region=region)
+        insights = await executor.run(yield_analyzer.get_crop_insights, crop, region=region)
         return insights
     
+    @app.get("/api/dashboard/region", response_model=Dict[str, Any])
+    async def api_region_dashboard(
+        region: str = Query(..., description="Agro-climatic zone"),
+        crop: Optional[str] = None
+    ):
+        """Get the yield trend, factor impact, soil and season breakdowns and insights of a region"""
+        if not region:
+            raise HTTPException(status_code=400, detail="Region parameter is required")
+            
+        return await executor.run(yield_analyzer.get_region_dashboard, region, crop=crop)
+    
+    @app.get("/api/dashboard/crop", response_model=Dict[str, Any])
+    async def api_crop_dashboard(
+        crop: str = Query(..., description="Crop name"),
+        region: Optional[str] = None
+    ):
+        """Get the yield by region, factor impact, soil and season breakdowns and insights of a crop"""
+        if not crop:
+            raise HTTPException(status_code=400, detail="Crop parameter is required")
+            
+        return await executor.run(yield_analyzer.get_crop_dashboard, crop, region=region)
+    
     @app.post("/api/predict-yield", response_model=Dict[str, Any])
     async def api_predict_yield(data: YieldPredictionInput):
         """Predict yield based on input parameters"""
-        predicted_yield = yield_analyzer.predict_yield(
+        predicted_yield, provisional = await executor.run(
+            yield_analyzer.predict_yield,
             data.region,
             data.crop,
             data.rainfall,
             data.irrigation,
-            data.fertilizer
+            data.fertilizer,
+            with_status=True
         )
         
         if predicted_yield is None:
@@ -147,9 +430,148 @@ def setup_routes(app, data_processor, yield_analyzer):
             
         return {
             "predicted_yield": predicted_yield,
-            "unit": "tonnes/ha"
+            "unit": "tonnes/ha",
+            "provisional": provisional
         }
     
+    @app.post("/api/predict-yield/batch")
+    async def api_predict_yield_batch(request: Request):
+        """Predict yield for a JSON list or an NDJSON stream of inputs"""
+        ndjson = _is_ndjson(request)
+        if ndjson:
+            records = await _read_ndjson(request, settings.max_batch_rows)
+        else:
+            try:
+                records = await request.json()
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Request body must be a JSON list or NDJSON")
+            if not isinstance(records, list):
+                raise HTTPException(status_code=400, detail="Request body must be a JSON list or NDJSON")
+                
+        if len(records) > settings.max_batch_rows:
+            raise HTTPException(status_code=413, detail=f"Batch is limited to {settings.max_batch_rows} rows")
+            
+        # Validating and stacking the rows runs in the pool as well
+        results = await executor.run(yield_analyzer.predict_yield_records, records)
+        
+        if ndjson:
+            body = ''.join(json.dumps(result) + '\n' for result in results)
+            return Response(content=body, media_type='application/x-ndjson')
+        return JSONResponse(content=results)
+    
+    @app.post("/api/data/append")
+    async def api_append_data(request: Request):
+        """Append a CSV or NDJSON batch of dataset rows"""
+        if executor.kind == 'process':
+            # Every process worker holds its own copy of the dataset
+            return JSONResponse(
+                status_code=409,
+                content={"error": "Appending rows is not supported with the process executor"}
+            )
+        if not data_processor.supports_append:
+            return JSONResponse(
+                status_code=501,
+                content={"error": "Appending rows is not supported by this data backend"}
+            )
+            
+        content_type = request.headers.get('content-type', '')
+        if _is_ndjson(request):
+            records = await _read_ndjson(request, settings.max_batch_rows)
+            invalid = [row for row, record in enumerate(records) if not isinstance(record, dict)]
+            if invalid:
+                raise HTTPException(status_code=400, detail=f"Rows are not JSON objects: {invalid[:100]}")
+            rows = pd.DataFrame.from_records(records)
+        elif 'csv' in content_type:
+            body = await request.body()
+            try:
+                rows = pd.read_csv(io.BytesIO(body), dtype=str, keep_default_na=False)
+            except (ValueError, pd.errors.ParserError) as e:
+                raise HTTPException(status_code=400, detail=f"Invalid CSV: {str(e)}")
+        else:
+            raise HTTPException(status_code=415, detail="Send rows as text/csv or application/x-ndjson")
+            
+        if len(rows) > settings.max_batch_rows:
+            raise HTTPException(status_code=413, detail=f"Batch is limited to {settings.max_batch_rows} rows")
+        if len(rows) == 0:
+            raise HTTPException(status_code=400, detail="Batch contains no rows")
+            
+        rows, errors = await executor.run(data_processor.validate_rows, rows)
+        if errors:
+            return JSONResponse(status_code=422, content={"error": "Rows do not match the dataset schema", "errors": errors})
+            
+        summary = await executor.run(data_processor.append_rows, rows)
+        yield_analyzer.mark_stale(summary['affected'])
+        return summary
+    
+    @app.get("/api/rows")
+    async def api_rows(
+        request: Request,
+        region: Optional[str] = None,
+        crop: Optional[str] = None,
+        season: Optional[str] = None,
+        soil: Optional[str] = None,
+        state: Optional[str] = None,
+        district: Optional[str] = None,
+        year_from: Optional[int] = None,
+        year_to: Optional[int] = None,
+        format: str = 'csv',
+        limit: Optional[int] = Query(None, ge=1),
+        cursor: Optional[str] = None
+    ):
+        """
+        Stream the dataset rows that match the filters as CSV or NDJSON
+        
+        Rows are read from a snapshot of the dataset and serialized one
+        chunk at a time. With a limit or cursor only one page is returned
+        and the cursor of the next page is sent in X-Next-Cursor.
+        """
+        if format not in ('csv', 'ndjson'):
+            raise HTTPException(status_code=400, detail="Format must be csv or ndjson")
+        if not data_processor.supports_rows:
+            raise HTTPException(status_code=501, detail="Row export is not supported by this data backend")
+            
+        params = {'region': region, 'crop': crop, 'season': season, 'soil': soil,
+                  'state': state, 'district': district, 'year_from': year_from, 'year_to': year_to}
+        filters = {column: params[name] for name, column in ROW_FILTERS.items()}
+        year_range = (year_from, year_to)
+        query_hash = hashlib.sha1(json.dumps(params, sort_keys=True).encode()).hexdigest()[:8]
+        
+        # The version is read first so a concurrent append makes the cursor stale, never wrong
+        version = data_processor.version
+        snapshot = data_processor.row_snapshot()
+        index, df = snapshot
+        chunk_size = 10000
+        media_type = 'text/csv' if format == 'csv' else 'application/x-ndjson'
+        
+        if limit is None and cursor is None:
+            positions = data_processor.iter_row_positions(filters, year_range, chunk_size=chunk_size, snapshot=snapshot)
+            chunks = (df.take(rows) for rows, _, _ in positions)
+            return StreamingResponse(_serialize_rows(chunks, format, df.columns), media_type=media_type)
+            
+        offset = 0
+        if cursor is not None:
+            decoded = _decode_cursor(cursor)
+            if decoded.get('q') != query_hash:
+                raise HTTPException(status_code=400, detail="Cursor belongs to a different query")
+            if decoded.get('v') != version:
+                raise HTTPException(status_code=410, detail="Dataset changed since the cursor was issued; restart from the first page")
+            offset = decoded['o']
+            
+        # The page is located on the snapshot in this process, which the
+        # process pool cannot share, so it runs in the server threadpool
+        limit = min(limit or 1000, settings.max_batch_rows)
+        page, next_offset = await run_in_threadpool(
+            data_processor.get_rows_page, filters, year_range, offset, limit, chunk_size, snapshot
+        )
+        chunks = (df.take(page[start:start + chunk_size]) for start in range(0, len(page), chunk_size))
+        
+        headers = {}
+        if next_offset is not None:
+            next_cursor = _encode_cursor(version, next_offset, query_hash)
+            headers['X-Next-Cursor'] = next_cursor
+            headers['Link'] = f'<{request.url.include_query_params(cursor=next_cursor)}>; rel="next"'
+        return StreamingResponse(_serialize_rows(chunks, format, df.columns), media_type=media_type, headers=headers)
+    
     @app.get("/api/improvement-strategies", response_model=List[Dict[str, Any]])
     async def api_improvement_strategies(
         region: str = Query(..., description="Agro-climatic zone"),
@@ -159,5 +581,5 @@ def setup_routes(app, data_processor, yield_analyzer):
         if not region or not crop:
             raise HTTPException(status_code=400, detail="Both region and crop parameters are required")
             
-        strategies = yield_analyzer.get_improvement_strategies(region, crop)
+        strategies = await executor.run(yield_analyzer.get_improvement_strategies, region, crop)
         return strategies 
\ No newline at end of file
@@ -0,0 +1,80 @@
+import re
+import json
+from fastapi.responses import Response
+
+# Response layouts of DataFrame results, chosen with the format query parameter
+FRAME_FORMATS = ('records', 'columnar')
+
+# Decimal places written for floats, the most pandas supports; enough to
+# round-trip the values of the analytics results
+DOUBLE_PRECISION = 15
+
+# A "/" escaped by pandas, with the escaped backslashes before it kept
+ESCAPED_SLASH = re.compile(r'(?<!\\)((?:\\\\)*)\\/')
+
+def frame_to_json(frame, fmt='records'):
+    """
+    Serialize a DataFrame to JSON without building Python objects per row
+    
+    The values are written by the C encoder of pandas straight from the
+    column arrays. NaN and infinite values become null. The "/" escapes
+    pandas writes are undone, so names such as "Fertilizer Use (kg/ha)"
+    come out as the json module writes them.
+    
+    Args:
+        frame (pandas.DataFrame): Frame to serialize
+        fmt (str): 'records' for a list of row objects, 'columnar' for
+            ``{"columns": [...], "data": {column: [...]}}``, or 'columns'
+            for ``{column: {index: value}}`` like DataFrame.to_dict()
+    
+    Returns:
+        bytes: JSON document
+    """
+    if fmt == 'columnar':
+        columns = [str(column) for column in frame.columns]
+        data = ','.join(
+            f"{json.dumps(name, ensure_ascii=False)}:{_unescape_slashes(frame.iloc[:, i].to_json(orient='values', double_precision=DOUBLE_PRECISION, force_ascii=False))}"
+            for i, name in enumerate(columns)
+        )
+        names = json.dumps(columns, ensure_ascii=False, separators=(',', ':'))
+        return f'{{"columns":{names},"data":{{{data}}}}}'.encode()
+    if fmt in ('records', 'columns'):
+        return _unescape_slashes(frame.to_json(orient=fmt, double_precision=DOUBLE_PRECISION, force_ascii=False)).encode()
+    raise ValueError(f"Unknown frame format: {fmt}")
+
+def _unescape_slashes(text):
+    if '\\/' not in text:
+        return text
+    return ESCAPED_SLASH.sub(r'\1/', text)
+
+class FrameResponse(Response):
+    """
+    JSON response rendered directly from a DataFrame
+    
+    Returning it from an endpoint skips the validation of the result
+    against the response model and the generic JSON encoder.
+    """
+    
+    media_type = "application/json"
+    
+    def __init__(self, frame, fmt='records', meta=None, **kwargs):
+        """
+        Initialize the response
+        
+        Args:
+            frame (pandas.DataFrame): Result to send
+            fmt (str): Layout of the body, see frame_to_json
+            meta (dict, optional): Fields sent along with the frame, which
+                then goes in the "items" field of a JSON object
+            **kwargs: Other Response arguments, such as status_code or headers
+        """
+        self.fmt = fmt
+        self.meta = meta
+        super().__init__(content=frame, **kwargs)
+    
+    def render(self, content):
+        body = frame_to_json(content, self.fmt)
+        if self.meta is None:
+            return body
+        fields = json.dumps(self.meta, ensure_ascii=False, separators=(',', ':'))[1:-1]
+        return b''.join([b'{', fields.encode(), b',' if fields else b'', b'"items":', body, b'}'])
\ No newline at end of file
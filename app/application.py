@@ -0,0 +1,182 @@
+import time
+import threading
+from typing import List
+from fastapi import FastAPI, Response
+from fastapi.responses import JSONResponse
+from fastapi.staticfiles import StaticFiles
+from fastapi.templating import Jinja2Templates
+from starlette.routing import Match
+from starlette.concurrency import run_in_threadpool
+from app.config import settings as default_settings
+from app.backend import create_backend
+from app.api.executor import WorkerPool
+from app.api.routes import setup_routes
+from app.views import setup_views
+from app.utils.metrics import registry, http_request_duration, EventLoopMonitor
+from app.utils import profiling
+
+def create_app(settings=None):
+    """
+    Build the FastAPI application with its data backend
+    
+    This is the only place the dataset is loaded for the web application;
+    both ``uvicorn app:app`` and ``python app.py`` end up here.
+    
+    Args:
+        settings (Settings, optional): Application settings, read from the
+            environment by default
+    
+    Returns:
+        FastAPI: The application
+    """
+    settings = settings or default_settings
+    
+    app = FastAPI(
+        title="Indian Agricultural Yield Analysis",
+        description="Analyze crop yield variability across Indian agro-climatic zones",
+        version="1.0.0"
+    )
+    
+    # Mount static files
+    app.mount("/static", StaticFiles(directory="app/static"), name="static")
+    
+    # Set up templates
+    templates = Jinja2Templates(directory="app/templates")
+    
+    # Load the data processor and analyzer
+    backend = create_backend(settings)
+    data_processor = backend['data_processor']
+    yield_analyzer = backend['yield_analyzer']
+    
+    # Run analytics calls in a bounded worker pool
+    executor = WorkerPool(
+        kind=settings.executor,
+        max_workers=settings.max_workers,
+        max_queue=settings.max_queue,
+        timeout=settings.request_timeout,
+        factory=create_backend,
+        factory_args=(settings,)
+    )
+    
+    @app.get("/api")
+    async def api_root():
+        return {"message": "Welcome to the Indian Agricultural Yield Analysis API"}
+    
+    @app.get("/api/health")
+    async def health_check():
+        progress = yield_analyzer.warm_up_progress()
+        warming = progress is not None and not progress['complete']
+        return {"status": "warming" if warming else "healthy", "warm_up": progress}
+    
+    @app.get("/api/health/ready")
+    async def readiness_check():
+        """Answer 503 until every model is ready, for load balancer gating"""
+        progress = yield_analyzer.warm_up_progress()
+        if progress is not None and not progress['complete']:
+            return JSONResponse(status_code=503, content={"status": "warming", "warm_up": progress})
+        return {"status": "ready", "warm_up": progress}
+    
+    @app.on_event("startup")
+    async def start_warm_up():
+        # Runs off the event loop, since listing the groups may scan the dataset
+        await run_in_threadpool(yield_analyzer.warm_up)
+        await run_in_threadpool(yield_analyzer.insights.refresh)
+    
+    @app.on_event("shutdown")
+    async def stop_training():
+        if yield_analyzer.scheduler:
+            yield_analyzer.scheduler.stop()
+    
+    @app.on_event("shutdown")
+    async def close_data_processor():
+        # Registered after stop_training, so no training job still reads the data
+        close = getattr(data_processor, 'close', None)
+        if close is not None:
+            await run_in_threadpool(close)
+    
+    # Set up API routes and HTML pages
+    setup_routes(app, data_processor, yield_analyzer, executor=executor, settings=settings)
+    setup_views(app, templates)
+    
+    @app.get("/api/metrics")
+    async def metrics():
+        """Get the service metrics in the Prometheus text format"""
+        return Response(content=registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+    
+    registry.callback('agri_model_cache_size', 'Yield models held in memory', lambda: len(yield_analyzer.models))
+    registry.callback('agri_model_cache_bytes', 'Measured size of the yield models held in memory', lambda: yield_analyzer.models.size)
+    registry.callback('agri_model_cache_evictions', 'Yield models evicted from memory', lambda: yield_analyzer.models.evictions, kind='counter')
+    registry.callback('agri_insights_table_entries', 'Precomputed insight payloads', lambda: len(yield_analyzer.insights))
+    registry.callback('agri_insights_table_builds', 'Builds of the insights table', lambda: yield_analyzer.insights.builds, kind='counter')
+    
+    def route_path(scope):
+        # Label by route template, not by the raw path, to bound the label set
+        route = scope.get('route')
+        if route is None:
+            # Cache hits never reach the router, and older versions do not set the route
+            route = next((r for r in app.routes if r.matches(scope)[0] == Match.FULL), None)
+        return getattr(route, 'path', 'unmatched')
+    
+    # Added last, so it also times responses served by the cache middleware
+    @app.middleware("http")
+    async def metrics_middleware(request, call_next):
+        start = time.perf_counter()
+        response = await call_next(request)
+        path = route_path(request.scope)
+        http_request_duration.observe(time.perf_counter() - start, method=request.method, path=path, status=str(response.status_code))
+        return response
+    
+    if settings.profiling:
+        # Added after the metrics middleware, so the sampler covers the whole request
+        @app.middleware("http")
+        async def profiling_middleware(request, call_next):
+            fmt = profiling.requested_format(request)
+            if fmt is None:
+                return await call_next(request)
+            if executor.kind == 'process':
+                return JSONResponse(
+                    status_code=409,
+                    content={"error": "Profiling is not supported with the process executor"}
+                )
+            
+            profiler = profiling.SamplingProfiler(interval=settings.profile_interval)
+            token = profiling.activate(profiler)
+            profiler.add_thread(threading.get_ident())
+            profiler.start()
+            try:
+                response = await call_next(request)
+                # Streamed bodies are produced while they are read
+                async for _ in response.body_iterator:
+                    pass
+            finally:
+                profiler.stop()
+                profiling.deactivate(token)
+            
+            body, media_type = profiling.render(profiler, fmt, response.status_code)
+            return Response(content=body, media_type=media_type, headers={
+                'X-Profile-Status': str(response.status_code),
+                'X-Profile-Samples': str(profiler.samples),
+                'X-Profile-Duration': f"{profiler.duration:.6f}"
+            })
+    
+    event_loop_monitor = EventLoopMonitor()
+    
+    @app.on_event("startup")
+    async def start_event_loop_monitor():
+        event_loop_monitor.start()
+    
+    @app.on_event("shutdown")
+    async def stop_event_loop_monitor():
+        event_loop_monitor.stop()
+    
+    @app.get("/regions", response_model=List[str])
+    async def get_regions():
+        """Get all unique agro-climatic zones"""
+        return data_processor.get_unique_values('Agro-Climatic Zone')
+    
+    @app.get("/crops", response_model=List[str])
+    async def get_crops():
+        """Get all unique crops"""
+        return data_processor.get_unique_values('Crop')
+    
+    return app
\ No newline at end of file
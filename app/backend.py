@@ -0,0 +1,34 @@
+def create_backend(settings):
+    """
+    Build the data processor and yield analyzer described by the settings
+    
+    Args:
+        settings (Settings): Application settings
+    
+    Returns:
+        dict: 'data_processor' and 'yield_analyzer' instances
+    """
+    from app.models.yield_analyzer import YieldAnalyzer
+    
+    if settings.backend == 'streaming':
+        from app.models.streaming_processor import StreamingDataProcessor
+        data_processor = StreamingDataProcessor(
+            settings.data_path, columnar_dir=settings.columnar_dir, memory_limit=settings.memory_limit
+        )
+    elif settings.backend == 'sharded':
+        from app.models.sharded_processor import ShardedDataProcessor
+        data_processor = ShardedDataProcessor(settings.data_path, settings.columnar_dir, shards=settings.shards)
+    elif settings.backend == 'memory':
+        from app.models.data_processor import DataProcessor
+        data_processor = DataProcessor(settings.data_path, columnar_dir=settings.columnar_dir)
+    else:
+        raise ValueError(f"Unknown backend: {settings.backend}")
+    # Process workers would each train every model, so they train on demand
+    yield_analyzer = YieldAnalyzer(
+        data_processor,
+        model_dir=settings.model_dir,
+        background_training=settings.background_training and settings.executor == 'thread',
+        training_workers=settings.training_workers,
+        model_cache_bytes=settings.model_cache_bytes
+    )
+    return {'data_processor': data_processor, 'yield_analyzer': yield_analyzer}
\ No newline at end of file
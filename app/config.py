@@ -0,0 +1,49 @@
+import os
+
+class Settings:
+    """
+    Application settings, read from AGRI_* environment variables
+    """
+    
+    def __init__(self, environ=None):
+        """
+        Initialize the settings
+        
+        Args:
+            environ (dict, optional): Environment to read, os.environ by default
+        """
+        environ = os.environ if environ is None else environ
+        
+        # Dataset and model locations
+        self.data_path = environ.get('AGRI_DATA_PATH', 'app/data/crop_yield_dataset.csv')
+        self.model_dir = environ.get('AGRI_MODEL_DIR', 'app/data/models')
+        self.columnar_dir = environ.get('AGRI_COLUMNAR_DIR', 'app/data/columnar')
+        
+        # Data backend: 'memory' loads the dataset, 'streaming' reads it in
+        # chunks and 'sharded' splits it by zone over worker processes
+        self.backend = environ.get('AGRI_BACKEND', 'memory')
+        self.memory_limit = int(environ.get('AGRI_MEMORY_LIMIT', 1024 * 1024 * 1024))
+        self.shards = int(environ.get('AGRI_SHARDS', os.cpu_count() or 1))
+        
+        # Execution layer for analytics and prediction calls
+        self.executor = environ.get('AGRI_EXECUTOR', 'thread')
+        self.max_workers = int(environ.get('AGRI_MAX_WORKERS', min(4, os.cpu_count() or 1)))
+        self.max_queue = int(environ.get('AGRI_MAX_QUEUE', 32))
+        self.request_timeout = float(environ.get('AGRI_REQUEST_TIMEOUT', 30))
+        self.max_batch_rows = int(environ.get('AGRI_MAX_BATCH_ROWS', 100000))
+        
+        # Models are trained in background threads of the thread executor,
+        # with provisional predictions until they are ready
+        self.background_training = environ.get('AGRI_BACKGROUND_TRAINING', '1').lower() in ('1', 'true', 'yes')
+        self.training_workers = int(environ.get('AGRI_TRAINING_WORKERS', 1))
+        self.model_cache_bytes = int(environ.get('AGRI_MODEL_CACHE_BYTES', 256 * 1024 * 1024))
+        
+        # Response cache of the analytics endpoints
+        self.cache_max_entries = int(environ.get('AGRI_CACHE_MAX_ENTRIES', 1024))
+        self.cache_max_bytes = int(environ.get('AGRI_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+        
+        # On-demand request profiling, off unless enabled
+        self.profiling = environ.get('AGRI_PROFILING', '0').lower() in ('1', 'true', 'yes')
+        self.profile_interval = float(environ.get('AGRI_PROFILE_INTERVAL', 0.002))
+
+settings = Settings()
\ No newline at end of file
@@ -0,0 +1,280 @@
+import pandas as pd
+import numpy as np
+
+class AggregateCube:
+    """
+    Sufficient statistics of the numeric columns for every combination of
+    the dimension columns
+    
+    Each non-empty cell stores the row count, the sum of every value column
+    and the matrix of pairwise cross-products (whose diagonal holds the sums
+    of squares). Means, standard deviations, covariances and correlations of
+    any group of cells follow from rolling those statistics up, so queries
+    cost O(cells) instead of O(rows).
+    """
+    
+    def __init__(self, dimensions, values, levels, codes, count, sums, cross):
+        """
+        Initialize the cube from precomputed cells
+        
+        Args:
+            dimensions (list): Dimension column names
+            values (list): Value column names
+            levels (dict): Sorted labels of every dimension
+            codes (numpy.ndarray): Level codes of every cell, shape (cells, dimensions)
+            count (numpy.ndarray): Row count of every cell
+            sums (numpy.ndarray): Value sums of every cell, shape (cells, values)
+            cross (numpy.ndarray): Cross-products of every cell, shape (cells, values, values)
+        """
+        self.dimensions = list(dimensions)
+        self.values = list(values)
+        self.levels = levels
+        self.codes = codes
+        self.count = count
+        self.sums = sums
+        self.cross = cross
+        self._lookup = {
+            dimension: {value: code for code, value in enumerate(levels[dimension])}
+            for dimension in self.dimensions
+        }
+    
+    @classmethod
+    def from_frame(cls, df, dimensions, values):
+        """
+        Build the cube from raw rows
+        
+        Args:
+            df (pandas.DataFrame): Dataset
+            dimensions (list): Dimension column names
+            values (list): Value column names
+        
+        Returns:
+            AggregateCube: Cube over the dataset
+        """
+        levels = {}
+        row_codes = []
+        for dimension in dimensions:
+            codes, uniques = pd.factorize(df[dimension], sort=True)
+            levels[dimension] = np.asarray(uniques)
+            row_codes.append(codes)
+        
+        shape = tuple(len(levels[dimension]) for dimension in dimensions)
+        if len(df):
+            row_cells = np.ravel_multi_index(row_codes, shape)
+        else:
+            row_cells = np.zeros(0, dtype=np.int64)
+        cells, inverse = np.unique(row_cells, return_inverse=True)
+        
+        X = df[values].to_numpy(dtype=np.float64)
+        count = np.bincount(inverse, minlength=len(cells)).astype(np.int64)
+        sums = _group_sum(inverse, len(cells), X)
+        cross = np.empty((len(cells), len(values), len(values)))
+        for i in range(len(values)):
+            for j in range(i, len(values)):
+                cross[:, i, j] = np.bincount(inverse, weights=X[:, i] * X[:, j], minlength=len(cells))
+                cross[:, j, i] = cross[:, i, j]
+        
+        codes = np.stack(np.unravel_index(cells, shape), axis=1) if len(cells) else np.zeros((0, len(dimensions)), dtype=np.int64)
+        return cls(dimensions, values, levels, codes, count, sums, cross)
+    
+    def __len__(self):
+        return len(self.count)
+    
+    def merge(self, other):
+        """
+        Combine the cells of two cubes over the same dimensions and values
+        
+        Counts, sums and cross-products are additive, so the result is the
+        cube of the union of both datasets at a cost of O(cells).
+        
+        Args:
+            other (AggregateCube): Cube over additional rows
+        
+        Returns:
+            AggregateCube: Merged cube; both inputs are left unchanged
+        """
+        levels = {}
+        codes = []
+        for axis, dimension in enumerate(self.dimensions):
+            levels[dimension] = np.union1d(self.levels[dimension], other.levels[dimension])
+            codes.append(np.concatenate([
+                np.searchsorted(levels[dimension], self.levels[dimension])[self.codes[:, axis]],
+                np.searchsorted(levels[dimension], other.levels[dimension])[other.codes[:, axis]]
+            ]))
+        
+        shape = tuple(len(levels[dimension]) for dimension in self.dimensions)
+        if len(codes[0]):
+            row_cells = np.ravel_multi_index(codes, shape)
+        else:
+            row_cells = np.zeros(0, dtype=np.int64)
+        cells, inverse = np.unique(row_cells, return_inverse=True)
+        
+        count = np.bincount(inverse, weights=np.concatenate([self.count, other.count]), minlength=len(cells)).astype(np.int64)
+        sums = _group_sum(inverse, len(cells), np.concatenate([self.sums, other.sums]))
+        cross = _group_sum(inverse, len(cells), np.concatenate([self.cross, other.cross]))
+        
+        cell_codes = np.stack(np.unravel_index(cells, shape), axis=1) if len(cells) else np.zeros((0, len(self.dimensions)), dtype=np.int64)
+        return AggregateCube(self.dimensions, self.values, levels, cell_codes, count, sums, cross)
+    
+    def select(self, filters=None):
+        """
+        Get the sub-cube of the cells that match the filters
+        
+        Several rollups of the same subset share one selection this way.
+        
+        Args:
+            filters (dict, optional): Dimension-value pairs; falsy values are ignored
+        
+        Returns:
+            AggregateCube: Cube with the matching cells and the same levels
+        """
+        mask = self._filter_mask(filters)
+        if mask.all():
+            return self
+        return AggregateCube(
+            self.dimensions, self.values, self.levels,
+            self.codes[mask], self.count[mask], self.sums[mask], self.cross[mask]
+        )
+    
+    def rollup(self, by=None, filters=None, values=None):
+        """
+        Aggregate the cells that match the filters
+        
+        Args:
+            by (list, optional): Dimensions to group by; all matching cells are
+                summed into a single group when omitted
+            filters (dict, optional): Dimension-value pairs; falsy values are ignored
+            values (list, optional): Value columns to aggregate, all by default
+        
+        Returns:
+            tuple: (labels, count, sums, cross) where labels is a DataFrame with
+            one column per grouping dimension, sorted by those dimensions
+        """
+        by = list(by or [])
+        mask = self._filter_mask(filters)
+        codes, count, sums, cross = self.codes, self.count, self.sums, self.cross
+        if values is not None:
+            columns = [self.values.index(value) for value in values]
+            sums = sums[:, columns]
+            cross = cross[:, columns][:, :, columns]
+        if not mask.all():
+            codes, count, sums, cross = codes[mask], count[mask], sums[mask], cross[mask]
+        
+        if not by:
+            labels = pd.DataFrame(index=range(1))
+            return labels, count.sum(keepdims=True), sums.sum(axis=0)[None], cross.sum(axis=0)[None]
+        
+        axes = [self.dimensions.index(dimension) for dimension in by]
+        shape = tuple(len(self.levels[dimension]) for dimension in by)
+        if len(codes):
+            keys = np.ravel_multi_index(codes[:, axes].T, shape)
+        else:
+            keys = np.zeros(0, dtype=np.int64)
+        groups, inverse = np.unique(keys, return_inverse=True)
+        group_codes = np.unravel_index(groups, shape)
+        labels = pd.DataFrame({
+            dimension: self.levels[dimension][group_codes[i]]
+            for i, dimension in enumerate(by)
+        })
+        
+        count = np.bincount(inverse, weights=count, minlength=len(groups)).astype(np.int64)
+        sums = _group_sum(inverse, len(groups), sums)
+        cross = _group_sum(inverse, len(groups), cross)
+        return labels, count, sums, cross
+    
+    def _filter_mask(self, filters):
+        """
+        Get the mask of cells that match the filters
+        
+        Args:
+            filters (dict): Dimension-value pairs; falsy values are ignored
+        
+        Returns:
+            numpy.ndarray: Boolean mask over the cells
+        """
+        mask = np.ones(len(self.count), dtype=bool)
+        for dimension, value in (filters or {}).items():
+            if not value:
+                continue
+            code = self._lookup[dimension].get(value)
+            if code is None:
+                return np.zeros(len(self.count), dtype=bool)
+            mask &= self.codes[:, self.dimensions.index(dimension)] == code
+        return mask
+
+def _group_sum(inverse, n_groups, array):
+    """
+    Sum the rows of an array per group
+    
+    Args:
+        inverse (numpy.ndarray): Group number of every row
+        n_groups (int): Number of groups
+        array (numpy.ndarray): Array with one row per element of inverse
+    
+    Returns:
+        numpy.ndarray: Array of shape (n_groups,) + array.shape[1:]
+    """
+    flat = array.reshape(len(array), int(np.prod(array.shape[1:])))
+    totals = np.empty((n_groups, flat.shape[1]))
+    for column in range(flat.shape[1]):
+        totals[:, column] = np.bincount(inverse, weights=flat[:, column], minlength=n_groups)
+    return totals.reshape((n_groups,) + array.shape[1:])
+
+def mean_and_std(count, sums, sumsq):
+    """
+    Get means and sample standard deviations from sufficient statistics
+    
+    Args:
+        count (numpy.ndarray): Row counts
+        sums (numpy.ndarray): Sums
+        sumsq (numpy.ndarray): Sums of squares
+    
+    Returns:
+        tuple: (mean, std) arrays; std is NaN for groups with fewer than two rows
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = sums / count
+        variance = (sumsq - sums * mean) / (count - 1)
+        std = np.sqrt(np.clip(variance, 0, None))
+    std = np.where(count > 1, std, np.nan)
+    return mean, std
+
+def covariance(count, sums, cross):
+    """
+    Get sample covariance matrices from sufficient statistics
+    
+    Args:
+        count (numpy.ndarray): Row counts, shape (groups,)
+        sums (numpy.ndarray): Sums, shape (groups, values)
+        cross (numpy.ndarray): Cross-products, shape (groups, values, values)
+    
+    Returns:
+        numpy.ndarray: Covariance matrices, shape (groups, values, values)
+    """
+    count = np.asarray(count, dtype=np.float64)[:, None, None]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        centered = cross - sums[:, :, None] * sums[:, None, :] / count
+        return centered / (count - 1)
+
+def correlation(count, sums, cross):
+    """
+    Get Pearson correlation matrices from sufficient statistics
+    
+    Args:
+        count (numpy.ndarray): Row counts, shape (groups,)
+        sums (numpy.ndarray): Sums, shape (groups, values)
+        cross (numpy.ndarray): Cross-products, shape (groups, values, values)
+    
+    Returns:
+        numpy.ndarray: Correlation matrices, shape (groups, values, values)
+    """
+    cov = covariance(count, sums, cross)
+    std = np.sqrt(np.clip(np.diagonal(cov, axis1=1, axis2=2), 0, None))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        corr = cov / (std[:, :, None] * std[:, None, :])
+    corr = np.clip(corr, -1, 1)
+    
+    # Match pandas: exact ones on the diagonal of non-constant columns
+    diagonal = np.arange(corr.shape[1])
+    corr[:, diagonal, diagonal] = np.where(std > 0, 1.0, np.nan)
+    return corr
\ No newline at end of file
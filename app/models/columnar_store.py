@@ -0,0 +1,372 @@
+import os
+import json
+import shutil
+import tempfile
+import pandas as pd
+import numpy as np
+
+FORMAT_VERSION = 2
+
+# File of the dataset row number of every stored row
+ROW_NUMBERS_FILE = 'rows.npy'
+
+class ColumnarStore:
+    """
+    Typed columnar copy of the dataset
+    
+    Every column is stored as its own ``.npy`` file next to a
+    ``manifest.json``. Text columns are dictionary-encoded: the file holds
+    small integer codes and the manifest holds the sorted labels. Numeric
+    columns are memory-mapped when read, so a start from the store skips
+    CSV parsing entirely. Rows may be stored in any order; the dataset
+    row number of every row is stored too and read back as the index.
+    The manifest records the size and modification time of the source
+    CSV, which is how a stale copy is detected.
+    """
+    
+    def __init__(self, root):
+        """
+        Initialize the store
+        
+        Args:
+            root (str): Directory of the columnar files
+        """
+        self.root = root
+        self.manifest_path = os.path.join(root, 'manifest.json')
+    
+    @staticmethod
+    def source_stamp(source_path):
+        """
+        Get the identity of a source file as recorded in the manifest
+        
+        Args:
+            source_path (str): Path to the CSV dataset
+        
+        Returns:
+            dict: Size and modification time of the file
+        """
+        stat = os.stat(source_path)
+        return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+    
+    def read_manifest(self):
+        """
+        Read the manifest
+        
+        Returns:
+            dict: Manifest, or None if the store does not exist
+        """
+        try:
+            with open(self.manifest_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def is_fresh(self, source_path):
+        """
+        Check whether the store matches the current source file
+        
+        Args:
+            source_path (str): Path to the CSV dataset
+        
+        Returns:
+            bool: True if the store can be read instead of the CSV
+        """
+        manifest = self.read_manifest()
+        if manifest is None or manifest.get('format_version') != FORMAT_VERSION:
+            return False
+        return manifest.get('source') == self.source_stamp(source_path)
+    
+    def write(self, df, source=None):
+        """
+        Write a dataframe to the store, replacing any previous copy
+        
+        Args:
+            df (pandas.DataFrame): Dataset to store, indexed by dataset row number
+            source (dict, optional): Stamp of the CSV the dataset was read
+                from, taken with source_stamp before reading it
+        """
+        levels = {}
+        for column in df.columns:
+            values = df[column]
+            if _is_text(values.dtype):
+                levels[column] = pd.factorize(values, sort=True)[1]
+        
+        writer = self.writer(len(df), levels)
+        try:
+            writer.append(df, row_numbers=df.index.to_numpy())
+            writer.commit(source)
+        finally:
+            writer.abort()
+    
+    def writer(self, rows, levels):
+        """
+        Start writing a dataset chunk by chunk
+        
+        Args:
+            rows (int): Total number of rows that will be appended
+            levels (dict): Sorted labels of every text column
+        
+        Returns:
+            ColumnarWriter: Writer that replaces the store on commit
+        """
+        return ColumnarWriter(self, rows, levels)
+    
+    def read(self, mmap_mode='c'):
+        """
+        Read the stored dataset
+        
+        Args:
+            mmap_mode (str, optional): Memory-map mode for numeric columns;
+                copy-on-write by default so the frame stays writable
+        
+        Returns:
+            pandas.DataFrame: The dataset, with text columns decoded and
+            indexed by dataset row number
+        """
+        manifest = self.read_manifest()
+        data = {}
+        for column in manifest['columns']:
+            values = np.load(os.path.join(self.root, column['file']), mmap_mode=mmap_mode)
+            if column['kind'] == 'dictionary':
+                levels = np.asarray(column['levels'], dtype=object)
+                values = levels[values]
+            data[column['name']] = values
+        index = np.load(os.path.join(self.root, ROW_NUMBERS_FILE))
+        return pd.DataFrame(data, index=index, columns=[column['name'] for column in manifest['columns']], copy=False)
+    
+    def read_rows(self, positions):
+        """
+        Read selected rows of the stored dataset
+        
+        Args:
+            positions (numpy.ndarray): Row positions, ideally sorted
+        
+        Returns:
+            pandas.DataFrame: The rows in the given order, with text columns
+            decoded and indexed by dataset row number
+        """
+        manifest = self.read_manifest()
+        data = {}
+        for column in manifest['columns']:
+            values = np.load(os.path.join(self.root, column['file']), mmap_mode='r')[positions]
+            if column['kind'] == 'dictionary':
+                values = np.asarray(column['levels'], dtype=object)[values]
+            data[column['name']] = values
+        index = np.load(os.path.join(self.root, ROW_NUMBERS_FILE), mmap_mode='r')[positions]
+        return pd.DataFrame(data, index=index, columns=[column['name'] for column in manifest['columns']], copy=False)
+    
+    def find_rows(self, column, values):
+        """
+        Get the positions of the rows whose text column holds one of the values
+        
+        Only the small integer codes of the column are scanned.
+        
+        Args:
+            column (str): Dictionary-encoded column
+            values (list): Wanted labels
+        
+        Returns:
+            numpy.ndarray: Sorted row positions
+        """
+        entry = self._column_entry(column)
+        codes = np.load(os.path.join(self.root, entry['file']), mmap_mode='r')
+        wanted = [code for code, level in enumerate(entry['levels']) if level in set(values)]
+        return np.flatnonzero(np.isin(codes, wanted))
+    
+    def level_counts(self, column):
+        """
+        Count the rows of every label of a text column
+        
+        Args:
+            column (str): Dictionary-encoded column
+        
+        Returns:
+            dict: Label -> number of rows
+        """
+        entry = self._column_entry(column)
+        codes = np.load(os.path.join(self.root, entry['file']), mmap_mode='r')
+        counts = np.bincount(codes, minlength=len(entry['levels']))
+        return dict(zip(entry['levels'], counts.tolist()))
+    
+    def _column_entry(self, column):
+        for entry in self.read_manifest()['columns']:
+            if entry['name'] == column and entry['kind'] == 'dictionary':
+                return entry
+        raise KeyError(f"{column} is not a text column of the store")
+    
+    def iter_chunks(self, chunk_rows):
+        """
+        Read the stored dataset a chunk of rows at a time
+        
+        Only the current chunk of every text column is decoded, so memory
+        use follows the chunk size rather than the dataset size.
+        
+        Args:
+            chunk_rows (int): Rows per chunk
+        
+        Yields:
+            pandas.DataFrame: Consecutive chunks of the dataset, indexed by
+            dataset row number
+        """
+        manifest = self.read_manifest()
+        columns = []
+        for column in manifest['columns']:
+            values = np.load(os.path.join(self.root, column['file']), mmap_mode='r')
+            levels = np.asarray(column['levels'], dtype=object) if column['kind'] == 'dictionary' else None
+            columns.append((column['name'], values, levels))
+        row_numbers = np.load(os.path.join(self.root, ROW_NUMBERS_FILE), mmap_mode='r')
+        
+        for start in range(0, manifest['rows'], chunk_rows):
+            data = {}
+            for name, values, levels in columns:
+                chunk = values[start:start + chunk_rows]
+                data[name] = levels[chunk] if levels is not None else np.asarray(chunk)
+            index = np.asarray(row_numbers[start:start + chunk_rows])
+            yield pd.DataFrame(data, index=index, columns=[name for name, _, _ in columns], copy=False)
+
+class ColumnarWriter:
+    """
+    Writer of a columnar store with a known number of rows
+    
+    Every column file is preallocated and memory-mapped, and appended
+    chunks are copied into place, so datasets larger than memory can be
+    written. Nothing is visible in the store until commit swaps the
+    complete directory in.
+    """
+    
+    def __init__(self, store, rows, levels):
+        """
+        Initialize the writer
+        
+        Args:
+            store (ColumnarStore): Store to replace
+            rows (int): Total number of rows that will be appended
+            levels (dict): Sorted labels of every text column
+        """
+        self.store = store
+        self.rows = rows
+        self.levels = {column: pd.Index(values) for column, values in levels.items()}
+        self.position = 0
+        self._columns = None
+        self._arrays = None
+        self._row_numbers = None
+        
+        parent = os.path.dirname(os.path.abspath(store.root))
+        os.makedirs(parent, exist_ok=True)
+        self.tmp_root = tempfile.mkdtemp(dir=parent, prefix='.columnar-')
+    
+    def _open(self, df):
+        self._columns = []
+        self._arrays = []
+        for i, column in enumerate(df.columns):
+            filename = f"{i:03d}.npy"
+            if column in self.levels:
+                levels = self.levels[column]
+                dtype = _code_dtype(len(levels))
+                self._columns.append({'name': column, 'file': filename, 'kind': 'dictionary', 'levels': [str(level) for level in levels]})
+            else:
+                dtype = df[column].to_numpy().dtype
+                self._columns.append({'name': column, 'file': filename, 'kind': 'numeric'})
+            
+            path = os.path.join(self.tmp_root, filename)
+            if self.rows:
+                self._arrays.append(np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=(self.rows,)))
+            else:
+                # An empty file cannot be memory-mapped
+                np.save(path, np.zeros(0, dtype=dtype))
+                self._arrays.append(None)
+        
+        path = os.path.join(self.tmp_root, ROW_NUMBERS_FILE)
+        if self.rows:
+            self._row_numbers = np.lib.format.open_memmap(path, mode='w+', dtype=np.int64, shape=(self.rows,))
+        else:
+            np.save(path, np.zeros(0, dtype=np.int64))
+    
+    def append(self, df, row_numbers=None):
+        """
+        Copy a chunk of rows into the column files
+        
+        Args:
+            df (pandas.DataFrame): Next rows, with the same columns as the first chunk
+            row_numbers (numpy.ndarray, optional): Dataset row number of
+                every row; rows are numbered in the order they are appended
+                by default
+        
+        Raises:
+            ValueError: If a text value is missing from its levels or the
+                chunk does not fit in the announced number of rows
+        """
+        if self._arrays is None:
+            self._open(df)
+        end = self.position + len(df)
+        if end > self.rows:
+            raise ValueError(f"Writer was opened for {self.rows} rows")
+        
+        for column, array in zip(self._columns, self._arrays):
+            values = df[column['name']]
+            if column['kind'] == 'dictionary':
+                values = pd.Categorical(values, categories=self.levels[column['name']]).codes
+                if (values < 0).any():
+                    raise ValueError(f"Column {column['name']} has a value outside its levels")
+            if len(df):
+                array[self.position:end] = values
+        if len(df):
+            self._row_numbers[self.position:end] = np.arange(self.position, end) if row_numbers is None else row_numbers
+        self.position = end
+    
+    def commit(self, source=None):
+        """
+        Finish the files and swap them into the store
+        
+        Args:
+            source (dict, optional): Stamp of the CSV the dataset belongs to
+        """
+        if self.position != self.rows:
+            raise ValueError(f"Writer received {self.position} of {self.rows} rows")
+        for array in (self._arrays or []) + [self._row_numbers]:
+            if array is not None:
+                array.flush()
+        self._arrays = None
+        self._row_numbers = None
+        
+        path = os.path.join(self.tmp_root, ROW_NUMBERS_FILE)
+        if not os.path.exists(path):
+            # No chunk was appended to an empty store
+            np.save(path, np.zeros(0, dtype=np.int64))
+        
+        manifest = {
+            'format_version': FORMAT_VERSION,
+            'rows': self.rows,
+            'columns': self._columns or [],
+            'source': source
+        }
+        with open(os.path.join(self.tmp_root, 'manifest.json'), 'w') as f:
+            json.dump(manifest, f)
+        
+        # Swap the complete directory in so readers never see a partial
+        # store. The old copy is renamed aside first and only deleted once
+        # the new one is in place; in between, the store is missing and
+        # readers take it for stale.
+        old_root = None
+        if os.path.exists(self.store.root):
+            old_root = self.tmp_root + '.old'
+            os.replace(self.store.root, old_root)
+        os.replace(self.tmp_root, self.store.root)
+        if old_root is not None:
+            shutil.rmtree(old_root, ignore_errors=True)
+    
+    def abort(self):
+        """Remove the files of an uncommitted write"""
+        self._arrays = None
+        self._row_numbers = None
+        if os.path.exists(self.tmp_root):
+            shutil.rmtree(self.tmp_root)
+
+def _is_text(dtype):
+    return dtype == object or pd.api.types.is_string_dtype(dtype) or isinstance(dtype, pd.CategoricalDtype)
+
+def _code_dtype(n_levels):
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_levels < np.iinfo(dtype).max:
+            return dtype
+    return np.int64
\ No newline at end of file
@@ -0,0 +1,171 @@
+import numpy as np
+
+# Rows walked down the trees together; bounds the node index temporaries
+CHUNK_ROWS = 1024
+
+class CompiledForest:
+    """
+    Random forest regressor compiled to flat node arrays
+    
+    The nodes of every tree are renumbered level by level so that the two
+    children of a node are adjacent; a node then only stores its first
+    child, the feature it splits on and one float, which is the split
+    threshold of an internal node or the prediction of a leaf. Leaves are
+    their own child and split on an extra feature that is always -inf, so
+    a row stays on its leaf. All node arrays of all trees live in one contiguous
+    buffer, which takes about a fifth of the memory of the sklearn trees
+    and is memory-mapped as a whole when loaded from the model registry.
+    
+    Prediction walks every row down every tree at once with NumPy
+    indexing, one step per level, instead of calling each sklearn tree in
+    turn. Rows are compared as float32, like sklearn does, so the leaves
+    reached are the same.
+    """
+    
+    def __init__(self, buffer, n_nodes, roots, max_depth, n_features):
+        """
+        Initialize the forest from its node buffer
+        
+        Args:
+            buffer (numpy.ndarray): uint8 buffer holding the node arrays
+            n_nodes (int): Number of nodes over all trees
+            roots (numpy.ndarray): Node index of the root of every tree
+            max_depth (int): Depth of the deepest tree
+            n_features (int): Number of input features
+        """
+        self.buffer = buffer
+        self.n_nodes = n_nodes
+        self.roots = roots
+        self.max_depth = max_depth
+        self.n_features = n_features
+        self._set_views()
+    
+    def _set_views(self):
+        # Widest items first, so every array starts on its own alignment
+        n = self.n_nodes
+        self.value = self.buffer[:8 * n].view(np.float64)
+        self.child = self.buffer[8 * n:12 * n].view(np.int32)
+        self.feature = self.buffer[12 * n:13 * n].view(np.int8)
+    
+    @classmethod
+    def from_sklearn(cls, forest):
+        """
+        Compile a fitted RandomForestRegressor
+        
+        Args:
+            forest (sklearn.ensemble.RandomForestRegressor): Fitted forest
+                with a single output
+        
+        Returns:
+            CompiledForest: Forest with the same predictions
+        """
+        if forest.n_features_in_ >= np.iinfo(np.int8).max:
+            raise ValueError(f"Cannot compile a forest over {forest.n_features_in_} features")
+        
+        trees = [estimator.tree_ for estimator in forest.estimators_]
+        n_nodes = sum(tree.node_count for tree in trees)
+        buffer = np.empty(13 * n_nodes, dtype=np.uint8)
+        compiled = cls(buffer, n_nodes, np.zeros(len(trees), dtype=np.int32), 0, forest.n_features_in_)
+        
+        offset = 0
+        for i, tree in enumerate(trees):
+            order, depth = _level_order(tree.children_left, tree.children_right)
+            new_id = np.empty(len(order), dtype=np.int32)
+            new_id[order] = np.arange(len(order), dtype=np.int32) + offset
+            
+            left = tree.children_left[order]
+            internal = left != -1
+            nodes = slice(offset, offset + len(order))
+            compiled.child[nodes] = np.where(internal, new_id[np.maximum(left, 0)], new_id[order])
+            compiled.feature[nodes] = np.where(internal, tree.feature[order], forest.n_features_in_)
+            compiled.value[nodes] = np.where(internal, tree.threshold[order], tree.value[order, 0, 0])
+            
+            compiled.roots[i] = offset
+            compiled.max_depth = max(compiled.max_depth, depth)
+            offset += len(order)
+        return compiled
+    
+    def predict(self, X):
+        """
+        Predict the mean of the tree outputs for every row
+        
+        Args:
+            X (numpy.ndarray): Feature matrix, one row per prediction
+        
+        Returns:
+            numpy.ndarray: Prediction per row
+        """
+        X = np.asarray(X, dtype=np.float32)
+        if len(X) == 0:
+            return np.zeros(0)
+        return np.concatenate([self._predict_chunk(X[start:start + CHUNK_ROWS]) for start in range(0, len(X), CHUNK_ROWS)])
+    
+    def _predict_chunk(self, X):
+        # Features are laid out column by column, the leaf feature last
+        n_rows = len(X)
+        columns = np.empty((self.n_features + 1, n_rows), dtype=np.float32)
+        columns[:-1] = X.T
+        columns[-1] = -np.inf
+        columns = columns.ravel()
+        
+        # One node per tree and row, trees along the first axis
+        rows = np.arange(n_rows)[None, :]
+        nodes = np.repeat(self.roots[:, None], n_rows, axis=1)
+        for _ in range(self.max_depth):
+            offsets = self.feature.take(nodes).astype(np.intp) * n_rows + rows
+            right = columns.take(offsets) > self.value.take(nodes)
+            nodes = self.child.take(nodes) + right
+        # Summed tree by tree like sklearn, so the rounding is the same
+        return self.value.take(nodes).cumsum(axis=0)[-1] / len(self.roots)
+    
+    @property
+    def nbytes(self):
+        """Memory held by the node arrays"""
+        return self.buffer.nbytes + self.roots.nbytes
+    
+    def __getstate__(self):
+        # The views are rebuilt on load, so the buffer is stored once and
+        # can be memory-mapped
+        return {
+            'buffer': self.buffer, 'n_nodes': self.n_nodes, 'roots': self.roots,
+            'max_depth': self.max_depth, 'n_features': self.n_features
+        }
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._set_views()
+
+def _level_order(children_left, children_right):
+    """
+    Get the nodes of a tree level by level, the children of a node adjacent
+    
+    Args:
+        children_left (numpy.ndarray): Left child of every node, -1 for leaves
+        children_right (numpy.ndarray): Right child of every node
+    
+    Returns:
+        tuple: (node ids in their new order, depth of the tree)
+    """
+    levels = [np.zeros(1, dtype=np.intp)]
+    while True:
+        frontier = levels[-1]
+        internal = frontier[children_left[frontier] != -1]
+        if len(internal) == 0:
+            break
+        levels.append(np.column_stack([children_left[internal], children_right[internal]]).ravel())
+    return np.concatenate(levels), len(levels) - 1
+
+def compile_model(model):
+    """
+    Compile a model for inference if it is a random forest
+    
+    Args:
+        model: Fitted estimator
+    
+    Returns:
+        CompiledForest for a RandomForestRegressor, the model itself otherwise
+    """
+    # Linear models are already a handful of coefficients
+    if hasattr(model, 'estimators_'):
+        return CompiledForest.from_sklearn(model)
+    return model
\ No newline at end of file
@@ -1,40 +1,293 @@
 import pandas as pd
 import numpy as np
-from sklearn.preprocessing import StandardScaler
-from sklearn.model_selection import train_test_split
-from sklearn.linear_model import LinearRegression
-import joblib
 import os
+import hashlib
+import threading
+from app.models.group_index import GroupIndex
+from app.models.columnar_store import ColumnarStore
+from app.models.aggregate_cube import AggregateCube, mean_and_std, correlation
+from app.models.quantile_sketch import SketchTable, weighted_quantile
+from app.models.factor_impact import build_factor_impact_table
+from app.models.model_registry import fingerprint_rows, hash_rows
+from app.utils.metrics import instrument_methods, rows_scanned
 
+@instrument_methods('data_processor')
 class DataProcessor:
     """
     Class for processing and managing the agricultural yield dataset
     """
     
-    def __init__(self, data_path):
+    # Backends that keep no rows in this process set these to False
+    supports_append = True
+    supports_rows = True
+    
+    def __init__(self, data_path, columnar_dir=None):
         """
         Initialize the DataProcessor with the dataset
         
         Args:
             data_path (str): Path to the CSV dataset
+            columnar_dir (str, optional): Directory of the columnar copy of
+                the dataset, which is read instead of the CSV while fresh
         """
         self.data_path = data_path
-        self.df = self._load_data()
+        self.columnar_store = ColumnarStore(columnar_dir) if columnar_dir else None
+        self.version = self._source_version()
+        self.models = {}
+        self._set_schema()
+        
+        df, from_store = self._load_data()
+        self._build_structures(df)
+        if self.columnar_store is not None and not from_store:
+            self._write_columnar_store()
+        
+    def _build_structures(self, df):
+        """
+        Sort the rows and build every structure derived from them
+        
+        Args:
+            df (pandas.DataFrame): Loaded dataset
+        """
+        # Keep rows sorted by the index columns so filters resolve to slices;
+        # the frame index keeps the dataset row number of every row
+        self.df, self.index = GroupIndex.sort_frame(df, self.index_columns)
+        
+        # Sufficient statistics for the aggregate endpoints
+        self.cube = AggregateCube.from_frame(self.df, self.index_columns + ['Year'], self.cube_values)
+        self._build_factor_impacts()
+        self.geo_cube = AggregateCube.from_frame(self.df, self.geo_columns + ['Crop'], self.geo_values)
+        self._build_geo_rollups()
+        
+        # Quantile sketches for binning the numeric factors without sorting rows
+        self.sketches = SketchTable.from_frame(self.df, self.index, self.cube_values)
+        self._row_hashes = None
+        self._append_lock = threading.Lock()
+        
+    def _set_schema(self):
+        """
+        Set the column roles of the dataset
+        """
+        self.index_columns = ['Agro-Climatic Zone', 'Crop', 'Season', 'Soil Type']
         self.feature_columns = ['Rainfall (mm)', 'Irrigation (%)', 'Fertilizer Use (kg/ha)']
         self.target_column = 'crop_yield'
-        self.models = {}
+        
+        # Factor names accepted by the API and the columns they refer to
+        self.column_mappings = {
+            'Rainfall': 'Rainfall (mm)',
+            'Irrigation': 'Irrigation (%)',
+            'Fertilizer': 'Fertilizer Use (kg/ha)',
+            'Yield': 'crop_yield',
+            'Year': 'Year',
+            'Region': 'Agro-Climatic Zone',
+            'Crop': 'Crop',
+            'Soil': 'Soil Type',
+            'Season': 'Season'
+        }
+        self.cube_values = self.feature_columns + [self.target_column]
+        
+        # Drill-down levels from zone to district, and their totals
+        self.geo_columns = ['Agro-Climatic Zone', 'State', 'District']
+        self.geo_values = ['Area (ha)', 'Production (tonnes)', self.target_column]
+        
+    def _source_version(self):
+        """
+        Get a version stamp of the dataset file
+        
+        Returns:
+            str: Stamp that changes whenever the file is replaced or modified
+        """
+        stat = os.stat(self.data_path)
+        source = f"{os.path.abspath(self.data_path)}:{stat.st_size}:{stat.st_mtime_ns}"
+        return hashlib.sha1(source.encode()).hexdigest()[:16]
+    
+    def _build_factor_impacts(self):
+        """
+        Precompute the factor impact of every region and crop combination
+        """
+        self.factor_impacts = build_factor_impact_table(self.cube, self.feature_columns, self.target_column)
+        self._factor_impact_lookup = {
+            (row['Region'], row['Crop']): {feature: row[feature] for feature in self.feature_columns}
+            for row in self.factor_impacts.to_dict(orient='records')
+        }
+        coefficients = self.factor_impacts[[f'{feature} Coefficient' for feature in self.feature_columns]].to_numpy()
+        self._linear_fits = {
+            (region, crop): (intercept, coef)
+            for region, crop, intercept, coef in zip(
+                self.factor_impacts['Region'], self.factor_impacts['Crop'],
+                self.factor_impacts['Intercept'], coefficients
+            )
+        }
+        
+    def _build_geo_rollups(self):
+        """
+        Precompute the totals of every drill-down level, for all crops and per crop
+        """
+        rollups = {}
+        for depth in range(1, len(self.geo_columns) + 1):
+            columns = self.geo_columns[:depth]
+            level = columns[-1]
+            labels, count, sums, cross = self.geo_cube.rollup(by=columns)
+            rollups[(level, None)] = self._geo_stats(labels, count, sums, cross)
+            
+            labels, count, sums, cross = self.geo_cube.rollup(by=['Crop'] + columns)
+            stats = self._geo_stats(labels, count, sums, cross)
+            for crop, frame in stats.groupby('Crop', sort=False):
+                rollups[(level, crop)] = frame.drop(columns='Crop').reset_index(drop=True)
+        self.geo_rollups = rollups
+        
+    def _geo_stats(self, labels, count, sums, cross):
+        """
+        Get the yields and totals of rolled-up drill-down groups
+        
+        Args:
+            labels (pandas.DataFrame): Group labels from AggregateCube.rollup
+            count (numpy.ndarray): Row count per group
+            sums (numpy.ndarray): Sums of the geo values per group
+            cross (numpy.ndarray): Cross-products of the geo values per group
+            
+        Returns:
+            pandas.DataFrame: Group labels, mean and std of the row yields,
+            production over area, total area and production, and row count
+        """
+        area, production = sums[:, 0], sums[:, 1]
+        mean, std = mean_and_std(count, sums[:, 2], cross[:, 2, 2])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            weighted = np.where(area > 0, production / area, np.nan)
+            
+        columns = {column: labels[column].to_numpy() for column in labels.columns}
+        columns.update({
+            'Average Yield': mean,
+            'Std Dev': std,
+            'Weighted Yield': weighted,
+            'Area (ha)': area,
+            'Production (tonnes)': production,
+            'Sample Count': count
+        })
+        return pd.DataFrame(columns)
         
     def _load_data(self):
         """
-        Load the dataset from CSV
+        Load the dataset from the columnar store, or from CSV if the store is stale
         
         Returns:
-            pandas.DataFrame: The loaded dataset
+            tuple: (loaded dataset, True if it came from the columnar store)
         """
+        if self.columnar_store is not None and self.columnar_store.is_fresh(self.data_path):
+            return self.columnar_store.read(), True
+        
+        self._source_stamp = ColumnarStore.source_stamp(self.data_path)
         df = pd.read_csv(self.data_path)
-        # Basic cleaning
-        df = df.dropna()
-        return df
+        # Basic cleaning; rows are numbered in file order after it
+        df = df.dropna().reset_index(drop=True)
+        return df, False
+    
+    def _write_columnar_store(self):
+        """
+        Write the sorted dataset to the columnar store for later starts
+        """
+        try:
+            self.columnar_store.write(self.df, self._source_stamp)
+        except OSError:
+            # A read-only deployment keeps working from the CSV
+            pass
+    
+    def validate_rows(self, rows, max_errors=100):
+        """
+        Check rows against the dataset schema and convert them to its dtypes
+        
+        Args:
+            rows (pandas.DataFrame): Rows to check, with values as parsed
+                from CSV or JSON
+            max_errors (int): Maximum number of errors to report
+            
+        Returns:
+            tuple: (rows converted to the dataset dtypes, list of errors with
+            the row number, column and message of every problem)
+        """
+        missing = [column for column in self.df.columns if column not in rows.columns]
+        unknown = [column for column in rows.columns if column not in self.df.columns]
+        if missing or unknown:
+            errors = [{'row': None, 'column': column, 'error': 'Missing column'} for column in missing]
+            errors += [{'row': None, 'column': column, 'error': 'Unknown column'} for column in unknown]
+            return None, errors
+        
+        errors = []
+        converted = {}
+        for column, dtype in self.df.dtypes.items():
+            values = rows[column]
+            if pd.api.types.is_numeric_dtype(dtype):
+                numbers = pd.to_numeric(values, errors='coerce')
+                invalid = numbers.isna()
+                if pd.api.types.is_integer_dtype(dtype):
+                    invalid |= numbers.notna() & (numbers % 1 != 0)
+                    numbers = numbers.where(~invalid, 0)
+                message = 'Expected an integer' if pd.api.types.is_integer_dtype(dtype) else 'Expected a number'
+                converted[column] = numbers.astype(dtype)
+            else:
+                invalid = values.isna() | (values.astype(str).str.strip() == '')
+                message = 'Expected a non-empty value'
+                converted[column] = values.astype(str).astype(dtype)
+                
+            for row in np.flatnonzero(invalid.to_numpy())[:max_errors - len(errors)]:
+                errors.append({'row': int(row), 'column': column, 'error': message})
+                
+        if errors:
+            return None, sorted(errors, key=lambda error: error['row'])
+        return pd.DataFrame(converted, columns=self.df.columns), []
+    
+    def append_rows(self, rows, persist=True):
+        """
+        Append validated rows and update every derived structure incrementally
+        
+        The group index, aggregate cube and factor impact table are extended
+        from the new rows alone, without rescanning the dataset. New objects
+        replace the old ones in dependency order, so concurrent readers see
+        either the old or the new dataset.
+        
+        Args:
+            rows (pandas.DataFrame): Rows returned by validate_rows
+            persist (bool): Also append the rows to the CSV dataset, so they
+                survive a restart
+            
+        Returns:
+            dict: Number of appended rows, the (region, crop) pairs whose rows
+            changed and the new dataset version
+        """
+        with self._append_lock:
+            start = len(self.df)
+            rows = rows.set_axis(pd.RangeIndex(start, start + len(rows)))
+            if persist:
+                rows.to_csv(self.data_path, mode='a', header=False, index=False)
+                
+            cube = self.cube.merge(AggregateCube.from_frame(rows, self.cube.dimensions, self.cube_values))
+            geo_cube = self.geo_cube.merge(AggregateCube.from_frame(rows, self.geo_cube.dimensions, self.geo_values))
+            index = self.index.append(rows, start)
+            if self._row_hashes is not None:
+                new_hashes = hash_rows(rows, self.cube_values)
+                self._row_hashes = np.concatenate([self._row_hashes, new_hashes])
+                
+            # Rows first: the old index never points past the end of the new frame
+            self.df = pd.concat([self.df, rows])
+            self.index = index
+            self.cube = cube
+            self._build_factor_impacts()
+            self.geo_cube = geo_cube
+            self._build_geo_rollups()
+            self.sketches = self.sketches.append(rows)
+            
+            if persist:
+                self.version = self._source_version()
+            else:
+                digest = hashlib.sha1(self.version.encode())
+                digest.update(pd.util.hash_pandas_object(rows, index=False).to_numpy().tobytes())
+                self.version = digest.hexdigest()[:16]
+                
+        affected = rows[['Agro-Climatic Zone', 'Crop']].drop_duplicates()
+        return {
+            'appended': len(rows),
+            'affected': [list(pair) for pair in affected.itertuples(index=False)],
+            'version': self.version
+        }
     
     def get_unique_values(self, column):
         """
@@ -46,29 +299,180 @@ class DataProcessor:
         Returns:
             list: List of unique values
         """
+        if column in self.index.columns:
+            return self.index.unique_values(column)
         return sorted(self.df[column].unique().tolist())
     
+    def get_group_counts(self, columns):
+        """
+        Get the number of rows in every non-empty group of key columns
+        
+        Args:
+            columns (list): Index columns and/or 'Year'
+            
+        Returns:
+            pandas.DataFrame: One row per group with the group columns and 'Sample Count'
+        """
+        labels, count, _, _ = self.cube.rollup(by=columns, values=[])
+        labels['Sample Count'] = count
+        return labels
+    
+    def get_training_fingerprint(self, region, crop):
+        """
+        Get a content fingerprint of the rows a region/crop model trains on
+        
+        Args:
+            region (str): Agro-climatic zone
+            crop (str): Crop name
+            
+        Returns:
+            str: Hex fingerprint that changes whenever those rows change
+        """
+        # Read the index before the frame, which append_rows replaces first
+        index = self.index
+        if self._row_hashes is None:
+            with self._append_lock:
+                if self._row_hashes is None:
+                    self._row_hashes = hash_rows(self.df, self.cube_values)
+            
+        positions = index.select({'Agro-Climatic Zone': region, 'Crop': crop})
+        return fingerprint_rows(self._row_hashes[positions])
+    
     def filter_data(self, filters=None):
         """
         Filter the dataset based on provided filters
         
+        Filters on the index columns are resolved through the group index,
+        so the result is a slice of the sorted frame or a take of the
+        matching rows and does not depend on the size of the dataset.
+        The result may share memory with the dataset and must not be
+        modified in place.
+        
         Args:
             filters (dict): Dictionary of column-value pairs for filtering
             
         Returns:
-            pandas.DataFrame: Filtered dataframe
+            pandas.DataFrame: Filtered dataframe in key order, indexed by
+            dataset row number
         """
-        if not filters:
+        indexed_filters, residual_filters = self.index.split_filters(filters)
+        if not indexed_filters and not residual_filters:
             return self.df
             
-        filtered_df = self.df.copy()
+        if indexed_filters:
+            positions = self.index.select(indexed_filters)
+            if isinstance(positions, slice):
+                filtered_df = self.df.iloc[positions]
+            else:
+                filtered_df = self.df.take(positions)
+        else:
+            filtered_df = self.df
+        rows_scanned.observe(len(filtered_df), method='filter_data')
         
-        for column, value in filters.items():
-            if value and column in filtered_df.columns:
+        for column, value in residual_filters.items():
+            if column in filtered_df.columns:
                 filtered_df = filtered_df[filtered_df[column] == value]
                 
         return filtered_df
     
+    def iter_row_positions(self, filters=None, year_range=None, offset=0, chunk_size=10000, snapshot=None):
+        """
+        Scan the rows that match the filters in chunks of candidate rows
+        
+        Candidates are the rows selected by the index filters, in index
+        order; the remaining filters and the year range are applied to one
+        chunk of candidates at a time, so memory does not grow with the
+        size of the result. Offsets count candidates, which makes them
+        stable resume points for the same filters and dataset version.
+        
+        Args:
+            filters (dict, optional): Column-value pairs for filtering
+            year_range (tuple, optional): Inclusive (first, last) year; either
+                bound may be None
+            offset (int): Candidate offset to start from
+            chunk_size (int): Candidates per chunk
+            snapshot (tuple, optional): (index, frame) from row_snapshot
+            
+        Yields:
+            tuple: (positions of the matching rows in the frame, their
+            candidate offsets, candidate offset after the chunk)
+        """
+        index, df = snapshot or self.row_snapshot()
+        indexed_filters, residual_filters = index.split_filters(filters)
+        starts, stops = index.cell_ranges(indexed_filters)
+        lengths = stops - starts
+        bounds = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=bounds[1:])
+        
+        residual = [(df[column].to_numpy(), value) for column, value in residual_filters.items() if column in df.columns]
+        first_year, last_year = year_range or (None, None)
+        years = df['Year'].to_numpy() if first_year is not None or last_year is not None else None
+        
+        position = offset
+        scanned = 0
+        try:
+            while position < bounds[-1]:
+                end = min(position + chunk_size, int(bounds[-1]))
+                candidates = np.arange(position, end)
+                ranges = np.searchsorted(bounds, candidates, side='right') - 1
+                rows = index.order[starts[ranges] + (candidates - bounds[ranges])]
+                
+                mask = np.ones(len(rows), dtype=bool)
+                for values, value in residual:
+                    mask &= values[rows] == value
+                if first_year is not None:
+                    mask &= years[rows] >= first_year
+                if last_year is not None:
+                    mask &= years[rows] <= last_year
+                    
+                scanned = end - offset
+                yield rows[mask], candidates[mask], end
+                position = end
+        finally:
+            # Also runs when a page stops the scan early
+            rows_scanned.observe(scanned, method='iter_row_positions')
+    
+    def row_snapshot(self):
+        """
+        Get a consistent view of the index and frame for a long scan
+        
+        Returns:
+            tuple: (GroupIndex, pandas.DataFrame)
+        """
+        # Read the index before the frame, which append_rows replaces first
+        index = self.index
+        return index, self.df
+    
+    def get_rows_page(self, filters=None, year_range=None, offset=0, limit=1000, chunk_size=10000, snapshot=None):
+        """
+        Get the positions of one page of matching rows
+        
+        Args:
+            filters (dict, optional): Column-value pairs for filtering
+            year_range (tuple, optional): Inclusive (first, last) year
+            offset (int): Candidate offset the page starts at
+            limit (int): Maximum rows in the page
+            chunk_size (int): Candidates scanned per step
+            snapshot (tuple, optional): (index, frame) from row_snapshot
+            
+        Returns:
+            tuple: (row positions of the page, candidate offset of the next
+            page or None after the last page)
+        """
+        pages = []
+        found = 0
+        for rows, candidates, _ in self.iter_row_positions(filters, year_range, offset, chunk_size, snapshot):
+            # One row past the page tells whether another page follows
+            if found + len(rows) > limit:
+                needed = limit - found
+                pages.append(rows[:needed])
+                return np.concatenate(pages), int(candidates[needed])
+            pages.append(rows)
+            found += len(rows)
+            
+        positions = np.concatenate(pages) if pages else np.zeros(0, dtype=np.int64)
+        return positions, None
+    
     def get_yield_by_region(self, crop=None):
         """
         Get average yield by agro-climatic zone
@@ -79,25 +483,51 @@ class DataProcessor:
         Returns:
             pandas.DataFrame: Average yield by region
         """
-        filters = {}
-        if crop:
-            filters['Crop'] = crop
-            
-        filtered_df = self.filter_data(filters)
+        labels, count, sums, cross = self.cube.rollup(
+            by=['Agro-Climatic Zone'], filters={'Crop': crop}, values=[self.target_column]
+        )
         
-        region_yield = filtered_df.groupby('Agro-Climatic Zone')[self.target_column].agg(['mean', 'std', 'count']).reset_index()
+        region_yield = self._yield_stats(labels, count, sums, cross)
         region_yield.columns = ['Region', 'Average Yield', 'Std Dev', 'Sample Count']
         
         return region_yield.sort_values('Average Yield', ascending=False)
     
-    def get_yield_by_factor(self, factor, region=None, crop=None):
+    def _yield_stats(self, labels, count, sums, cross):
+        """
+        Get yield mean, standard deviation and count per rolled-up group
+        
+        Args:
+            labels (pandas.DataFrame): Group labels from AggregateCube.rollup
+            count (numpy.ndarray): Row count per group
+            sums (numpy.ndarray): Yield sums per group
+            cross (numpy.ndarray): Yield sums of squares per group
+            
+        Returns:
+            pandas.DataFrame: Group labels followed by mean, std and count
+        """
+        mean, std = mean_and_std(count, sums[:, 0], cross[:, 0, 0])
+        
+        # One constructor call instead of inserting columns one at a time
+        columns = {column: labels[column].to_numpy() for column in labels.columns}
+        columns.update({'mean': mean, 'std': std, 'count': count})
+        return pd.DataFrame(columns, index=labels.index)
+    
+    def get_yield_by_factor(self, factor, region=None, crop=None, bins=5):
         """
         Get yield data grouped by a specific factor
         
+        Numeric factors are split into quantile bins. Bin edges of the
+        sketched columns come from the quantile sketch of the filtered group,
+        and rows are assigned to bins through the group index, so no call
+        sorts the raw rows. Year is a cube dimension, so its bins and
+        statistics come exactly from the per-year cells, as do the groups
+        of the categorical factors.
+        
         Args:
-            factor (str): Factor column to group by
+            factor (str): Factor column, or its API name, to group by
             region (str, optional): Filter by specific region
             crop (str, optional): Filter by specific crop
+            bins (int): Number of quantile bins for numeric factors
             
         Returns:
             pandas.DataFrame: Data grouped by factor
@@ -108,20 +538,110 @@ class DataProcessor:
         if crop:
             filters['Crop'] = crop
             
+        factor = self.column_mappings.get(factor, factor)
+        if factor in self.cube.dimensions:
+            return self._yield_by_dimension(factor, filters, bins)
+        if factor in self.sketches.columns:
+            return self._yield_by_sketch(factor, region, crop, bins)
+            
         filtered_df = self.filter_data(filters)
         
         if factor not in filtered_df.columns:
             return pd.DataFrame()
             
         # For numerical factors, create bins
-        if filtered_df[factor].dtype in [np.float64, np.int64]:
-            filtered_df[f'{factor} Bin'] = pd.qcut(filtered_df[factor], 5, duplicates='drop')
-            factor = f'{factor} Bin'
+        groups = filtered_df[factor]
+        if groups.dtype in [np.float64, np.int64]:
+            groups = pd.qcut(groups, bins, duplicates='drop').rename(f'{factor} Bin')
             
-        factor_yield = filtered_df.groupby(factor)[self.target_column].agg(['mean', 'count']).reset_index()
-        factor_yield.columns = [factor, 'Average Yield', 'Sample Count']
+        factor_yield = filtered_df.groupby(groups, observed=True)[self.target_column].agg(['mean', 'count']).reset_index()
+        factor_yield.columns = [groups.name, 'Average Yield', 'Sample Count']
+        factor_yield = factor_yield.sort_values(groups.name)
         
-        return factor_yield.sort_values(factor)
+        # Bin intervals are not JSON serializable, so report them as labels
+        if isinstance(factor_yield[groups.name].dtype, pd.CategoricalDtype):
+            factor_yield[groups.name] = factor_yield[groups.name].astype(str)
+        
+        return factor_yield
+    
+    def _yield_by_dimension(self, factor, filters, bins):
+        """
+        Get yield by a dimension of the aggregate cube
+        
+        Args:
+            factor (str): Cube dimension
+            filters (dict): Region and crop filters
+            bins (int): Number of quantile bins for a numeric dimension
+            
+        Returns:
+            pandas.DataFrame: Average yield and row count per group or bin
+        """
+        labels, count, sums, _ = self.cube.rollup(by=[factor], filters=filters, values=[self.target_column])
+        levels = labels[factor].to_numpy()
+        
+        if pd.api.types.is_numeric_dtype(levels.dtype):
+            edges = np.unique(weighted_quantile(levels, count, np.linspace(0, 1, bins + 1)))
+            return self._binned_yield(factor, edges, levels, count, sums[:, 0])
+            
+        factor_yield = pd.DataFrame({factor: levels, 'Average Yield': sums[:, 0] / count, 'Sample Count': count})
+        return factor_yield
+    
+    def _yield_by_sketch(self, factor, region, crop, bins):
+        """
+        Get yield by quantile bins of a sketched column
+        
+        Args:
+            factor (str): Sketched column
+            region (str): Region filter, or None
+            crop (str): Crop filter, or None
+            bins (int): Number of quantile bins
+            
+        Returns:
+            pandas.DataFrame: Average yield and row count per bin
+        """
+        sketch = self.sketches.get(factor, region, crop)
+        if sketch is None:
+            return self._binned_yield(factor, np.zeros(0), np.zeros(0), np.zeros(0), np.zeros(0))
+        edges = np.unique(sketch.quantile(np.linspace(0, 1, bins + 1)))
+        
+        index, df = self.row_snapshot()
+        positions = index.select({'Agro-Climatic Zone': region, 'Crop': crop})
+        values = df[factor].to_numpy()[positions]
+        yields = df[self.target_column].to_numpy()[positions]
+        rows_scanned.observe(len(values), method='get_yield_by_factor')
+        return self._binned_yield(factor, edges, values, np.ones(len(values)), yields)
+    
+    def _binned_yield(self, factor, edges, values, weights, yield_sums):
+        """
+        Aggregate yield into bins with the same intervals and labels as pd.qcut
+        
+        Args:
+            factor (str): Binned column
+            edges (numpy.ndarray): Sorted distinct bin edges
+            values (numpy.ndarray): Column values
+            weights (numpy.ndarray): Number of rows behind every value
+            yield_sums (numpy.ndarray): Yield sum behind every value
+            
+        Returns:
+            pandas.DataFrame: Bin label, average yield and row count of every
+            non-empty bin, in bin order
+        """
+        name = f'{factor} Bin'
+        if len(edges) < 2:
+            return pd.DataFrame(columns=[name, 'Average Yield', 'Sample Count'])
+            
+        n_bins = len(edges) - 1
+        bin_ids = bin_ids_of(edges, values)
+        count = np.bincount(bin_ids, weights=weights, minlength=n_bins).astype(np.int64)
+        sums = np.bincount(bin_ids, weights=yield_sums, minlength=n_bins)
+        
+        labels = pd.cut(edges, edges, include_lowest=True).categories.astype(str)
+        observed = count > 0
+        return pd.DataFrame({
+            name: np.asarray(labels)[observed],
+            'Average Yield': sums[observed] / count[observed],
+            'Sample Count': count[observed]
+        })
     
     def get_yield_trend(self, region=None, crop=None):
         """
@@ -140,13 +660,98 @@ class DataProcessor:
         if crop:
             filters['Crop'] = crop
             
-        filtered_df = self.filter_data(filters)
+        labels, count, sums, cross = self.cube.rollup(by=['Year'], filters=filters, values=[self.target_column])
         
-        yearly_yield = filtered_df.groupby('Year')[self.target_column].agg(['mean', 'std', 'count']).reset_index()
+        yearly_yield = self._yield_stats(labels, count, sums, cross)
         yearly_yield.columns = ['Year', 'Average Yield', 'Std Dev', 'Sample Count']
         
         return yearly_yield.sort_values('Year')
     
+    def get_view_statistics(self, region=None, crop=None):
+        """
+        Get every yield breakdown of a dashboard view from one selection
+        
+        The matching cells are selected from the cube once and rolled up
+        by year, region, season and soil type.
+        
+        Args:
+            region (str, optional): Filter by specific region
+            crop (str, optional): Filter by specific crop
+            
+        Returns:
+            dict: 'yield_trend' by year, 'yield_by_region', 'yield_by_season'
+            and 'yield_by_soil' sorted by average yield, and 'factor_impact'
+        """
+        view = self.cube.select({'Agro-Climatic Zone': region, 'Crop': crop})
+        
+        breakdowns = {}
+        for key, dimension, label in [
+            ('yield_trend', 'Year', 'Year'),
+            ('yield_by_region', 'Agro-Climatic Zone', 'Region'),
+            ('yield_by_season', 'Season', 'Season'),
+            ('yield_by_soil', 'Soil Type', 'Soil Type')
+        ]:
+            labels, count, sums, cross = view.rollup(by=[dimension], values=[self.target_column])
+            stats = self._yield_stats(labels, count, sums, cross)
+            stats.columns = [label, 'Average Yield', 'Std Dev', 'Sample Count']
+            if dimension == 'Year':
+                breakdowns[key] = stats.sort_values('Year')
+            else:
+                breakdowns[key] = stats.sort_values('Average Yield', ascending=False)
+                
+        breakdowns['factor_impact'] = self.get_factor_impact(region=region, crop=crop)
+        return breakdowns
+    
+    def get_all_view_statistics(self, with_version=False):
+        """
+        Get the statistics of every region and crop view in one sweep
+        
+        Each breakdown is rolled up once for all views together, grouped
+        by region and crop, by region or by crop plus the breakdown
+        dimension, and then split per view. All views come from a single
+        snapshot of the dataset, even while rows are appended.
+        
+        Args:
+            with_version (bool): Also return the dataset version of the snapshot
+        
+        Returns:
+            dict: Same dict as get_view_statistics, keyed by (region, crop)
+            for every pair with rows, (region, None) for every region and
+            (None, crop) for every crop. With with_version, a tuple of the
+            version and that dict
+        """
+        # append_rows replaces these one at a time, so read them together
+        with self._append_lock:
+            version, cube, factor_impacts = self.version, self.cube, self._factor_impact_lookup
+            
+        region_column, crop_column = 'Agro-Climatic Zone', 'Crop'
+        views = {}
+        for keys in ([region_column, crop_column], [region_column], [crop_column]):
+            for key, dimension, label in [
+                ('yield_trend', 'Year', 'Year'),
+                ('yield_by_region', region_column, 'Region'),
+                ('yield_by_season', 'Season', 'Season'),
+                ('yield_by_soil', 'Soil Type', 'Soil Type')
+            ]:
+                by = keys if dimension in keys else keys + [dimension]
+                labels, count, sums, cross = cube.rollup(by=by, values=[self.target_column])
+                stats = self._yield_stats(labels[[dimension]], count, sums, cross)
+                stats.columns = [label, 'Average Yield', 'Std Dev', 'Sample Count']
+                if dimension == 'Year':
+                    stats = stats.sort_values('Year')
+                else:
+                    stats = stats.sort_values('Average Yield', ascending=False)
+                    
+                # Group order is kept, so every view stays sorted
+                for group, frame in stats.groupby([labels[column] for column in keys], sort=False):
+                    group = group if isinstance(group, tuple) else (group,)
+                    view = (group[0], group[1]) if len(keys) == 2 else (group[0], None) if keys[0] == region_column else (None, group[0])
+                    views.setdefault(view, {})[key] = frame
+                    
+        for (region, crop), breakdowns in views.items():
+            breakdowns['factor_impact'] = dict(factor_impacts.get((region, crop), {}))
+        return (version, views) if with_version else views
+    
     def get_correlation_matrix(self, region=None, crop=None):
         """
         Get correlation matrix between yield and factors
@@ -164,10 +769,14 @@ class DataProcessor:
         if crop:
             filters['Crop'] = crop
             
-        filtered_df = self.filter_data(filters)
+        _, count, sums, cross = self.cube.rollup(filters=filters)
         
         numeric_columns = ['Rainfall (mm)', 'Irrigation (%)', 'Fertilizer Use (kg/ha)', self.target_column]
-        correlation_matrix = filtered_df[numeric_columns].corr()
+        correlation_matrix = pd.DataFrame(
+            correlation(count, sums, cross)[0],
+            index=self.cube_values,
+            columns=self.cube_values
+        ).loc[numeric_columns, numeric_columns]
         
         return correlation_matrix
     
@@ -175,6 +784,9 @@ class DataProcessor:
         """
         Get the impact of each factor on yield
         
+        Impacts are the absolute linear regression coefficients normalized
+        to sum to 100%, looked up from the table built at load time.
+        
         Args:
             region (str, optional): Filter by specific region
             crop (str, optional): Filter by specific crop
@@ -182,31 +794,95 @@ class DataProcessor:
         Returns:
             dict: Factor impact scores
         """
-        filters = {}
-        if region:
-            filters['Agro-Climatic Zone'] = region
-        if crop:
-            filters['Crop'] = crop
-            
-        filtered_df = self.filter_data(filters)
+        importance = self._factor_impact_lookup.get((region or None, crop or None), {})
+        
+        return dict(importance)
+    
+    def get_linear_fit(self, region, crop):
+        """
+        Get the least-squares linear fit of yield on the features
         
-        if len(filtered_df) < 10:
-            return {}
+        The fit comes from the precomputed factor impact table, so it costs
+        a lookup.
+        
+        Args:
+            region (str): Agro-climatic zone
+            crop (str): Crop name
+        
+        Returns:
+            tuple: (intercept, coefficient array in feature column order), or
+            None if the region and crop have too few rows
+        """
+        return self._linear_fits.get((region, crop))
+    
+    def get_all_factor_impacts(self):
+        """
+        Get the factor impact table for every region and crop combination
+        
+        Returns:
+            pandas.DataFrame: Region, Crop, Sample Count and one impact column
+            per factor; None stands for all regions or all crops
+        """
+        return self.factor_impacts[['Region', 'Crop', 'Sample Count'] + self.feature_columns]
+    
+    def get_geo_rollup(self, level, filters=None, crop=None, sort_by=None, ascending=True, offset=0, limit=100):
+        """
+        Get one page of a drill-down level, sorted
+        
+        Groups come from the totals precomputed per level, so neither the
+        filters nor the sorting read any row.
+        
+        Args:
+            level (str): 'Agro-Climatic Zone', 'State' or 'District'
+            filters (dict, optional): Values of the levels above, e.g. the
+                zone and state of the districts to list; falsy values are
+                ignored
+            crop (str, optional): Filter by specific crop
+            sort_by (str, optional): Column to sort by; by default groups
+                are in zone, state and district order
+            ascending (bool): Sort order
+            offset (int): Groups to skip
+            limit (int): Maximum number of groups
             
-        X = filtered_df[self.feature_columns]
-        y = filtered_df[self.target_column]
+        Returns:
+            tuple: (page as a DataFrame with the level columns, Average
+            Yield, Std Dev, Weighted Yield, Area (ha), Production (tonnes)
+            and Sample Count; number of matching groups)
+        """
+        if level not in self.geo_columns:
+            raise ValueError(f"Invalid level: {level}")
+        columns = self.geo_columns[:self.geo_columns.index(level) + 1]
         
-        # Train a simple linear regression model
-        model = LinearRegression()
-        model.fit(X, y)
+        frame = self.geo_rollups.get((level, crop or None))
+        if frame is None:
+            frame = self.geo_rollups[(level, None)].iloc[:0]
+        for column, value in (filters or {}).items():
+            if not value:
+                continue
+            if column not in columns[:-1]:
+                raise ValueError(f"Cannot filter {level} groups by {column}")
+            frame = frame[frame[column].to_numpy() == value]
+            
+        if sort_by:
+            if sort_by not in frame.columns:
+                raise ValueError(f"Invalid sort column: {sort_by}")
+            # Stable, so ties stay in zone, state and district order
+            frame = frame.sort_values(sort_by, ascending=ascending, kind='mergesort')
         
-        # Get feature importance
-        importance = dict(zip(self.feature_columns, model.coef_))
+        return frame.iloc[offset:offset + limit].reset_index(drop=True), len(frame)
+
+def bin_ids_of(edges, values):
+    """
+    Get the quantile bin of every value
+    
+    Bins are closed on the right and the first one also holds the minimum,
+    like the intervals of pd.qcut.
+    
+    Args:
+        edges (numpy.ndarray): Sorted distinct bin edges, at least two
+        values (numpy.ndarray): Values to assign
         
-        # Normalize to sum to 100%
-        total = sum(abs(val) for val in importance.values())
-        if total > 0:
-            for key in importance:
-                importance[key] = abs(importance[key]) / total * 100
-                
-        return importance 
\ No newline at end of file
+    Returns:
+        numpy.ndarray: Bin number of every value
+    """
+    return np.clip(np.searchsorted(edges, values, side='left') - 1, 0, len(edges) - 2)
\ No newline at end of file
@@ -0,0 +1,93 @@
+import pandas as pd
+import numpy as np
+from app.models.aggregate_cube import covariance
+
+def solve_regressions(count, sums, cross):
+    """
+    Fit ordinary least squares with intercept for many groups at once
+    
+    The last value column is the target and the others are the features.
+    Coefficients come from the normal equations on the group covariance
+    matrices, solved with a pseudo-inverse so that rank-deficient groups
+    get the same minimum-norm solution as LinearRegression.
+    
+    Args:
+        count (numpy.ndarray): Row counts, shape (groups,)
+        sums (numpy.ndarray): Sums, shape (groups, values)
+        cross (numpy.ndarray): Cross-products, shape (groups, values, values)
+    
+    Returns:
+        tuple: (intercepts, coefficients) with shapes (groups,) and (groups, features)
+    """
+    cov = covariance(count, sums, cross)
+    sxx = cov[:, :-1, :-1]
+    sxy = cov[:, :-1, -1]
+    coef = np.einsum('gij,gj->gi', np.linalg.pinv(sxx), sxy)
+    
+    mean = sums / np.asarray(count, dtype=np.float64)[:, None]
+    intercept = mean[:, -1] - np.einsum('gi,gi->g', coef, mean[:, :-1])
+    return intercept, coef
+
+def impact_scores(coef):
+    """
+    Convert regression coefficients to impact percentages
+    
+    Args:
+        coef (numpy.ndarray): Coefficients, shape (groups, features)
+    
+    Returns:
+        numpy.ndarray: Absolute coefficients normalized to sum to 100 per group
+    """
+    total = np.abs(coef).sum(axis=1, keepdims=True)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(total > 0, np.abs(coef) / total * 100, coef)
+
+def build_factor_impact_table(cube, features, target, min_samples=10):
+    """
+    Compute the factor impact of every region, crop and region-crop group
+    
+    Groups cover every (region, crop) pair plus the all-crops, all-regions
+    and whole-dataset cases, which are marked with None. All groups are
+    solved in a single batched pass over the cube statistics.
+    
+    Args:
+        cube (AggregateCube): Cube with the features and target as values
+        features (list): Feature columns
+        target (str): Target column
+        min_samples (int): Minimum rows for a group to get a score
+    
+    Returns:
+        pandas.DataFrame: One row per group with Region, Crop, Sample Count,
+        Intercept, one coefficient and one impact column per feature
+    """
+    values = list(features) + [target]
+    groupings = [['Agro-Climatic Zone', 'Crop'], ['Agro-Climatic Zone'], ['Crop'], []]
+    
+    frames, counts, sums, crosses = [], [], [], []
+    for by in groupings:
+        labels, count, group_sums, cross = cube.rollup(by=by, values=values)
+        frames.append(pd.DataFrame({
+            'Region': labels['Agro-Climatic Zone'] if 'Agro-Climatic Zone' in by else None,
+            'Crop': labels['Crop'] if 'Crop' in by else None
+        }, index=labels.index))
+        counts.append(count)
+        sums.append(group_sums)
+        crosses.append(cross)
+    
+    table = pd.concat(frames, ignore_index=True)
+    count = np.concatenate(counts)
+    group_sums = np.concatenate(sums)
+    cross = np.concatenate(crosses)
+    
+    keep = count >= min_samples
+    table = table[keep].reset_index(drop=True)
+    intercept, coef = solve_regressions(count[keep], group_sums[keep], cross[keep])
+    impact = impact_scores(coef)
+    
+    table['Sample Count'] = count[keep]
+    table['Intercept'] = intercept
+    for i, feature in enumerate(features):
+        table[f'{feature} Coefficient'] = coef[:, i]
+    for i, feature in enumerate(features):
+        table[feature] = impact[:, i]
+    return table
\ No newline at end of file
@@ -0,0 +1,222 @@
+import pandas as pd
+import numpy as np
+
+class GroupIndex:
+    """
+    Row index over the categorical key columns of the dataset
+    
+    Rows are grouped into cells, one cell per combination of key values,
+    and each cell owns a contiguous range of the ``order`` position array.
+    When the frame has been physically sorted by the key columns (see
+    ``sort_frame``) ``order`` is the identity, so filters on a prefix of the
+    key columns resolve to a single slice of the frame.
+    """
+    
+    def __init__(self, df, columns):
+        """
+        Build the index for a dataframe
+        
+        Args:
+            df (pandas.DataFrame): Dataset to index
+            columns (list): Key columns, most significant first
+        """
+        self.columns = list(columns)
+        self.levels = {}
+        self._lookup = {}
+        
+        codes = []
+        for column in self.columns:
+            column_codes, uniques = pd.factorize(df[column], sort=True)
+            self.levels[column] = np.asarray(uniques, dtype=object)
+            self._lookup[column] = {value: code for code, value in enumerate(self.levels[column])}
+            codes.append(column_codes)
+        
+        self.shape = tuple(len(self.levels[column]) for column in self.columns)
+        n_cells = int(np.prod(self.shape)) if self.columns else 1
+        
+        if len(df):
+            cell_ids = np.ravel_multi_index(codes, self.shape)
+        else:
+            cell_ids = np.zeros(0, dtype=np.int64)
+        
+        # Stable sort keeps the original row order inside every cell
+        self.order = np.argsort(cell_ids, kind='stable')
+        counts = np.bincount(cell_ids, minlength=n_cells)
+        self.offsets = np.zeros(n_cells + 1, dtype=np.int64)
+        np.cumsum(counts, out=self.offsets[1:])
+        self.contiguous = False
+    
+    @classmethod
+    def sort_frame(cls, df, columns):
+        """
+        Sort a dataframe by the key columns and index the sorted copy
+        
+        The sorted copy keeps the index of the dataframe, so every row
+        keeps its dataset row number.
+        
+        Args:
+            df (pandas.DataFrame): Dataset to sort
+            columns (list): Key columns, most significant first
+        
+        Returns:
+            tuple: (sorted dataframe, GroupIndex over the sorted dataframe)
+        """
+        index = cls(df, columns)
+        if len(df) > 1 and np.all(index.order[1:] > index.order[:-1]):
+            # Already in key order, e.g. when read back from the columnar store
+            sorted_df = df
+        else:
+            sorted_df = df.take(index.order)
+        index.order = np.arange(len(sorted_df))
+        index.contiguous = True
+        return sorted_df, index
+    
+    def __len__(self):
+        return int(self.offsets[-1])
+    
+    def append(self, df, start):
+        """
+        Index rows appended to the end of the frame
+        
+        The new rows are inserted at the end of their cells, so rows keep
+        their order inside every cell without re-sorting the existing ones.
+        Key values seen for the first time are merged into the sorted levels
+        and the existing cells are remapped onto the larger shape.
+        
+        Args:
+            df (pandas.DataFrame): Appended rows
+            start (int): Position of the first appended row in the frame
+        
+        Returns:
+            GroupIndex: Index over the extended frame; this index is left
+            unchanged so concurrent readers keep a consistent view
+        """
+        index = GroupIndex.__new__(GroupIndex)
+        index.columns = self.columns
+        index.levels = dict(self.levels)
+        index._lookup = dict(self._lookup)
+        
+        remaps = []
+        codes = []
+        for column in self.columns:
+            values = df[column]
+            unseen = set(values.unique()) - set(self._lookup[column])
+            if unseen:
+                levels = np.asarray(sorted(set(self.levels[column]) | unseen), dtype=object)
+                index.levels[column] = levels
+                index._lookup[column] = {value: code for code, value in enumerate(levels)}
+            remaps.append(np.array([index._lookup[column][value] for value in self.levels[column]], dtype=np.int64))
+            codes.append(values.map(index._lookup[column]).to_numpy(dtype=np.int64))
+        
+        index.shape = tuple(len(index.levels[column]) for column in self.columns)
+        n_cells = int(np.prod(index.shape)) if self.columns else 1
+        
+        # Row counts of the existing cells, moved to their cell ids in the new shape
+        counts = np.zeros(index.shape, dtype=np.int64)
+        counts[np.ix_(*remaps)] = np.diff(self.offsets).reshape(self.shape)
+        counts = counts.ravel()
+        offsets = np.zeros(n_cells + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        
+        if len(df):
+            cell_ids = np.ravel_multi_index(codes, index.shape)
+        else:
+            cell_ids = np.zeros(0, dtype=np.int64)
+        new_order = np.argsort(cell_ids, kind='stable')
+        
+        # Every new row goes right after the existing rows of its cell
+        index.order = np.insert(self.order, offsets[cell_ids[new_order] + 1], start + new_order)
+        counts += np.bincount(cell_ids, minlength=n_cells)
+        index.offsets = np.zeros(n_cells + 1, dtype=np.int64)
+        np.cumsum(counts, out=index.offsets[1:])
+        index.contiguous = self.contiguous and len(df) == 0
+        return index
+    
+    def split_filters(self, filters):
+        """
+        Split filters into the ones served by the index and the rest
+        
+        Args:
+            filters (dict): Column-value pairs; falsy values are ignored
+        
+        Returns:
+            tuple: (indexed filters, residual filters)
+        """
+        indexed = {}
+        residual = {}
+        for column, value in (filters or {}).items():
+            if not value:
+                continue
+            if column in self._lookup:
+                indexed[column] = value
+            else:
+                residual[column] = value
+        return indexed, residual
+    
+    def cell_ranges(self, filters=None):
+        """
+        Get the ranges of ``order`` holding the rows that match the filters
+        
+        Args:
+            filters (dict): Column-value pairs on the key columns
+        
+        Returns:
+            tuple: (starts, stops) arrays of non-empty ranges, in cell order
+        """
+        axes = []
+        for column, size in zip(self.columns, self.shape):
+            value = (filters or {}).get(column)
+            if not value:
+                axes.append(np.arange(size))
+            elif value in self._lookup[column]:
+                axes.append(np.array([self._lookup[column][value]]))
+            else:
+                empty = np.zeros(0, dtype=np.int64)
+                return empty, empty
+        
+        grids = np.meshgrid(*axes, indexing='ij')
+        cells = np.ravel_multi_index([grid.ravel() for grid in grids], self.shape)
+        starts = self.offsets[cells]
+        stops = self.offsets[cells + 1]
+        non_empty = stops > starts
+        return starts[non_empty], stops[non_empty]
+    
+    def select(self, filters=None):
+        """
+        Get the positions of the rows that match the filters
+        
+        Args:
+            filters (dict): Column-value pairs on the key columns
+        
+        Returns:
+            slice or numpy.ndarray: A slice when the rows are contiguous in
+            the frame, otherwise an array of row positions
+        """
+        starts, stops = self.cell_ranges(filters)
+        if len(starts) == 0:
+            return np.zeros(0, dtype=np.int64)
+        
+        # Adjacent ranges in a sorted frame collapse into one slice
+        if self.contiguous and np.array_equal(starts[1:], stops[:-1]):
+            return slice(int(starts[0]), int(stops[-1]))
+        
+        lengths = stops - starts
+        run_offsets = np.cumsum(lengths) - lengths
+        positions = np.arange(lengths.sum()) + np.repeat(starts - run_offsets, lengths)
+        return self.order[positions]
+    
+    def unique_values(self, column):
+        """
+        Get the sorted non-empty values of a key column
+        
+        Args:
+            column (str): Key column
+        
+        Returns:
+            list: Values that occur in at least one row
+        """
+        axis = self.columns.index(column)
+        counts = np.diff(self.offsets).reshape(self.shape)
+        other_axes = tuple(i for i in range(len(self.shape)) if i != axis)
+        present = counts.sum(axis=other_axes) > 0
+        return sorted(self.levels[column][present].tolist())
\ No newline at end of file
@@ -0,0 +1,100 @@
+import os
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+class InsightsTable:
+    """
+    Insight payloads of every region and crop view, built ahead of requests
+    
+    The statistics of all views come from one sweep over the data, then
+    the payloads are built in parallel over partitions of the views and
+    swapped in as a whole, stamped with the dataset version they were
+    built from. Lookups are a single dict access. Once the dataset
+    version changes the table is stale: lookups miss, so callers compute
+    the payload themselves, until a rebuild in the background swaps in
+    the new table.
+    """
+    
+    def __init__(self, version, views, build, workers=None):
+        """
+        Initialize an empty table
+        
+        Args:
+            version (callable): Returns the current dataset version
+            views (callable): Returns the dataset version the statistics
+                were read at and the statistics of every view, keyed by
+                (region, crop)
+            build (callable): Builds the payloads of a list of
+                ((region, crop), statistics) items, returned as a dict
+            workers (int, optional): Threads building the payloads; up to
+                4 by default, depending on the CPU count
+        """
+        self.version = version
+        self.views = views
+        self.build = build
+        self.workers = workers or min(4, os.cpu_count() or 1)
+        self.builds = 0
+        self._table = (None, {})
+        self._build_lock = threading.Lock()
+    
+    def get(self, kind, *key):
+        """
+        Look up a payload built from the current dataset
+        
+        Args:
+            kind (str): Payload kind, e.g. 'region', 'crop' or 'strategies'
+            *key: Rest of the payload key
+        
+        Returns:
+            The payload, shared and not to be modified, or None if the view
+            has no payload or the table is stale
+        """
+        version, payloads = self._table
+        if version != self.version():
+            self.refresh_in_background()
+            return None
+        return payloads.get((kind,) + key)
+    
+    def refresh(self):
+        """
+        Rebuild the table unless it matches the dataset version
+        
+        Returns:
+            bool: True if the table was rebuilt
+        """
+        with self._build_lock:
+            if self._table[0] == self.version():
+                return False
+            
+            # The table is stamped with the version of the statistics it is
+            # built from; rows appended during the build leave it stale
+            version, views = self.views()
+            views = list(views.items())
+            partitions = [views[i::self.workers] for i in range(self.workers)]
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='insights') as pool:
+                parts = list(pool.map(self.build, partitions))
+            
+            payloads = {}
+            for part in parts:
+                payloads.update(part)
+            self._table = (version, payloads)
+            self.builds += 1
+            return True
+    
+    def refresh_in_background(self):
+        """Start a rebuild in a background thread unless one is running"""
+        if self._build_lock.locked():
+            return
+        threading.Thread(target=self._refresh_logged, name='insights-refresh', daemon=True).start()
+    
+    def _refresh_logged(self):
+        try:
+            self.refresh()
+        except Exception:
+            logger.exception("Building the insights table failed")
+    
+    def __len__(self):
+        return len(self._table[1])
\ No newline at end of file
@@ -0,0 +1,158 @@
+import sys
+import threading
+import numpy as np
+
+class ModelCache:
+    """
+    In-memory yield models with a byte budget and GreedyDual-Size eviction
+    
+    Every entry is weighed by its measured size and by its cost, the
+    seconds it took to train or load. Its priority is the cache's
+    inflation value plus cost per byte, refreshed on every hit; when the
+    cache is over budget the entry with the lowest priority is evicted
+    and its priority becomes the new inflation value. Entries that are
+    expensive to rebuild, small or recently used therefore stay longest,
+    and entries that are no longer used age out.
+    
+    Keys of evicted entries are remembered in ``evicted`` until they are
+    stored again or dropped, so callers can reload them from disk.
+    """
+    
+    def __init__(self, max_bytes=None):
+        """
+        Initialize an empty cache
+        
+        Args:
+            max_bytes (int, optional): Memory budget of the entries; no
+                limit when omitted
+        """
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.evictions = 0
+        self.evicted = set()
+        self._entries = {}
+        self._inflation = 0.0
+        self._lock = threading.Lock()
+    
+    def __contains__(self, key):
+        return key in self._entries
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def get(self, key, default=None):
+        """
+        Get an entry and refresh its priority
+        
+        Args:
+            key (str): Model key
+            default: Returned when the key is not cached
+        
+        Returns:
+            The cached entry, or default
+        """
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return default
+            item[3] = self._inflation + item[2] / item[1]
+            return item[0]
+    
+    def put(self, key, entry, cost):
+        """
+        Store an entry, evicting others if the budget is exceeded
+        
+        The new entry itself is never evicted by its own insertion, so a
+        model larger than the budget is still served once.
+        
+        Args:
+            key (str): Model key
+            entry: (model, scaler) tuple
+            cost (float): Seconds it took to train or load the entry
+        """
+        nbytes = max(deep_nbytes(entry), 1)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size -= old[1]
+            self._entries[key] = [entry, nbytes, cost, self._inflation + cost / nbytes]
+            self.size += nbytes
+            self.evicted.discard(key)
+            
+            while self.max_bytes is not None and self.size > self.max_bytes and len(self._entries) > 1:
+                victim = min((k for k in self._entries if k != key), key=lambda k: self._entries[k][3])
+                _, victim_bytes, _, priority = self._entries.pop(victim)
+                self.size -= victim_bytes
+                self._inflation = priority
+                self.evictions += 1
+                self.evicted.add(victim)
+    
+    def pop(self, key, default=None):
+        """
+        Drop an entry, also forgetting that it was evicted
+        
+        Args:
+            key (str): Model key
+            default: Returned when the key is not cached
+        
+        Returns:
+            The dropped entry, or default
+        """
+        with self._lock:
+            self.evicted.discard(key)
+            item = self._entries.pop(key, None)
+            if item is None:
+                return default
+            self.size -= item[1]
+            return item[0]
+    
+    def stats(self):
+        """
+        Get the size and eviction counters of the cache
+        
+        Returns:
+            dict: Entries, bytes, byte budget and evictions
+        """
+        return {'entries': len(self), 'bytes': self.size, 'max_bytes': self.max_bytes, 'evictions': self.evictions}
+
+def deep_nbytes(obj, seen=None):
+    """
+    Measure the memory held by an object and everything it references
+    
+    Arrays are counted once per underlying buffer, so views of a shared
+    buffer are not counted twice. Objects are walked through their pickle
+    state, which also covers sklearn trees.
+    
+    Args:
+        obj: Object to measure
+    
+    Returns:
+        int: Size in bytes
+    """
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    
+    if isinstance(obj, np.ndarray):
+        base = obj
+        while isinstance(base.base, np.ndarray):
+            base = base.base
+        if base is not obj:
+            if id(base) in seen:
+                return 0
+            seen.add(id(base))
+        return base.nbytes + sys.getsizeof(obj, 0)
+    if isinstance(obj, (str, bytes, int, float, bool, np.generic, type(None))):
+        return sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(deep_nbytes(k, seen) + deep_nbytes(v, seen) for k, v in obj.items())
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return sys.getsizeof(obj) + sum(deep_nbytes(item, seen) for item in obj)
+    
+    try:
+        state = obj.__getstate__()
+    except (AttributeError, TypeError):
+        state = getattr(obj, '__dict__', None)
+    return sys.getsizeof(obj) + (deep_nbytes(state, seen) if state is not None else 0)
\ No newline at end of file
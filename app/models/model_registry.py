@@ -0,0 +1,195 @@
+import os
+import re
+import glob
+import hashlib
+import tempfile
+import numpy as np
+import pandas as pd
+
+# Row hashes are summed modulo 2**64
+HASH_MASK = (1 << 64) - 1
+
+class ModelRegistry:
+    """
+    On-disk store of trained yield models
+    
+    Every artifact is keyed by region, crop and a fingerprint of the rows
+    the model was trained on, so an artifact becomes stale as soon as the
+    dataset rows behind it change and is simply never loaded again.
+    Artifacts are written uncompressed so their arrays can be
+    memory-mapped when they are loaded.
+    """
+    
+    def __init__(self, root):
+        """
+        Initialize the registry
+        
+        Args:
+            root (str): Directory holding the model artifacts
+        """
+        self.root = root
+    
+    @staticmethod
+    def _slug(value):
+        return re.sub(r'[^a-z0-9]+', '-', str(value).lower()).strip('-')
+    
+    def path(self, region, crop, fingerprint):
+        """
+        Get the artifact path for a model
+        
+        Args:
+            region (str): Agro-climatic zone
+            crop (str): Crop name
+            fingerprint (str): Fingerprint of the training rows
+        
+        Returns:
+            str: Path of the artifact
+        """
+        return os.path.join(self.root, self._slug(region), f"{self._slug(crop)}-{fingerprint}.joblib")
+    
+    def load(self, region, crop, fingerprint, mmap_mode='r'):
+        """
+        Load a model if a fresh artifact exists
+        
+        Args:
+            region (str): Agro-climatic zone
+            crop (str): Crop name
+            fingerprint (str): Fingerprint of the current training rows
+            mmap_mode (str, optional): Memory-map mode passed to joblib
+        
+        Returns:
+            tuple: (model, scaler), or None when no fresh artifact exists
+        """
+        import joblib
+        
+        path = self.path(region, crop, fingerprint)
+        if not os.path.exists(path):
+            return None
+        
+        try:
+            return joblib.load(path, mmap_mode=mmap_mode)
+        except Exception:
+            # A truncated or incompatible artifact is treated as missing
+            return None
+    
+    def save(self, region, crop, fingerprint, model, scaler):
+        """
+        Save a model and remove stale artifacts for the same region and crop
+        
+        Args:
+            region (str): Agro-climatic zone
+            crop (str): Crop name
+            fingerprint (str): Fingerprint of the training rows
+            model: Trained estimator
+            scaler: Fitted scaler
+        """
+        import joblib
+        
+        path = self.path(region, crop, fingerprint)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        
+        # Write to a temporary file first so readers never see a partial artifact
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        os.close(fd)
+        try:
+            joblib.dump((model, scaler), tmp_path)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        
+        for stale_path in self.artifacts(region, crop):
+            if stale_path != path:
+                os.remove(stale_path)
+    
+    def artifacts(self, region, crop):
+        """
+        List all artifacts stored for a region and crop
+        
+        Args:
+            region (str): Agro-climatic zone
+            crop (str): Crop name
+        
+        Returns:
+            list: Artifact paths
+        """
+        pattern = os.path.join(self.root, self._slug(region), f"{self._slug(crop)}-*.joblib")
+        return sorted(glob.glob(pattern))
+    
+    def prune(self, fresh_paths):
+        """
+        Remove every artifact that is not in a set of fresh paths
+        
+        Args:
+            fresh_paths (set): Paths of the artifacts to keep
+        
+        Returns:
+            int: Number of removed artifacts
+        """
+        removed = 0
+        for path in glob.glob(os.path.join(self.root, '*', '*.joblib')):
+            if path not in fresh_paths:
+                os.remove(path)
+                removed += 1
+        return removed
+
+def hash_rows(df, columns):
+    """
+    Hash every row together with its dataset row number
+    
+    The row number is the index of the frame. Models train on their rows
+    in row number order, so hashing it makes the fingerprint change when
+    that order changes, while the fingerprint itself can be summed up in
+    any order.
+    
+    Args:
+        df (pandas.DataFrame): Rows, indexed by dataset row number
+        columns (list): Columns the models train on
+    
+    Returns:
+        numpy.ndarray: uint64 hash of every row
+    """
+    return pd.util.hash_pandas_object(df[columns], index=True).to_numpy()
+
+def summarize_hashes(row_hashes):
+    """
+    Get the count, sum and xor of row hashes
+    
+    Summaries of disjoint sets of rows merge by adding the counts and
+    sums and xoring the xors.
+    
+    Args:
+        row_hashes (numpy.ndarray): uint64 row hashes from hash_rows
+    
+    Returns:
+        tuple: (count, sum modulo 2**64, xor)
+    """
+    xor = int(np.bitwise_xor.reduce(row_hashes)) if len(row_hashes) else 0
+    return len(row_hashes), int(row_hashes.sum(dtype=np.uint64)) & HASH_MASK, xor
+
+def fingerprint_summary(summary):
+    """
+    Get a content fingerprint from a summary of row hashes
+    
+    Args:
+        summary (tuple): Result of summarize_hashes, possibly merged
+    
+    Returns:
+        str: Hex fingerprint
+    """
+    return hashlib.sha1(np.array(summary, dtype=np.uint64).tobytes()).hexdigest()[:16]
+
+def fingerprint_rows(row_hashes):
+    """
+    Get a content fingerprint from per-row hashes
+    
+    Every backend fingerprints the same rows the same way, whatever order
+    it keeps them in.
+    
+    Args:
+        row_hashes (numpy.ndarray): uint64 row hashes from hash_rows
+    
+    Returns:
+        str: Hex fingerprint
+    """
+    return fingerprint_summary(summarize_hashes(row_hashes))
\ No newline at end of file
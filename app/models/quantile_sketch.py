@@ -0,0 +1,281 @@
+import numpy as np
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch of a numeric column, in the style of a t-digest
+    
+    Values are kept as weighted centroids sorted by mean. While a sketch
+    holds at most ``buffer_size`` centroids every value is its own centroid
+    and quantiles are exact. Beyond that, neighbouring centroids are merged
+    under the arcsine scale function, which keeps centroids small in the
+    tails and bounds their number by roughly ``compression / 2``. The
+    minimum and maximum are tracked exactly. Sketches are never modified in
+    place: update and merge return new sketches, so readers can keep using
+    the old one while an append is in progress.
+    """
+    
+    def __init__(self, compression=200, means=None, weights=None, minimum=np.inf, maximum=-np.inf):
+        """
+        Initialize the sketch
+        
+        Args:
+            compression (int): Accuracy parameter; larger keeps more centroids
+            means (numpy.ndarray, optional): Sorted centroid means
+            weights (numpy.ndarray, optional): Number of values per centroid
+            minimum (float): Smallest value seen
+            maximum (float): Largest value seen
+        """
+        self.compression = compression
+        self.buffer_size = 5 * compression
+        self.means = np.zeros(0) if means is None else means
+        self.weights = np.zeros(0) if weights is None else weights
+        self.minimum = minimum
+        self.maximum = maximum
+        self.count = int(self.weights.sum())
+    
+    @classmethod
+    def from_values(cls, values, compression=200):
+        """
+        Build a sketch from raw values
+        
+        Args:
+            values (numpy.ndarray): Values to summarize
+            compression (int): Accuracy parameter
+        
+        Returns:
+            QuantileSketch: Sketch of the values
+        """
+        return cls(compression).update(values)
+    
+    def __len__(self):
+        return self.count
+    
+    def update(self, values):
+        """
+        Add raw values
+        
+        Args:
+            values (numpy.ndarray): Values to add; NaNs are ignored
+        
+        Returns:
+            QuantileSketch: Sketch of the old and the new values
+        """
+        values = np.asarray(values, dtype=np.float64)
+        values = np.sort(values[~np.isnan(values)])
+        if len(values) == 0:
+            return self
+        return self._combine(values, np.ones(len(values)), values[0], values[-1])
+    
+    def merge(self, other):
+        """
+        Combine two sketches
+        
+        Args:
+            other (QuantileSketch): Sketch of additional values
+        
+        Returns:
+            QuantileSketch: Sketch of the values of both inputs
+        """
+        if other.count == 0:
+            return self
+        return self._combine(other.means, other.weights, other.minimum, other.maximum)
+    
+    def _combine(self, means, weights, minimum, maximum):
+        means = np.concatenate([self.means, means])
+        weights = np.concatenate([self.weights, weights])
+        order = np.argsort(means, kind='stable')
+        means, weights = means[order], weights[order]
+        if len(means) > self.buffer_size:
+            means, weights = _compress(means, weights, self.compression)
+        return QuantileSketch(
+            self.compression, means, weights,
+            min(self.minimum, minimum), max(self.maximum, maximum)
+        )
+    
+    def quantile(self, q):
+        """
+        Estimate quantiles
+        
+        Ranks are interpolated linearly like ``pandas.Series.quantile``:
+        the q-quantile sits at rank ``q * (count - 1)`` of the sorted values,
+        and each centroid stands for the rank in the middle of its values.
+        
+        Args:
+            q (array-like): Quantiles between 0 and 1
+        
+        Returns:
+            numpy.ndarray: Estimated values; NaN for an empty sketch
+        """
+        q = np.asarray(q, dtype=np.float64)
+        if self.count == 0:
+            return np.full(q.shape, np.nan)
+        
+        centers = np.cumsum(self.weights) - (self.weights + 1) / 2
+        ranks, values = [centers], [self.means]
+        if centers[0] > 0:
+            ranks.insert(0, [0.0])
+            values.insert(0, [self.minimum])
+        if centers[-1] < self.count - 1:
+            ranks.append([self.count - 1.0])
+            values.append([self.maximum])
+        return np.interp(q * (self.count - 1), np.concatenate(ranks), np.concatenate(values))
+
+def _compress(means, weights, compression):
+    """
+    Merge sorted centroids that fall into the same unit of the scale function
+    
+    Args:
+        means (numpy.ndarray): Sorted centroid means
+        weights (numpy.ndarray): Centroid weights
+        compression (int): Accuracy parameter
+    
+    Returns:
+        tuple: (means, weights) of the merged centroids
+    """
+    cumulative = np.cumsum(weights)
+    q = (cumulative - weights / 2) / cumulative[-1]
+    k = compression / (2 * np.pi) * np.arcsin(2 * q - 1)
+    cluster = np.floor(k - k[0])
+    starts = np.flatnonzero(np.concatenate([[True], cluster[1:] != cluster[:-1]]))
+    merged_weights = np.add.reduceat(weights, starts)
+    merged_means = np.add.reduceat(means * weights, starts) / merged_weights
+    return merged_means, merged_weights
+
+def weighted_quantile(values, counts, q):
+    """
+    Get exact quantiles of sorted values that occur several times each
+    
+    Matches ``pandas.Series.quantile`` on the values repeated by their counts.
+    
+    Args:
+        values (numpy.ndarray): Sorted distinct values
+        counts (numpy.ndarray): Occurrences of every value
+        q (array-like): Quantiles between 0 and 1
+    
+    Returns:
+        numpy.ndarray: Quantile values; NaN when there are no values
+    """
+    q = np.asarray(q, dtype=np.float64)
+    cumulative = np.cumsum(counts)
+    if len(cumulative) == 0 or cumulative[-1] == 0:
+        return np.full(q.shape, np.nan)
+    
+    rank = q * (cumulative[-1] - 1)
+    lower = np.asarray(values, dtype=np.float64)[np.searchsorted(cumulative, np.floor(rank), side='right')]
+    upper = np.asarray(values, dtype=np.float64)[np.searchsorted(cumulative, np.ceil(rank), side='right')]
+    return lower + (upper - lower) * (rank - np.floor(rank))
+
+class SketchTable:
+    """
+    Quantile sketches of numeric columns for every region, crop and
+    region-crop group
+    
+    Groups are keyed like the factor impact table, with None standing for
+    all regions or all crops, so any filter on region and crop maps to a
+    single prebuilt sketch.
+    """
+    
+    def __init__(self, columns, sketches, compression=200):
+        """
+        Initialize the table from prebuilt sketches
+        
+        Args:
+            columns (list): Sketched columns
+            sketches (dict): Column -> {(region, crop): QuantileSketch}
+            compression (int): Accuracy parameter of new sketches
+        """
+        self.columns = list(columns)
+        self.sketches = sketches
+        self.compression = compression
+    
+    @classmethod
+    def from_frame(cls, df, index, columns, compression=200):
+        """
+        Build the sketches of a dataset sorted by the group index
+        
+        Every region-crop sketch is built from its slice of the frame; the
+        region, crop and whole-dataset sketches are merged from those.
+        
+        Args:
+            df (pandas.DataFrame): Dataset
+            index (GroupIndex): Index over the dataset
+            columns (list): Numeric columns to sketch
+            compression (int): Accuracy parameter
+        
+        Returns:
+            SketchTable: Sketches of the dataset
+        """
+        regions = index.unique_values('Agro-Climatic Zone')
+        crops = index.unique_values('Crop')
+        sketches = {}
+        for column in columns:
+            values = df[column].to_numpy()
+            groups = {(None, None): QuantileSketch(compression)}
+            for region in regions:
+                groups[(region, None)] = QuantileSketch(compression)
+                for crop in crops:
+                    positions = index.select({'Agro-Climatic Zone': region, 'Crop': crop})
+                    if not isinstance(positions, slice) and len(positions) == 0:
+                        continue
+                    sketch = QuantileSketch.from_values(values[positions], compression)
+                    groups[(region, crop)] = sketch
+                    groups[(region, None)] = groups[(region, None)].merge(sketch)
+                    groups[(None, crop)] = groups.get((None, crop), QuantileSketch(compression)).merge(sketch)
+                groups[(None, None)] = groups[(None, None)].merge(groups[(region, None)])
+            sketches[column] = groups
+        return cls(columns, sketches, compression)
+    
+    def append(self, rows):
+        """
+        Add appended rows to the sketches of their groups
+        
+        Args:
+            rows (pandas.DataFrame): Appended rows
+        
+        Returns:
+            SketchTable: Table over the extended dataset; this table is left
+            unchanged so concurrent readers keep a consistent view
+        """
+        sketches = {column: dict(groups) for column, groups in self.sketches.items()}
+        parts = [((None, None), rows)]
+        parts += [((region, None), part) for region, part in rows.groupby('Agro-Climatic Zone')]
+        parts += [((None, crop), part) for crop, part in rows.groupby('Crop')]
+        parts += [(key, part) for key, part in rows.groupby(['Agro-Climatic Zone', 'Crop'])]
+        
+        for key, part in parts:
+            for column in self.columns:
+                sketch = sketches[column].get(key, QuantileSketch(self.compression))
+                sketches[column][key] = sketch.update(part[column].to_numpy())
+        return SketchTable(self.columns, sketches, self.compression)
+    
+    def merge(self, other):
+        """
+        Combine the sketches of two tables over disjoint rows
+        
+        Args:
+            other (SketchTable): Table over other rows with the same columns
+        
+        Returns:
+            SketchTable: Table over the rows of both; the inputs are unchanged
+        """
+        sketches = {}
+        for column in self.columns:
+            groups = dict(self.sketches[column])
+            for key, sketch in other.sketches[column].items():
+                groups[key] = groups[key].merge(sketch) if key in groups else sketch
+            sketches[column] = groups
+        return SketchTable(self.columns, sketches, self.compression)
+    
+    def get(self, column, region=None, crop=None):
+        """
+        Get the sketch of a column for a region and crop filter
+        
+        Args:
+            column (str): Sketched column
+            region (str, optional): Agro-climatic zone, all when omitted
+            crop (str, optional): Crop name, all when omitted
+        
+        Returns:
+            QuantileSketch: Sketch of the matching rows, or None if no row matches
+        """
+        return self.sketches[column].get((region or None, crop or None))
\ No newline at end of file
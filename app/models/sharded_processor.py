@@ -0,0 +1,307 @@
+import threading
+import multiprocessing
+import numpy as np
+import pandas as pd
+from app.models.data_processor import DataProcessor, bin_ids_of
+from app.models.columnar_store import ColumnarStore
+from app.models.group_index import GroupIndex
+from app.models.model_registry import fingerprint_rows
+from app.utils.metrics import instrument_methods
+
+class ShardProcessor(DataProcessor):
+    """
+    DataProcessor over the rows of some agro-climatic zones, held by a shard worker
+    """
+    
+    def __init__(self, df):
+        """
+        Initialize the shard from its rows
+        
+        Args:
+            df (pandas.DataFrame): Rows of the shard's zones
+        """
+        self.data_path = None
+        self.columnar_store = None
+        self.version = None
+        self.models = {}
+        self._set_schema()
+        self._build_structures(df)
+    
+    def bin_counts(self, factor, edges, region=None, crop=None):
+        """
+        Count rows and sum yields per quantile bin
+        
+        Args:
+            factor (str): Binned column
+            edges (numpy.ndarray): Sorted distinct bin edges
+            region (str, optional): Region filter
+            crop (str, optional): Crop filter
+        
+        Returns:
+            tuple: (row count, yield sum) arrays with one entry per bin
+        """
+        positions = self.index.select({'Agro-Climatic Zone': region, 'Crop': crop})
+        bin_ids = bin_ids_of(edges, self.df[factor].to_numpy()[positions])
+        yields = self.df[self.target_column].to_numpy()[positions]
+        return (
+            np.bincount(bin_ids, minlength=len(edges) - 1),
+            np.bincount(bin_ids, weights=yields, minlength=len(edges) - 1)
+        )
+
+def _serve_shard(connection, columnar_dir, regions):
+    """
+    Load a shard and answer method calls until told to stop
+    
+    Args:
+        connection (multiprocessing.connection.Connection): Pipe to the parent
+        columnar_dir (str): Directory of the columnar store
+        regions (list): Zones of the shard
+    """
+    try:
+        store = ColumnarStore(columnar_dir)
+        shard = ShardProcessor(store.read_rows(store.find_rows('Agro-Climatic Zone', regions)))
+    except Exception as e:
+        connection.send(('error', e))
+        return
+    connection.send(('ok', (shard.cube, shard.geo_cube, shard.sketches, shard.df.iloc[:0])))
+    
+    while True:
+        message = connection.recv()
+        if message is None:
+            break
+        method, args, kwargs = message
+        try:
+            result = ('ok', getattr(shard, method)(*args, **kwargs))
+        except Exception as e:
+            result = ('error', e)
+        connection.send(result)
+
+def assign_regions(counts, n_shards):
+    """
+    Spread zones over shards so that row counts are balanced
+    
+    Zones are taken largest first and each goes to the lightest shard.
+    
+    Args:
+        counts (dict): Zone -> number of rows
+        n_shards (int): Number of shards
+    
+    Returns:
+        list: Zones of every non-empty shard
+    """
+    shards = [[] for _ in range(n_shards)]
+    loads = [0] * n_shards
+    for region, count in sorted(counts.items(), key=lambda item: (-item[1], item[0])):
+        if count == 0:
+            continue
+        lightest = loads.index(min(loads))
+        shards[lightest].append(region)
+        loads[lightest] += count
+    return [regions for regions in shards if regions]
+
+@instrument_methods('data_processor')
+class ShardedDataProcessor(DataProcessor):
+    """
+    DataProcessor backend that partitions the dataset over worker processes
+    
+    Rows are split by agro-climatic zone into shards, balanced by row
+    count, and every shard is loaded by its own process from the columnar
+    store. A zone and each of its region-crop groups therefore live in a
+    single shard. The shards build their aggregate cubes and sketches in
+    parallel, and the parent merges those partial counts, sums and
+    cross-products into the cube every aggregate query reads. Queries that
+    need rows are mapped over the shards and their partial results
+    reduced; a zone filter limits the map to the shard of that zone.
+    """
+    
+    supports_append = False
+    supports_rows = False
+    
+    def __init__(self, data_path, columnar_dir, shards=None):
+        """
+        Initialize the processor and start the shard workers
+        
+        Args:
+            data_path (str): Path to the CSV dataset
+            columnar_dir (str): Directory of the columnar copy of the
+                dataset, written first if it is stale
+            shards (int, optional): Number of worker processes, one per CPU by default
+        """
+        self.data_path = data_path
+        self.columnar_store = ColumnarStore(columnar_dir)
+        self.version = self._source_version()
+        self.models = {}
+        self._set_schema()
+        
+        if not self.columnar_store.is_fresh(data_path):
+            df, _ = self._load_data()
+            df, _ = GroupIndex.sort_frame(df, self.index_columns)
+            self.columnar_store.write(df, self._source_stamp)
+            del df
+        
+        counts = self.columnar_store.level_counts('Agro-Climatic Zone')
+        self.shard_regions = assign_regions(counts, shards or multiprocessing.cpu_count())
+        self._start_workers(columnar_dir)
+    
+    def _start_workers(self, columnar_dir):
+        """
+        Start one process per shard and merge their aggregates
+        
+        Args:
+            columnar_dir (str): Directory of the columnar store
+        """
+        # Spawned workers do not inherit the threads of a running server
+        context = multiprocessing.get_context('spawn')
+        self._connections = []
+        self._processes = []
+        self._locks = []
+        self._region_shard = {}
+        for shard, regions in enumerate(self.shard_regions):
+            parent_end, child_end = context.Pipe()
+            process = context.Process(target=_serve_shard, args=(child_end, columnar_dir, regions), daemon=True)
+            process.start()
+            child_end.close()
+            self._connections.append(parent_end)
+            self._processes.append(process)
+            self._locks.append(threading.Lock())
+            self._region_shard.update({region: shard for region in regions})
+        
+        cube = geo_cube = sketches = None
+        self._empty = None
+        for connection in self._connections:
+            shard_cube, shard_geo_cube, shard_sketches, empty = self._receive(connection)
+            cube = shard_cube if cube is None else cube.merge(shard_cube)
+            geo_cube = shard_geo_cube if geo_cube is None else geo_cube.merge(shard_geo_cube)
+            sketches = shard_sketches if sketches is None else sketches.merge(shard_sketches)
+            self._empty = empty
+        self.cube = cube
+        self.geo_cube = geo_cube
+        self.sketches = sketches
+        self._build_factor_impacts()
+        self._build_geo_rollups()
+        self._append_lock = threading.Lock()
+    
+    @staticmethod
+    def _receive(connection):
+        status, value = connection.recv()
+        if status == 'error':
+            raise value
+        return value
+    
+    def _map(self, method, *args, region=None, **kwargs):
+        """
+        Call a ShardProcessor method on the shards and collect the results
+        
+        All shards work at the same time: every call is sent before any
+        result is read.
+        
+        Args:
+            method (str): Method name
+            *args: Positional arguments of the call
+            region (str, optional): Only call the shard holding this zone
+            **kwargs: Keyword arguments of the call
+        
+        Returns:
+            list: Result of every called shard
+        """
+        if region:
+            shards = [self._region_shard[region]] if region in self._region_shard else []
+        else:
+            shards = list(range(len(self._connections)))
+        
+        # Locks are taken in shard order, so concurrent maps cannot deadlock
+        for shard in shards:
+            self._locks[shard].acquire()
+        try:
+            for shard in shards:
+                self._connections[shard].send((method, args, kwargs))
+            return [self._receive(self._connections[shard]) for shard in shards]
+        finally:
+            for shard in shards:
+                self._locks[shard].release()
+    
+    def close(self):
+        """Stop the shard workers"""
+        for connection, lock in zip(self._connections, self._locks):
+            with lock:
+                connection.send(None)
+        for process in self._processes:
+            process.join()
+    
+    def get_unique_values(self, column):
+        """
+        Get unique values from a column
+        
+        Args:
+            column (str): Column name
+        
+        Returns:
+            list: List of unique values
+        """
+        if column in self.cube.dimensions:
+            return self.cube.levels[column].tolist()
+        
+        values = set()
+        for shard_values in self._map('get_unique_values', column):
+            values.update(shard_values)
+        return sorted(values)
+    
+    def get_training_fingerprint(self, region, crop):
+        """
+        Get a content fingerprint of the rows a region/crop model trains on
+        
+        Args:
+            region (str): Agro-climatic zone
+            crop (str): Crop name
+        
+        Returns:
+            str: Hex fingerprint that changes whenever those rows change
+        """
+        fingerprints = self._map('get_training_fingerprint', region, crop, region=region)
+        return fingerprints[0] if fingerprints else fingerprint_rows(np.zeros(0, dtype=np.uint64))
+    
+    def filter_data(self, filters=None):
+        """
+        Filter the dataset based on provided filters
+        
+        Args:
+            filters (dict): Dictionary of column-value pairs for filtering
+        
+        Returns:
+            pandas.DataFrame: Filtered dataframe, indexed by dataset row number
+        """
+        region = (filters or {}).get('Agro-Climatic Zone')
+        parts = self._map('filter_data', filters, region=region)
+        if not parts:
+            return self._empty
+        return pd.concat(parts)
+    
+    def _yield_by_sketch(self, factor, region, crop, bins):
+        """
+        Get yield by quantile bins of a sketched column
+        
+        Bin edges come from the merged sketch; every shard counts its own
+        rows into the bins and the counts are summed.
+        
+        Args:
+            factor (str): Sketched column
+            region (str): Region filter, or None
+            crop (str): Crop filter, or None
+            bins (int): Number of quantile bins
+        
+        Returns:
+            pandas.DataFrame: Average yield and row count per bin
+        """
+        sketch = self.sketches.get(factor, region, crop)
+        if sketch is None:
+            return self._binned_yield(factor, np.zeros(0), np.zeros(0), np.zeros(0), np.zeros(0))
+        edges = np.unique(sketch.quantile(np.linspace(0, 1, bins + 1)))
+        if len(edges) < 2:
+            return self._binned_yield(factor, edges, np.zeros(0), np.zeros(0), np.zeros(0))
+        
+        parts = self._map('bin_counts', factor, edges, region, crop, region=region)
+        count = sum(part[0] for part in parts)
+        sums = sum(part[1] for part in parts)
+        
+        # The right edge of every bin stands for the rows counted in it
+        return self._binned_yield(factor, edges, edges[1:], count, sums)
\ No newline at end of file
@@ -0,0 +1,285 @@
+import threading
+import numpy as np
+import pandas as pd
+from app.models.data_processor import DataProcessor, bin_ids_of
+from app.models.columnar_store import ColumnarStore
+from app.models.aggregate_cube import AggregateCube
+from app.models.quantile_sketch import SketchTable
+from app.models.model_registry import HASH_MASK, hash_rows, summarize_hashes, fingerprint_summary
+from app.utils.metrics import instrument_methods, rows_scanned
+
+# Share of the memory limit for the chunk being read; the rest holds the aggregates
+CHUNK_SHARE = 0.5
+
+# Peak memory of folding a chunk, relative to the chunk frame itself: the
+# frame, its float64 value matrix, group codes, row hashes and temporaries
+WORKING_SET_FACTOR = 4
+
+# Rows read to estimate the memory of a row
+SAMPLE_ROWS = 1000
+
+@instrument_methods('data_processor')
+class StreamingDataProcessor(DataProcessor):
+    """
+    DataProcessor backend for datasets larger than memory
+    
+    The dataset is never held in memory as a whole. It is read in chunks
+    from the columnar store while fresh, or from the CSV, and folded at
+    load time into partial aggregates that merge across chunks: the
+    aggregate cube, the quantile sketches and one fingerprint per region
+    and crop. Every aggregate query of DataProcessor runs unchanged on
+    that cube. Queries that need rows stream the dataset again and keep
+    only the matching ones. Chunks are sized from ``memory_limit``, and a
+    MemoryError is raised instead of going above it.
+    """
+    
+    supports_append = False
+    supports_rows = False
+    
+    def __init__(self, data_path, columnar_dir=None, memory_limit=1024 * 1024 * 1024, chunk_rows=None):
+        """
+        Initialize the processor with one pass over the dataset
+        
+        Args:
+            data_path (str): Path to the CSV dataset
+            columnar_dir (str, optional): Directory of the columnar copy of
+                the dataset, which is read instead of the CSV while fresh
+            memory_limit (int): Memory ceiling in bytes for chunks, aggregates
+                and the rows returned by filter_data
+            chunk_rows (int, optional): Rows per chunk; derived from the
+                memory limit when omitted
+        """
+        self.data_path = data_path
+        self.columnar_store = ColumnarStore(columnar_dir) if columnar_dir else None
+        self.version = self._source_version()
+        self.models = {}
+        self._set_schema()
+        self.memory_limit = memory_limit
+        self.chunk_rows = chunk_rows or self._default_chunk_rows()
+        
+        self.cube, self.geo_cube, self.sketches, self._fingerprints = self._fold_chunks()
+        self._build_factor_impacts()
+        self._build_geo_rollups()
+        self._append_lock = threading.Lock()
+    
+    def iter_chunks(self, chunk_rows=None):
+        """
+        Read the dataset a chunk of rows at a time
+        
+        Args:
+            chunk_rows (int, optional): Rows per chunk, self.chunk_rows by default
+        
+        Yields:
+            pandas.DataFrame: Consecutive chunks, cleaned and indexed by
+            dataset row number like DataProcessor
+        """
+        chunk_rows = chunk_rows or self.chunk_rows
+        if self.columnar_store is not None and self.columnar_store.is_fresh(self.data_path):
+            yield from self.columnar_store.iter_chunks(chunk_rows)
+            return
+        
+        start = 0
+        with pd.read_csv(self.data_path, chunksize=chunk_rows) as reader:
+            for chunk in reader:
+                chunk = chunk.dropna()
+                chunk.index = pd.RangeIndex(start, start + len(chunk))
+                start += len(chunk)
+                yield chunk
+    
+    def _default_chunk_rows(self):
+        """
+        Get the number of rows per chunk that fits the memory limit
+        
+        Returns:
+            int: Rows per chunk
+        """
+        chunks = self.iter_chunks(SAMPLE_ROWS)
+        sample = next(chunks, None)
+        chunks.close()
+        if sample is None or len(sample) == 0:
+            return SAMPLE_ROWS
+        
+        row_bytes = sample.memory_usage(deep=True, index=False).sum() / len(sample)
+        return max(1, int(self.memory_limit * CHUNK_SHARE / (row_bytes * WORKING_SET_FACTOR)))
+    
+    def _fold_chunks(self):
+        """
+        Build the mergeable aggregates of the dataset in one pass
+        
+        Returns:
+            tuple: (AggregateCube, drill-down AggregateCube, SketchTable,
+            fingerprints) where the fingerprints map (region, crop) to the
+            row count and the sum and xor of the row hashes
+        """
+        dimensions = self.index_columns + ['Year']
+        geo_dimensions = self.geo_columns + ['Crop']
+        cube = geo_cube = None
+        sketches = SketchTable(self.cube_values, {column: {} for column in self.cube_values})
+        fingerprints = {}
+        
+        for chunk in self.iter_chunks():
+            if len(chunk) == 0:
+                continue
+            part = AggregateCube.from_frame(chunk, dimensions, self.cube_values)
+            cube = part if cube is None else cube.merge(part)
+            geo_part = AggregateCube.from_frame(chunk, geo_dimensions, self.geo_values)
+            geo_cube = geo_part if geo_cube is None else geo_cube.merge(geo_part)
+            sketches = sketches.append(chunk)
+            
+            # Sum and xor are independent of row order, so chunks combine in any order
+            hashes = hash_rows(chunk, self.cube_values)
+            for key, positions in chunk.groupby(['Agro-Climatic Zone', 'Crop'], sort=False).indices.items():
+                count, total, xor = fingerprints.get(key, (0, 0, 0))
+                group_count, group_total, group_xor = summarize_hashes(hashes[positions])
+                fingerprints[key] = (count + group_count, (total + group_total) & HASH_MASK, xor ^ group_xor)
+            
+            self._check_memory(_cube_bytes(cube) + _cube_bytes(geo_cube) + _sketch_bytes(sketches), 'Aggregates of the dataset')
+        
+        if cube is None:
+            labels = self.index_columns + geo_dimensions
+            empty = pd.DataFrame({column: pd.Series(dtype=object if column in labels else np.float64) for column in dict.fromkeys(dimensions + geo_dimensions + self.cube_values + self.geo_values)})
+            cube = AggregateCube.from_frame(empty, dimensions, self.cube_values)
+            geo_cube = AggregateCube.from_frame(empty, geo_dimensions, self.geo_values)
+        return cube, geo_cube, sketches, fingerprints
+    
+    def _check_memory(self, size, what):
+        """
+        Raise if a structure outgrows its share of the memory limit
+        
+        Args:
+            size (int): Size of the structure in bytes
+            what (str): Description of the structure for the error message
+        
+        Raises:
+            MemoryError: If the structure does not fit
+        """
+        budget = self.memory_limit * (1 - CHUNK_SHARE)
+        if size > budget:
+            raise MemoryError(f"{what} need {size} bytes, above {int(budget)} bytes of the {self.memory_limit} byte memory limit")
+    
+    def get_unique_values(self, column):
+        """
+        Get unique values from a column
+        
+        Args:
+            column (str): Column name
+        
+        Returns:
+            list: List of unique values
+        """
+        if column in self.cube.dimensions:
+            return self.cube.levels[column].tolist()
+        
+        values = set()
+        scanned = 0
+        for chunk in self.iter_chunks():
+            values.update(chunk[column].unique().tolist())
+            scanned += len(chunk)
+        rows_scanned.observe(scanned, method='get_unique_values')
+        return sorted(values)
+    
+    def get_training_fingerprint(self, region, crop):
+        """
+        Get a content fingerprint of the rows a region/crop model trains on
+        
+        The hashes are summed up while folding the chunks, so the
+        fingerprint equals the one of DataProcessor whether the CSV or the
+        columnar store is read.
+        
+        Args:
+            region (str): Agro-climatic zone
+            crop (str): Crop name
+        
+        Returns:
+            str: Hex fingerprint that changes whenever those rows change
+        """
+        return fingerprint_summary(self._fingerprints.get((region, crop), (0, 0, 0)))
+    
+    def filter_data(self, filters=None):
+        """
+        Filter the dataset based on provided filters
+        
+        Every call streams the whole dataset, so the result must fit in
+        the memory limit.
+        
+        Args:
+            filters (dict): Dictionary of column-value pairs for filtering
+        
+        Returns:
+            pandas.DataFrame: Filtered dataframe, in the order of the chunks
+            and indexed by dataset row number
+        
+        Raises:
+            MemoryError: If the matching rows do not fit in the memory limit
+        """
+        filters = {column: value for column, value in (filters or {}).items() if value}
+        parts = []
+        size = 0
+        scanned = 0
+        for chunk in self.iter_chunks():
+            scanned += len(chunk)
+            mask = np.ones(len(chunk), dtype=bool)
+            for column, value in filters.items():
+                if column in chunk.columns:
+                    mask &= (chunk[column] == value).to_numpy()
+            part = chunk[mask]
+            if len(part):
+                parts.append(part)
+                size += part.memory_usage(deep=True, index=False).sum()
+                self._check_memory(size, 'Filtered rows')
+        rows_scanned.observe(scanned, method='filter_data')
+        
+        if not parts:
+            return next(self.iter_chunks(SAMPLE_ROWS), pd.DataFrame()).iloc[:0]
+        return pd.concat(parts)
+    
+    def _yield_by_sketch(self, factor, region, crop, bins):
+        """
+        Get yield by quantile bins of a sketched column
+        
+        Bin edges come from the sketch; bin counts and yield sums are
+        accumulated over one pass of the dataset.
+        
+        Args:
+            factor (str): Sketched column
+            region (str): Region filter, or None
+            crop (str): Crop filter, or None
+            bins (int): Number of quantile bins
+        
+        Returns:
+            pandas.DataFrame: Average yield and row count per bin
+        """
+        sketch = self.sketches.get(factor, region, crop)
+        if sketch is None:
+            return self._binned_yield(factor, np.zeros(0), np.zeros(0), np.zeros(0), np.zeros(0))
+        edges = np.unique(sketch.quantile(np.linspace(0, 1, bins + 1)))
+        if len(edges) < 2:
+            return self._binned_yield(factor, edges, np.zeros(0), np.zeros(0), np.zeros(0))
+        
+        count = np.zeros(len(edges) - 1)
+        sums = np.zeros(len(edges) - 1)
+        scanned = 0
+        for chunk in self.iter_chunks():
+            scanned += len(chunk)
+            mask = np.ones(len(chunk), dtype=bool)
+            if region:
+                mask &= (chunk['Agro-Climatic Zone'] == region).to_numpy()
+            if crop:
+                mask &= (chunk['Crop'] == crop).to_numpy()
+            bin_ids = bin_ids_of(edges, chunk[factor].to_numpy()[mask])
+            count += np.bincount(bin_ids, minlength=len(count))
+            sums += np.bincount(bin_ids, weights=chunk[self.target_column].to_numpy()[mask], minlength=len(sums))
+        rows_scanned.observe(scanned, method='get_yield_by_factor')
+        
+        # The right edge of every bin stands for the rows counted in it
+        return self._binned_yield(factor, edges, edges[1:], count, sums)
+
+def _cube_bytes(cube):
+    return cube.codes.nbytes + cube.count.nbytes + cube.sums.nbytes + cube.cross.nbytes
+
+def _sketch_bytes(sketches):
+    return sum(
+        sketch.means.nbytes + sketch.weights.nbytes
+        for groups in sketches.sketches.values()
+        for sketch in groups.values()
+    )
\ No newline at end of file
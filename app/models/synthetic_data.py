@@ -0,0 +1,388 @@
+import numpy as np
+import pandas as pd
+from app.models.columnar_store import ColumnarStore
+
+# Categorical columns in drawing order, each with the columns it depends on
+CATEGORICAL_PARENTS = [
+    ('Agro-Climatic Zone', []),
+    ('Crop', ['Agro-Climatic Zone']),
+    ('Season', ['Crop']),
+    ('Soil Type', ['Agro-Climatic Zone']),
+    ('State', ['Agro-Climatic Zone']),
+    ('District', ['State'])
+]
+
+# Rows are generated sorted by these columns, like DataProcessor.index_columns
+ORDER_COLUMNS = ['Agro-Climatic Zone', 'Crop', 'Season', 'Soil Type']
+
+# Numeric columns drawn from one Gaussian copula per region and crop
+COPULA_COLUMNS = ['Year', 'Area (ha)', 'Rainfall (mm)', 'Irrigation (%)', 'Fertilizer Use (kg/ha)', 'crop_yield']
+GROUP_COLUMNS = ['Agro-Climatic Zone', 'Crop']
+
+class SyntheticDataGenerator:
+    """
+    Vectorized generator of datasets with the schema of the real one
+    
+    Categorical columns follow the empirical conditional distributions of
+    CATEGORICAL_PARENTS. Numeric columns follow a Gaussian copula fitted
+    per region and crop: a correlation matrix of normal scores plus an
+    empirical quantile grid for every marginal. Production is derived from
+    area and yield, and yield is rounded from production, as in the real
+    data. Rows come out in chunks sorted by ORDER_COLUMNS, so the columnar
+    copy loads without a re-sort and memory does not grow with the size of
+    the dataset.
+    """
+    
+    def __init__(self, columns, dtypes, decimals, levels, tables, copulas):
+        """
+        Initialize the generator from fitted parameters
+        
+        Args:
+            columns (list): Column names in output order
+            dtypes (dict): Numpy dtype of every numeric column
+            decimals (dict): Decimals written for every numeric column
+            levels (dict): Sorted labels of every categorical column
+            tables (dict): Conditional probability table of every categorical
+                column, with one axis per parent and a last axis over its levels
+            copulas (dict): (region code, crop code) -> (quantile grid of shape
+                (grid, COPULA_COLUMNS), Cholesky factor of the score correlations)
+        """
+        self.columns = list(columns)
+        self.dtypes = dtypes
+        self.decimals = decimals
+        self.levels = levels
+        self.tables = tables
+        self.copulas = copulas
+    
+    @classmethod
+    def fit(cls, df, grid_size=1025):
+        """
+        Fit the generator to a dataset
+        
+        Args:
+            df (pandas.DataFrame): Dataset with the real schema
+            grid_size (int): Points of every marginal quantile grid
+        
+        Returns:
+            SyntheticDataGenerator: Fitted generator
+        """
+        from scipy.special import ndtri
+        
+        df = df.dropna()
+        levels = {}
+        codes = {}
+        for column, _ in CATEGORICAL_PARENTS:
+            levels[column] = np.asarray(np.sort(df[column].unique()), dtype=object)
+            codes[column] = pd.Categorical(df[column], categories=levels[column]).codes.astype(np.int64)
+        
+        tables = {}
+        for column, parents in CATEGORICAL_PARENTS:
+            shape = tuple(len(levels[parent]) for parent in parents) + (len(levels[column]),)
+            counts = np.zeros(shape)
+            np.add.at(counts, tuple(codes[parent] for parent in parents) + (codes[column],), 1)
+            totals = counts.sum(axis=-1, keepdims=True)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                tables[column] = np.where(totals > 0, counts / totals, 1.0 / shape[-1])
+        
+        dtypes = {}
+        decimals = {}
+        for column in df.columns:
+            if column not in levels:
+                dtypes[column] = df[column].to_numpy().dtype
+                decimals[column] = _decimals(df[column].to_numpy())
+        
+        copulas = {}
+        grid = np.linspace(0, 1, grid_size)
+        for (region, crop), group in df.groupby(GROUP_COLUMNS):
+            values = group[COPULA_COLUMNS].to_numpy(dtype=np.float64)
+            quantiles = np.quantile(values, grid, axis=0)
+            scores = ndtri(group[COPULA_COLUMNS].rank().to_numpy() / (len(group) + 1))
+            key = (levels['Agro-Climatic Zone'].tolist().index(region), levels['Crop'].tolist().index(crop))
+            copulas[key] = (quantiles, _correlation_factor(scores))
+        
+        return cls(df.columns, dtypes, decimals, levels, tables, copulas)
+    
+    def _order_probabilities(self):
+        """
+        Get the joint probability of every combination of the order columns
+        
+        Returns:
+            numpy.ndarray: Probabilities with one axis per order column
+        """
+        ndim = len(ORDER_COLUMNS)
+        joint = np.ones(tuple(len(self.levels[column]) for column in ORDER_COLUMNS))
+        for column, parents in CATEGORICAL_PARENTS:
+            if column not in ORDER_COLUMNS:
+                continue
+            axes = [ORDER_COLUMNS.index(parent) for parent in parents] + [ORDER_COLUMNS.index(column)]
+            table = np.transpose(self.tables[column], np.argsort(axes))
+            shape = [1] * ndim
+            for axis, size in zip(sorted(axes), table.shape):
+                shape[axis] = size
+            joint = joint * table.reshape(shape)
+        return joint / joint.sum()
+    
+    def generate(self, rows, seed=0, chunk_rows=1000000):
+        """
+        Generate a dataset chunk by chunk
+        
+        The same seed and chunk size always produce the same rows.
+        
+        Args:
+            rows (int): Total number of rows
+            seed (int): Seed of the random generator
+            chunk_rows (int): Rows per chunk
+        
+        Yields:
+            pandas.DataFrame: Next chunk, with categorical dtypes for the
+            text columns
+        """
+        rng = np.random.default_rng(seed)
+        joint = self._order_probabilities()
+        counts = rng.multinomial(rows, joint.ravel())
+        bounds = np.zeros(len(counts) + 1, dtype=np.int64)
+        np.cumsum(counts, out=bounds[1:])
+        
+        for start in range(0, rows, chunk_rows):
+            end = min(start + chunk_rows, rows)
+            cells = np.searchsorted(bounds, np.arange(start, end), side='right') - 1
+            codes = dict(zip(ORDER_COLUMNS, np.unravel_index(cells, joint.shape)))
+            for column, parents in CATEGORICAL_PARENTS:
+                if column not in codes:
+                    codes[column] = self._draw_categorical(rng, column, parents, codes)
+            
+            numeric = self._draw_numeric(rng, codes)
+            data = {}
+            for column in self.columns:
+                if column in self.levels:
+                    data[column] = pd.Categorical.from_codes(codes[column], categories=self.levels[column])
+                else:
+                    data[column] = numeric[column]
+            yield pd.DataFrame(data, columns=self.columns)
+    
+    def _draw_categorical(self, rng, column, parents, codes):
+        """
+        Draw a categorical column conditionally on its parents
+        
+        The cumulative distributions of all parent combinations are laid
+        end to end, each shifted by its position, so a single searchsorted
+        inverts the distribution of every row.
+        
+        Returns:
+            numpy.ndarray: Level codes
+        """
+        table = self.tables[column]
+        n_levels = table.shape[-1]
+        n = len(next(iter(codes.values())))
+        if parents:
+            parent_index = np.ravel_multi_index([codes[parent] for parent in parents], table.shape[:-1])
+        else:
+            parent_index = np.zeros(n, dtype=np.int64)
+        
+        cdf = np.cumsum(table.reshape(-1, n_levels), axis=1)
+        cdf[:, -1] = 1.0
+        shifted = (cdf + np.arange(len(cdf))[:, None]).ravel()
+        position = np.searchsorted(shifted, parent_index + rng.random(n), side='right')
+        return position - parent_index * n_levels
+    
+    def _draw_numeric(self, rng, codes):
+        """
+        Draw the numeric columns of every row from the copula of its group
+        
+        Rows are sorted by region and crop, so every group is one run.
+        
+        Returns:
+            dict: Column name -> values
+        """
+        from scipy.special import ndtr
+        
+        group = codes['Agro-Climatic Zone'] * len(self.levels['Crop']) + codes['Crop']
+        starts = np.flatnonzero(np.concatenate([[True], group[1:] != group[:-1]]))
+        stops = np.append(starts[1:], len(group))
+        
+        values = np.empty((len(group), len(COPULA_COLUMNS)))
+        for start, stop in zip(starts, stops):
+            key = (int(codes['Agro-Climatic Zone'][start]), int(codes['Crop'][start]))
+            quantiles, factor = self.copulas[key]
+            uniform = ndtr(rng.standard_normal((stop - start, len(COPULA_COLUMNS))) @ factor.T)
+            
+            # The grid is evenly spaced, so the interval of a value is found arithmetically
+            position = uniform * (len(quantiles) - 1)
+            lower = np.minimum(position.astype(np.int64), len(quantiles) - 2)
+            columns = np.arange(len(COPULA_COLUMNS))
+            low, high = quantiles[lower, columns], quantiles[lower + 1, columns]
+            values[start:stop] = low + (position - lower) * (high - low)
+        
+        numeric = {}
+        for j, column in enumerate(COPULA_COLUMNS):
+            numeric[column] = values[:, j]
+        
+        # Production follows from area and yield, and the stored yield from both
+        area = np.maximum(np.rint(numeric['Area (ha)']), 1)
+        production = np.rint(area * numeric['crop_yield'])
+        numeric['Area (ha)'] = area
+        numeric['Production (tonnes)'] = production
+        numeric['crop_yield'] = production / area
+        
+        for column, dtype in self.dtypes.items():
+            rounded = np.round(numeric[column], self.decimals[column])
+            numeric[column] = rounded.astype(dtype)
+        return numeric
+    
+    def header(self):
+        """
+        Get the CSV header line
+        
+        Returns:
+            bytes: Column names followed by a newline
+        """
+        return (','.join(_quote(column) for column in self.columns) + '\n').encode()
+    
+    def encode_csv(self, chunk):
+        """
+        Encode a generated chunk as CSV rows
+        
+        Fields are written straight into one byte buffer with a few array
+        operations per column, instead of formatting every value in Python.
+        Numbers are written with the decimals of the fitted dataset.
+        
+        Args:
+            chunk (pandas.DataFrame): Chunk from generate
+        
+        Returns:
+            bytes: CSV rows without a header
+        """
+        fields = []
+        for i, column in enumerate(self.columns):
+            values = chunk[column]
+            separator = ord(',') if i < len(self.columns) - 1 else ord('\n')
+            if column in self.levels:
+                fields.append(_text_field(values.cat.codes.to_numpy(), self.levels[column], separator))
+            else:
+                fields.append(_number_field(values.to_numpy(), self.decimals[column], separator))
+        
+        # Fixed-width rows padded with zero bytes, which are dropped at the end
+        matrix = np.zeros((len(chunk), sum(width for width, _ in fields)), dtype=np.uint8)
+        position = 0
+        for width, fill in fields:
+            fill(matrix[:, position:position + width])
+            position += width
+        flat = matrix.ravel()
+        return flat.compress(flat != 0).tobytes()
+    
+def write_dataset(generator, rows, csv_path=None, columnar_dir=None, seed=0, chunk_rows=1000000):
+    """
+    Write a generated dataset to CSV and/or a columnar store in one pass
+    
+    When both are written, the columnar store is stamped with the CSV so
+    DataProcessor reads it instead of parsing the CSV.
+    
+    Args:
+        generator (SyntheticDataGenerator): Fitted generator
+        rows (int): Total number of rows
+        csv_path (str, optional): Path of the CSV file
+        columnar_dir (str, optional): Directory of the columnar store
+        seed (int): Seed of the random generator
+        chunk_rows (int): Rows per chunk
+    """
+    writer = ColumnarStore(columnar_dir).writer(rows, generator.levels) if columnar_dir else None
+    csv_file = open(csv_path, 'wb') if csv_path else None
+    try:
+        if csv_file:
+            csv_file.write(generator.header())
+        for chunk in generator.generate(rows, seed=seed, chunk_rows=chunk_rows):
+            if csv_file:
+                csv_file.write(generator.encode_csv(chunk))
+            if writer:
+                writer.append(chunk)
+        
+        if csv_file:
+            csv_file.close()
+        if writer:
+            writer.commit(ColumnarStore.source_stamp(csv_path) if csv_path else None)
+    finally:
+        if csv_file:
+            csv_file.close()
+        if writer:
+            writer.abort()
+
+def _decimals(values, max_decimals=6):
+    """Smallest number of decimals that represents every value"""
+    if values.dtype.kind in 'iu':
+        return 0
+    for decimals in range(max_decimals + 1):
+        scaled = values * 10 ** decimals
+        if np.allclose(scaled, np.rint(scaled), rtol=0, atol=1e-6):
+            return decimals
+    return max_decimals
+
+def _correlation_factor(scores):
+    """Cholesky factor of the correlation of normal scores, repaired to be positive definite"""
+    k = scores.shape[1]
+    if len(scores) < 3:
+        return np.eye(k)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        corr = np.corrcoef(scores, rowvar=False)
+    corr = np.nan_to_num(corr)
+    np.fill_diagonal(corr, 1.0)
+    
+    eigenvalues, eigenvectors = np.linalg.eigh(corr)
+    corr = eigenvectors @ np.diag(np.clip(eigenvalues, 1e-6, None)) @ eigenvectors.T
+    scale = np.sqrt(np.diag(corr))
+    return np.linalg.cholesky(corr / np.outer(scale, scale))
+
+def _quote(value):
+    value = str(value)
+    if any(char in value for char in ',"\n\r'):
+        return '"' + value.replace('"', '""') + '"'
+    return value
+
+def _text_field(codes, levels, separator):
+    """Width and filler of a dictionary-encoded text field and its separator"""
+    tokens = [_quote(level).encode() for level in levels]
+    width = max([len(token) for token in tokens] + [0]) + 1
+    table = np.zeros((len(tokens), width), dtype=np.uint8)
+    for i, token in enumerate(tokens):
+        table[i, :len(token)] = np.frombuffer(token, dtype=np.uint8)
+    table[:, -1] = separator
+    
+    def fill(out):
+        out[:] = table[codes]
+    
+    return width, fill
+
+def _number_field(values, decimals, separator):
+    """Width and filler of a number written with fixed decimals and its separator"""
+    scaled = np.rint(values * 10 ** decimals).astype(np.int64) if decimals else values.astype(np.int64)
+    negative = scaled < 0
+    magnitude = np.abs(scaled)
+    if len(magnitude) and magnitude.max() < 2 ** 32:
+        # Division is much cheaper on 32-bit integers
+        magnitude = magnitude.astype(np.uint32)
+    integer = magnitude // 10 ** decimals
+    fraction = magnitude % 10 ** decimals
+    digits = len(str(int(integer.max()))) if len(integer) else 1
+    width = 1 + digits + (decimals + 1 if decimals else 0) + 1
+    
+    def fill(out):
+        # Build the field column-major, so every byte position is one contiguous write
+        block = np.zeros((width, len(values)), dtype=np.uint8)
+        block[0] = np.where(negative, ord('-'), 0)
+        
+        # Integer digits from the last one backwards; leading zeros stay padding
+        remaining = integer.copy()
+        for k in range(digits):
+            digit = ord('0') + remaining % 10
+            block[digits - k] = digit if k == 0 else np.where(remaining > 0, digit, 0)
+            remaining //= 10
+        
+        if decimals:
+            block[1 + digits] = ord('.')
+            remaining = fraction.copy()
+            for k in range(decimals):
+                block[1 + digits + decimals - k] = ord('0') + remaining % 10
+                remaining //= 10
+        block[-1] = separator
+        out[:] = block.T
+    
+    return width, fill
\ No newline at end of file
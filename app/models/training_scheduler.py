@@ -0,0 +1,142 @@
+import heapq
+import logging
+import threading
+import itertools
+
+logger = logging.getLogger(__name__)
+
+class TrainingScheduler:
+    """
+    Background queue of model training jobs, most requested first
+    
+    Every request for a missing model counts towards the priority of its
+    region and crop, so the models clients are waiting for are trained
+    before the rest of the warm-up. A pair is queued or trained at most
+    once at a time; requests for it while it waits only raise its
+    priority. A pair requested while it trains, e.g. because its rows
+    changed, is queued again once the job is done, unless it is ready by
+    then.
+    """
+    
+    def __init__(self, train, is_ready, workers=1):
+        """
+        Initialize the scheduler and start its worker threads
+        
+        Args:
+            train (callable): Loads or trains the model of (region, crop)
+            is_ready (callable): Tells whether (region, crop) has a model
+            workers (int): Number of training threads
+        """
+        self.train = train
+        self.is_ready = is_ready
+        self.requests = {}
+        self.failed = 0
+        self._groups = []
+        self._heap = []
+        self._queued = set()
+        self._running = set()
+        self._dirty = set()
+        self._order = itertools.count()
+        self._condition = threading.Condition()
+        self._stopped = False
+        self._threads = [
+            threading.Thread(target=self._work, name=f'training-{i}', daemon=True)
+            for i in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+    
+    def request(self, region, crop, weight=1):
+        """
+        Record a request for a missing model and queue its training
+        
+        Args:
+            region (str): Agro-climatic zone
+            crop (str): Crop name
+            weight (int): Added to the request count; 0 queues the model
+                without raising its priority
+        """
+        self._enqueue((region, crop), weight)
+    
+    def warm_up(self, groups):
+        """
+        Queue every model that is not ready yet, behind requested ones
+        
+        Args:
+            groups (list): (region, crop) pairs that should have a model
+        """
+        self._groups = list(groups)
+        for key in self._groups:
+            self._enqueue(key, 0)
+    
+    def _enqueue(self, key, weight):
+        with self._condition:
+            count = self.requests.get(key, 0) + weight
+            self.requests[key] = count
+            if key in self._running:
+                # The job may have read the rows before they changed
+                self._dirty.add(key)
+                return
+            if key not in self._queued and self.is_ready(*key):
+                return
+            # Older entries of the key stay in the heap and are skipped
+            heapq.heappush(self._heap, (-count, next(self._order), key))
+            self._queued.add(key)
+            self._condition.notify()
+    
+    def _next_job(self):
+        with self._condition:
+            while True:
+                while self._heap and not self._stopped:
+                    priority, _, key = heapq.heappop(self._heap)
+                    if key in self._queued and -priority == self.requests[key]:
+                        self._queued.discard(key)
+                        self._running.add(key)
+                        return key
+                if self._stopped:
+                    return None
+                self._condition.wait()
+    
+    def _work(self):
+        while True:
+            key = self._next_job()
+            if key is None:
+                return
+            try:
+                self.train(*key)
+            except Exception:
+                self.failed += 1
+                logger.exception("Training the model of %s / %s failed", *key)
+            finally:
+                with self._condition:
+                    self._running.discard(key)
+                    if key in self._dirty:
+                        self._dirty.discard(key)
+                        self._enqueue(key, 0)
+    
+    def progress(self):
+        """
+        Get the warm-up progress
+        
+        Returns:
+            dict: Ready and total warm-up models, queued and running jobs,
+            failed runs, and whether every warm-up model is ready
+        """
+        with self._condition:
+            queued = len(self._queued)
+            running = len(self._running)
+        ready = sum(1 for key in self._groups if self.is_ready(*key))
+        return {
+            'ready': ready,
+            'total': len(self._groups),
+            'queued': queued,
+            'running': running,
+            'failed': self.failed,
+            'complete': ready == len(self._groups)
+        }
+    
+    def stop(self):
+        """Stop the workers once their current job is done"""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
\ No newline at end of file
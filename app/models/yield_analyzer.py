@@ -1,25 +1,232 @@
 import pandas as pd
 import numpy as np
-from sklearn.linear_model import LinearRegression
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.preprocessing import StandardScaler
-import joblib
 import os
+import threading
+import time
+from app.models.model_registry import ModelRegistry, fingerprint_rows, hash_rows
+from app.models.compiled_forest import compile_model
+from app.models.model_cache import ModelCache
+from app.models.insights_table import InsightsTable
+from app.models.training_scheduler import TrainingScheduler
+from app.utils.metrics import instrument_methods, model_cache_requests, model_training_duration
 
+PREDICTION_FIELDS = ['region', 'crop', 'rainfall', 'irrigation', 'fertilizer']
+
+@instrument_methods('yield_analyzer')
 class YieldAnalyzer:
     """
     Class for analyzing crop yield and providing insights
     """
     
-    def __init__(self, data_processor):
+    def __init__(self, data_processor, model_dir=None, background_training=False, training_workers=1,
+                 model_cache_bytes=None):
         """
         Initialize the YieldAnalyzer with a DataProcessor
         
         Args:
             data_processor: DataProcessor instance
+            model_dir (str, optional): Directory of the persistent model registry;
+                models are only kept in memory when omitted
+            background_training (bool): Train missing models in background
+                threads and answer predictions provisionally meanwhile,
+                instead of training during the request
+            training_workers (int): Number of background training threads
+            model_cache_bytes (int, optional): Memory budget of the in-memory
+                models; least valuable models are evicted beyond it and
+                loaded back from the registry when needed again
         """
         self.data_processor = data_processor
-        self.models = {}
+        self.models = ModelCache(max_bytes=model_cache_bytes)
+        self._training_locks = {}
+        self._training_locks_guard = threading.Lock()
+        # Held while a model is cached against the dataset version it was
+        # built from, and while mark_stale drops models
+        self._version_lock = threading.Lock()
+        self.registry = ModelRegistry(model_dir) if model_dir else None
+        self.scheduler = None
+        if background_training:
+            self.scheduler = TrainingScheduler(
+                self._train_model_once,
+                self._model_ready,
+                workers=training_workers
+            )
+        self.insights = InsightsTable(
+            lambda: getattr(self.data_processor, 'version', None),
+            lambda: data_processor.get_all_view_statistics(with_version=True),
+            self._insight_payloads
+        )
+        
+    def _model_groups(self):
+        """
+        Get the region and crop pairs with enough data to train a model
+        
+        Returns:
+            list: List of (region, crop) tuples
+        """
+        counts = self.data_processor.get_group_counts(['Agro-Climatic Zone', 'Crop'])
+        counts = counts[counts['Sample Count'] >= 10]
+        return list(zip(counts['Agro-Climatic Zone'], counts['Crop']))
+    
+    def _model_ready(self, region, crop):
+        """
+        Tell whether a region and crop pair has a model to serve
+        
+        Models evicted from memory count as ready when the registry can
+        load them back.
+        
+        Args:
+            region (str): Agro-climatic zone
+            crop (str): Crop name
+            
+        Returns:
+            bool: True if the model is in memory or can be reloaded
+        """
+        model_key = f"{region}_{crop}"
+        return model_key in self.models or (self.registry is not None and model_key in self.models.evicted)
+    
+    def load_models(self):
+        """
+        Load the fresh models from the registry
+        
+        Returns:
+            int: Number of loaded models
+        """
+        loaded = 0
+        for region, crop in self._model_groups():
+            if f"{region}_{crop}" not in self.models and self._load_model(region, crop):
+                loaded += 1
+                
+        return loaded
+    
+    def _load_model(self, region, crop):
+        """
+        Memory-map a model from the registry if it is still fresh
+        
+        Args:
+            region (str): Agro-climatic zone
+            crop (str): Crop name
+            
+        Returns:
+            bool: True if the model was loaded
+        """
+        if not self.registry:
+            return False
+            
+        start = time.perf_counter()
+        version = self.data_processor.version
+        fingerprint = self.data_processor.get_training_fingerprint(region, crop)
+        artifact = self.registry.load(region, crop, fingerprint)
+        if artifact is None:
+            return False
+            
+        # Artifacts saved before forests were compiled hold sklearn forests
+        model, scaler = artifact
+        entry = (compile_model(model), scaler)
+        return self._put_model(f"{region}_{crop}", entry, time.perf_counter() - start, version)
+    
+    def _put_model(self, model_key, entry, cost, version):
+        """
+        Cache a model unless rows were appended since it was built
+        
+        Args:
+            model_key (str): Model key
+            entry (tuple): (model, scaler)
+            cost (float): Seconds it took to build the entry
+            version (str): Dataset version read before the rows of the
+                model were
+            
+        Returns:
+            bool: True if the model was cached
+        """
+        with self._version_lock:
+            if self.data_processor.version != version:
+                return False
+            self.models.put(model_key, entry, cost)
+            return True
+    
+    def warm_up(self):
+        """
+        Queue the loading or training of every model in the background
+        
+        Returns:
+            int: Number of region and crop pairs that should have a model
+        """
+        groups = self._model_groups()
+        if self.scheduler:
+            self.scheduler.warm_up(groups)
+        return len(groups)
+    
+    def warm_up_progress(self):
+        """
+        Get the progress of the background warm-up
+        
+        Returns:
+            dict: See TrainingScheduler.progress, or None without background training
+        """
+        return self.scheduler.progress() if self.scheduler else None
+    
+    def mark_stale(self, pairs):
+        """
+        Drop the models of region and crop pairs whose rows changed
+        
+        Models in memory are dropped, and models evicted from memory are
+        forgotten, so they no longer count as ready to load back. Their
+        registry artifacts no longer match the training fingerprint, so the
+        next prediction trains a fresh model. With background training the
+        fresh models are queued right away.
+        
+        Args:
+            pairs (list): (region, crop) pairs
+            
+        Returns:
+            int: Number of dropped models, evicted ones included
+        """
+        dropped = 0
+        for region, crop in pairs:
+            model_key = f"{region}_{crop}"
+            with self._version_lock:
+                evicted = model_key in self.models.evicted
+                stale = self.models.pop(model_key, None) is not None or evicted
+            if stale:
+                dropped += 1
+                if self.scheduler:
+                    self.scheduler.request(region, crop, weight=0)
+        return dropped
+    
+    def train_all_models(self, force=False):
+        """
+        Train and store a model for every region and crop pair
+        
+        Args:
+            force (bool): Retrain models that are already fresh
+            
+        Returns:
+            dict: Number of trained, reused and removed stale models
+        """
+        summary = {'trained': 0, 'reused': 0, 'removed': 0}
+        fresh_paths = set()
+        
+        for region, crop in self._model_groups():
+            model_key = f"{region}_{crop}"
+            stored = False
+            if self.registry:
+                fingerprint = self.data_processor.get_training_fingerprint(region, crop)
+                path = self.registry.path(region, crop, fingerprint)
+                fresh_paths.add(path)
+                stored = os.path.exists(path)
+                
+            if (model_key in self.models or stored) and not force:
+                summary['reused'] += 1
+                continue
+                
+            self._train_model(region, crop)
+            summary['trained'] += 1
+            
+        # Artifacts of rows that no longer exist are never loaded again
+        if self.registry:
+            summary['removed'] = self.registry.prune(fresh_paths)
+            
+        return summary
         
     def get_regional_insights(self, region, crop=None):
         """
@@ -29,6 +236,42 @@ class YieldAnalyzer:
             region (str): Agro-climatic zone
             crop (str, optional): Specific crop to analyze
             
+        Returns:
+            dict: Dictionary containing regional insights
+        """
+        insights = self.insights.get('region', region, crop or None)
+        if insights is not None:
+            return insights
+            
+        stats = self.data_processor.get_view_statistics(region=region, crop=crop)
+        return self._regional_insights(region, crop, stats)
+    
+    def get_region_dashboard(self, region, crop=None):
+        """
+        Get everything the region view shows from a single selection
+        
+        Args:
+            region (str): Agro-climatic zone
+            crop (str, optional): Specific crop to analyze
+            
+        Returns:
+            dict: Regional insights plus the yield by season and soil type
+        """
+        stats = self.data_processor.get_view_statistics(region=region, crop=crop)
+        dashboard = self._regional_insights(region, crop, stats)
+        dashboard['yield_by_season'] = stats['yield_by_season'].to_dict(orient='records')
+        dashboard['yield_by_soil'] = stats['yield_by_soil'].to_dict(orient='records')
+        return dashboard
+    
+    def _regional_insights(self, region, crop, stats):
+        """
+        Build regional insights from the statistics of the selected view
+        
+        Args:
+            region (str): Agro-climatic zone
+            crop (str, optional): Specific crop to analyze
+            stats (dict): Result of DataProcessor.get_view_statistics
+            
         Returns:
             dict: Dictionary containing regional insights
         """
@@ -40,12 +283,11 @@ class YieldAnalyzer:
             'recommendations': []
         }
         
-        # Get yield trend
-        trend_data = self.data_processor.get_yield_trend(region=region, crop=crop)
+        # Analyze yield trend
+        trend_data = stats['yield_trend']
         if not trend_data.empty:
             insights['yield_trend'] = trend_data.to_dict(orient='records')
             
-            # Analyze trend
             if len(trend_data) > 2:
                 first_year = trend_data.iloc[0]['Year']
                 last_year = trend_data.iloc[-1]['Year']
@@ -59,8 +301,8 @@ class YieldAnalyzer:
                     insights['trend_analysis'] = f"Yield has decreased by {(first_yield - last_yield):.2f} units from {first_year} to {last_year}."
                     insights['recommendations'].append("Review agricultural practices as yields are declining over time.")
         
-        # Get factor impact
-        factor_impact = self.data_processor.get_factor_impact(region=region, crop=crop)
+        # Factor impact
+        factor_impact = stats['factor_impact']
         if factor_impact:
             insights['factor_impact'] = factor_impact
             
@@ -77,20 +319,12 @@ class YieldAnalyzer:
                 insights['recommendations'].append("Optimize fertilizer application as it has the highest impact on yield.")
                 insights['recommendations'].append("Consider soil testing to determine precise nutrient requirements.")
         
-        # Get soil type analysis
-        filters = {'Agro-Climatic Zone': region}
-        if crop:
-            filters['Crop'] = crop
-            
-        filtered_df = self.data_processor.filter_data(filters)
-        
-        if not filtered_df.empty:
-            soil_analysis = filtered_df.groupby('Soil Type')[self.data_processor.target_column].mean().sort_values(ascending=False)
-            
-            if not soil_analysis.empty:
-                best_soil = soil_analysis.index[0]
-                insights['soil_analysis'] = f"The best soil type for {'this crop' if crop else 'crops'} in this region is {best_soil}."
-                insights['recommendations'].append(f"Prioritize cultivation in {best_soil} soil areas for optimal yields.")
+        # Soil type analysis
+        soil_analysis = stats['yield_by_soil']
+        if not soil_analysis.empty:
+            best_soil = soil_analysis.iloc[0]['Soil Type']
+            insights['soil_analysis'] = f"The best soil type for {'this crop' if crop else 'crops'} in this region is {best_soil}."
+            insights['recommendations'].append(f"Prioritize cultivation in {best_soil} soil areas for optimal yields.")
         
         return insights
     
@@ -102,6 +336,47 @@ class YieldAnalyzer:
             crop (str): Crop name
             region (str, optional): Specific region to analyze
             
+        Returns:
+            dict: Dictionary containing crop insights
+        """
+        insights = self.insights.get('crop', crop, region or None)
+        if insights is not None:
+            return insights
+            
+        stats = self.data_processor.get_view_statistics(region=region, crop=crop)
+        return self._crop_insights(crop, region, stats)
+    
+    def get_crop_dashboard(self, crop, region=None):
+        """
+        Get everything the crop view shows from a single selection
+        
+        Args:
+            crop (str): Crop name
+            region (str, optional): Specific region to analyze
+            
+        Returns:
+            dict: Crop insights plus the yield of the crop in every region and
+            the yield by season and soil type
+        """
+        stats = self.data_processor.get_view_statistics(region=region, crop=crop)
+        dashboard = self._crop_insights(crop, region, stats)
+        
+        # The region chart always compares all regions for the crop
+        if region:
+            dashboard['yield_by_region'] = self.data_processor.get_yield_by_region(crop=crop).to_dict(orient='records')
+        dashboard['yield_by_season'] = stats['yield_by_season'].to_dict(orient='records')
+        dashboard['yield_by_soil'] = stats['yield_by_soil'].to_dict(orient='records')
+        return dashboard
+    
+    def _crop_insights(self, crop, region, stats):
+        """
+        Build crop insights from the statistics of the selected view
+        
+        Args:
+            crop (str): Crop name
+            region (str, optional): Specific region to analyze
+            stats (dict): Result of DataProcessor.get_view_statistics
+            
         Returns:
             dict: Dictionary containing crop insights
         """
@@ -113,9 +388,9 @@ class YieldAnalyzer:
             'recommendations': []
         }
         
-        # Get yield by region
+        # Compare regions
         if not region:
-            region_data = self.data_processor.get_yield_by_region(crop=crop)
+            region_data = stats['yield_by_region']
             if not region_data.empty:
                 insights['yield_by_region'] = region_data.to_dict(orient='records')
                 
@@ -125,8 +400,8 @@ class YieldAnalyzer:
                 insights['region_analysis'] = f"Best region for {crop} is {best_region}, worst region is {worst_region}."
                 insights['recommendations'].append(f"Prioritize {crop} cultivation in {best_region} region.")
         
-        # Get factor impact
-        factor_impact = self.data_processor.get_factor_impact(region=region, crop=crop)
+        # Factor impact
+        factor_impact = stats['factor_impact']
         if factor_impact:
             insights['factor_impact'] = factor_impact
             
@@ -142,24 +417,16 @@ class YieldAnalyzer:
             elif sorted_factors[0][0] == 'Fertilizer Use (kg/ha)':
                 insights['recommendations'].append(f"Optimize fertilizer application for {crop} based on soil testing.")
         
-        # Get seasonal analysis
-        filters = {'Crop': crop}
-        if region:
-            filters['Agro-Climatic Zone'] = region
-            
-        filtered_df = self.data_processor.filter_data(filters)
-        
-        if not filtered_df.empty:
-            season_analysis = filtered_df.groupby('Season')[self.data_processor.target_column].mean().sort_values(ascending=False)
-            
-            if not season_analysis.empty:
-                best_season = season_analysis.index[0]
-                insights['season_analysis'] = f"The best season for {crop} cultivation is {best_season}."
-                insights['recommendations'].append(f"Prioritize {crop} cultivation in {best_season} season.")
+        # Seasonal analysis
+        season_analysis = stats['yield_by_season']
+        if not season_analysis.empty:
+            best_season = season_analysis.iloc[0]['Season']
+            insights['season_analysis'] = f"The best season for {crop} cultivation is {best_season}."
+            insights['recommendations'].append(f"Prioritize {crop} cultivation in {best_season} season.")
         
         return insights
     
-    def predict_yield(self, region, crop, rainfall, irrigation, fertilizer):
+    def predict_yield(self, region, crop, rainfall, irrigation, fertilizer, with_status=False):
         """
         Predict yield based on input parameters
         
@@ -169,52 +436,215 @@ class YieldAnalyzer:
             rainfall (float): Rainfall in mm
             irrigation (float): Irrigation percentage
             fertilizer (float): Fertilizer use in kg/ha
+            with_status (bool): Also tell whether the prediction is provisional
             
         Returns:
-            float: Predicted yield
+            float: Predicted yield, or (predicted yield, provisional) with
+            with_status
         """
-        # Create model key
-        model_key = f"{region}_{crop}"
-        
-        # Check if model exists, if not train it
-        if model_key not in self.models:
-            self._train_model(region, crop)
+        # Get the model, training it on first use
+        entry, provisional = self._get_model(region, crop)
         
         # If model training failed, return None
-        if model_key not in self.models:
-            return None
+        if entry is None:
+            return (None, False) if with_status else None
         
         # Prepare input features
         features = np.array([[rainfall, irrigation, fertilizer]])
         
         # Predict yield
-        model, scaler = self.models[model_key]
+        model, scaler = entry
         if scaler:
             features = scaler.transform(features)
             
-        predicted_yield = model.predict(features)[0]
+        predicted_yield = max(0, model.predict(features)[0])
+        
+        return (predicted_yield, provisional) if with_status else predicted_yield
+    
+    def predict_yield_batch(self, inputs, with_status=False):
+        """
+        Predict yield for many input rows at once
+        
+        Rows are grouped by region and crop so every model predicts once on
+        a stacked feature matrix.
+        
+        Args:
+            inputs (pandas.DataFrame): Columns 'region', 'crop', 'rainfall',
+                'irrigation' and 'fertilizer', one row per prediction
+            with_status (bool): Also tell which predictions are provisional
+            
+        Returns:
+            numpy.ndarray: Predicted yield per input row, in input order; NaN
+            for rows whose region and crop lack the data for a model. With
+            with_status, a tuple of the predictions and a boolean array
+            marking the provisional ones
+        """
+        predictions = np.full(len(inputs), np.nan)
+        provisional = np.zeros(len(inputs), dtype=bool)
+        if len(inputs) == 0:
+            return (predictions, provisional) if with_status else predictions
+            
+        features = inputs[['rainfall', 'irrigation', 'fertilizer']].to_numpy(dtype=np.float64)
+        groups = inputs.groupby(['region', 'crop'], sort=False).indices
         
-        return max(0, predicted_yield)
+        for (region, crop), positions in groups.items():
+            entry, provisional[positions] = self._get_model(region, crop)
+            if entry is None:
+                continue
+                
+            model, scaler = entry
+            group_features = features[positions]
+            if scaler:
+                group_features = scaler.transform(group_features)
+                
+            predictions[positions] = np.maximum(model.predict(group_features), 0)
+            
+        return (predictions, provisional) if with_status else predictions
+    
+    def predict_yield_records(self, records):
+        """
+        Validate raw input rows and predict yield for the valid ones
+        
+        Args:
+            records (list): Parsed request rows, each a dict with 'region',
+                'crop', 'rainfall', 'irrigation' and 'fertilizer'
+            
+        Returns:
+            list: One result per row, in input order: a dict with the
+            predicted yield, its unit and whether it is provisional, or a
+            dict with the error of the row
+        """
+        frame, positions, errors = _prediction_frame(records)
+        predictions, provisional = self.predict_yield_batch(frame, with_status=True)
+        
+        results = [None] * len(records)
+        for position, message in errors.items():
+            results[position] = {"error": message}
+        for position, predicted_yield, is_provisional in zip(positions, predictions.tolist(), provisional.tolist()):
+            if np.isnan(predicted_yield):
+                results[position] = {"error": "Insufficient data to make prediction"}
+            else:
+                results[position] = {"predicted_yield": predicted_yield, "unit": "tonnes/ha", "provisional": is_provisional}
+        return results
+    
+    def _get_model(self, region, crop):
+        """
+        Get the model for a region and crop, loading or training it on first use
+        
+        With background training a missing model is queued for training,
+        and the linear fit of the factor impact table stands in for it
+        until it is ready. Models evicted from the memory budget are
+        loaded back from the registry during the request.
+        
+        Args:
+            region (str): Agro-climatic zone
+            crop (str): Crop name
+            
+        Returns:
+            tuple: ((model, scaler) or None if there is not enough data,
+            whether the model is provisional)
+        """
+        model_key = f"{region}_{crop}"
+        
+        entry = self.models.get(model_key)
+        if entry is not None:
+            model_cache_requests.inc(result='hit')
+            return entry, False
+        model_cache_requests.inc(result='miss')
+        
+        if self.scheduler is None or (self.registry and model_key in self.models.evicted):
+            # Train it now, blocking the request; evicted models are only
+            # loaded back from the registry
+            self._train_model_once(region, crop)
+            return self.models.get(model_key), False
+            
+        # Pairs without a linear fit have too few rows for any model
+        fit = self.data_processor.get_linear_fit(region, crop)
+        if fit is None:
+            return None, False
+        self.scheduler.request(region, crop)
+        return (LinearModel(*fit), None), True
+    
+    def _train_model_once(self, region, crop):
+        """
+        Load or train a model unless another thread already did
+        
+        A fresh artifact in the registry is preferred over training.
+        Concurrent requests for the same missing model wait for a single
+        load or training run instead of each fitting their own copy.
+        
+        Args:
+            region (str): Agro-climatic zone
+            crop (str): Crop name
+        """
+        model_key = f"{region}_{crop}"
+        with self._training_locks_guard:
+            lock = self._training_locks.setdefault(model_key, threading.Lock())
+            
+        with lock:
+            if model_key not in self.models and not self._load_model(region, crop):
+                self._train_model(region, crop)
     
     def _train_model(self, region, crop):
         """
         Train a yield prediction model for a specific region and crop
         
+        A model fitted while rows were appended is discarded before it is
+        cached or saved, and the model is trained again on the new rows.
+        
         Args:
             region (str): Agro-climatic zone
             crop (str): Crop name
         """
-        # Filter data
+        model_key = f"{region}_{crop}"
         filters = {
             'Agro-Climatic Zone': region,
             'Crop': crop
         }
         
-        filtered_df = self.data_processor.filter_data(filters)
+        while True:
+            start = time.perf_counter()
+            
+            # The version is read before the rows, so an append that
+            # overlaps the fit always changes it
+            version = self.data_processor.version
+            filtered_df = self.data_processor.filter_data(filters)
+            
+            # Train on the rows in dataset order, whatever order the backend
+            # keeps them in, so every backend fits the same model
+            if not filtered_df.index.is_monotonic_increasing:
+                filtered_df = filtered_df.sort_index()
+            
+            # Check if we have enough data
+            if len(filtered_df) < 10:
+                return
+            
+            # The registry key describes the rows the model is fitted on, not
+            # the dataset at the time it is saved
+            fingerprint = fingerprint_rows(hash_rows(filtered_df, self.data_processor.cube_values))
+            model, scaler = self._fit_model(filtered_df)
+            
+            # Save model, weighed by what it cost to build
+            if self._put_model(model_key, (model, scaler), time.perf_counter() - start, version):
+                break
+                
+        if self.registry:
+            self.registry.save(region, crop, fingerprint, model, scaler)
+    
+    def _fit_model(self, filtered_df):
+        """
+        Fit a yield model on the rows of a region and crop
         
-        # Check if we have enough data
-        if len(filtered_df) < 10:
-            return
+        Args:
+            filtered_df (pandas.DataFrame): Training rows, at least 10
+            
+        Returns:
+            tuple: (compiled model, fitted scaler)
+        """
+        # scikit-learn is only imported once a model is actually trained
+        from sklearn.linear_model import LinearRegression
+        from sklearn.ensemble import RandomForestRegressor
+        from sklearn.preprocessing import StandardScaler
         
         # Prepare features and target
         X = filtered_df[self.data_processor.feature_columns].values
@@ -230,11 +660,10 @@ class YieldAnalyzer:
         else:
             model = LinearRegression()
             
+        fit_start = time.perf_counter()
         model.fit(X_scaled, y)
-        
-        # Save model
-        model_key = f"{region}_{crop}"
-        self.models[model_key] = (model, scaler)
+        model_training_duration.observe(time.perf_counter() - fit_start, model=type(model).__name__)
+        return compile_model(model), scaler
         
     def get_improvement_strategies(self, region, crop):
         """
@@ -247,10 +676,24 @@ class YieldAnalyzer:
         Returns:
             list: List of improvement strategies
         """
-        strategies = []
-        
-        # Get factor impact
+        strategies = self.insights.get('strategies', region, crop)
+        if strategies is not None:
+            return strategies
+            
         factor_impact = self.data_processor.get_factor_impact(region=region, crop=crop)
+        return self._improvement_strategies(factor_impact)
+    
+    def _improvement_strategies(self, factor_impact):
+        """
+        Build improvement strategies from the factor impact of a region and crop
+        
+        Args:
+            factor_impact (dict): Result of DataProcessor.get_factor_impact
+            
+        Returns:
+            list: List of improvement strategies
+        """
+        strategies = []
         
         if not factor_impact:
             return ["Insufficient data to generate improvement strategies."]
@@ -306,4 +749,78 @@ class YieldAnalyzer:
             ]
         })
         
-        return strategies 
\ No newline at end of file
+        return strategies
+    
+    def _insight_payloads(self, views):
+        """
+        Build the insight payloads of a partition of the insights table
+        
+        Args:
+            views (list): ((region, crop), statistics) items from
+                DataProcessor.get_all_view_statistics
+            
+        Returns:
+            dict: Regional insights keyed by ('region', region, crop), crop
+            insights by ('crop', crop, region) and improvement strategies by
+            ('strategies', region, crop)
+        """
+        payloads = {}
+        for (region, crop), stats in views:
+            if region is not None:
+                payloads[('region', region, crop)] = self._regional_insights(region, crop, stats)
+            if crop is not None:
+                payloads[('crop', crop, region)] = self._crop_insights(crop, region, stats)
+            if region is not None and crop is not None:
+                payloads[('strategies', region, crop)] = self._improvement_strategies(stats['factor_impact'])
+        return payloads
+
+class LinearModel:
+    """
+    Linear model with known coefficients, used as a provisional model
+    """
+    
+    def __init__(self, intercept, coef):
+        self.intercept = intercept
+        self.coef = np.asarray(coef)
+    
+    def predict(self, X):
+        return self.intercept + np.asarray(X, dtype=np.float64) @ self.coef
+
+def _prediction_frame(records):
+    """
+    Validate batch prediction rows and stack the valid ones into a frame
+    
+    Args:
+        records (list): Parsed request rows
+        
+    Returns:
+        tuple: (DataFrame of valid rows, their positions in records,
+        dict of position -> error message for invalid rows)
+    """
+    errors = {}
+    positions = []
+    for position, record in enumerate(records):
+        if isinstance(record, dict):
+            positions.append(position)
+        else:
+            errors[position] = "Row is not a valid JSON object"
+            
+    frame = pd.DataFrame.from_records([records[position] for position in positions], columns=PREDICTION_FIELDS)
+    valid = pd.Series(True, index=frame.index)
+    for field in ['region', 'crop']:
+        valid &= frame[field].map(lambda value: isinstance(value, str) and bool(value))
+    for field in ['rainfall', 'irrigation', 'fertilizer']:
+        frame[field] = pd.to_numeric(frame[field], errors='coerce')
+        valid &= frame[field].notna()
+        
+    for row in np.flatnonzero(~valid.to_numpy()):
+        record = records[positions[row]]
+        invalid_fields = [
+            field for field in PREDICTION_FIELDS
+            if field not in record or (field in ['region', 'crop'] and not isinstance(frame.at[row, field], str))
+            or (field not in ['region', 'crop'] and pd.isna(frame.at[row, field]))
+        ]
+        errors[positions[row]] = f"Invalid or missing fields: {', '.join(invalid_fields)}"
+        
+    keep = valid.to_numpy()
+    return frame[keep].reset_index(drop=True), [p for p, k in zip(positions, keep) if k], errors
\ No newline at end of file
@@ -150,14 +150,35 @@ function analyzeRegion() {
     document.getElementById('region-factor-impact').innerHTML = '<div class="d-flex justify-content-center align-items-center h-100"><div class="loading-spinner"></div></div>';
     document.getElementById('region-insights').innerHTML = '<div class="d-flex justify-content-center align-items-center h-100"><div class="loading-spinner"></div></div>';
     
-    // Fetch yield trend
-    fetchYieldTrend(region, crop, 'region-yield-trend');
+    // Fetch the whole view in one request
+    fetchRegionDashboard(region, crop);
+}
+
+// Fetch the region dashboard and render all of its panels
+function fetchRegionDashboard(region, crop) {
+    let url = `/api/dashboard/region?region=${encodeURIComponent(region)}`;
     
-    // Fetch factor impact
-    fetchFactorImpact(region, crop, 'region-factor-impact');
+    if (crop) {
+        url += `&crop=${encodeURIComponent(crop)}`;
+    }
     
-    // Fetch regional insights
-    fetchRegionalInsights(region, crop);
+    fetch(url)
+        .then(response => response.json())
+        .then(data => {
+            renderYieldTrend(data.yield_trend, region, crop, 'region-yield-trend');
+            renderFactorImpact(data.factor_impact, 'region-factor-impact');
+            renderRegionalInsights(data);
+        })
+        .catch(error => {
+            console.error('Error fetching region dashboard:', error);
+            ['region-yield-trend', 'region-factor-impact', 'region-insights'].forEach(elementId => {
+                document.getElementById(elementId).innerHTML = `
+                    <div class="alert alert-danger" role="alert">
+                        An error occurred while fetching the region analysis. Please try again.
+                    </div>
+                `;
+            });
+        });
 }
 
 // Analyze crop
@@ -175,14 +196,35 @@ function analyzeCrop() {
     document.getElementById('crop-factor-impact').innerHTML = '<div class="d-flex justify-content-center align-items-center h-100"><div class="loading-spinner"></div></div>';
     document.getElementById('crop-insights').innerHTML = '<div class="d-flex justify-content-center align-items-center h-100"><div class="loading-spinner"></div></div>';
     
-    // Fetch yield by region
-    fetchYieldByRegion(crop, 'crop-yield-by-region');
+    // Fetch the whole view in one request
+    fetchCropDashboard(crop, region);
+}
+
+// Fetch the crop dashboard and render all of its panels
+function fetchCropDashboard(crop, region) {
+    let url = `/api/dashboard/crop?crop=${encodeURIComponent(crop)}`;
     
-    // Fetch factor impact
-    fetchFactorImpact(region, crop, 'crop-factor-impact');
+    if (region) {
+        url += `&region=${encodeURIComponent(region)}`;
+    }
     
-    // Fetch crop insights
-    fetchCropInsights(crop, region);
+    fetch(url)
+        .then(response => response.json())
+        .then(data => {
+            renderYieldByRegion(data.yield_by_region, crop, 'crop-yield-by-region');
+            renderFactorImpact(data.factor_impact, 'crop-factor-impact');
+            renderCropInsights(data);
+        })
+        .catch(error => {
+            console.error('Error fetching crop dashboard:', error);
+            ['crop-yield-by-region', 'crop-factor-impact', 'crop-insights'].forEach(elementId => {
+                document.getElementById(elementId).innerHTML = `
+                    <div class="alert alert-danger" role="alert">
+                        An error occurred while fetching the crop analysis. Please try again.
+                    </div>
+                `;
+            });
+        });
 }
 
 // Predict yield
@@ -218,10 +260,10 @@ function predictYield(event) {
     })
         .then(response => response.json())
         .then(data => {
-            if (data.error) {
+            if (data.error || data.detail) {
                 document.getElementById('prediction-result').innerHTML = `
                     <div class="alert alert-danger" role="alert">
-                        ${data.error}
+                        ${data.error || data.detail}
                     </div>
                 `;
             } else {
@@ -289,8 +331,9 @@ function getImprovementStrategies() {
                     <div class="strategy-card">
                         <h6>${strategy.factor}</h6>
                         <p><strong>Impact:</strong> ${strategy.impact}</p>
-                        <p><strong>Current Value:</strong> ${strategy.current_value}</p>
-                        <p><strong>Recommendation:</strong> ${strategy.recommendation}</p>
+                        <ul>
+                            ${strategy.strategies.map(item => `<li>${item}</li>`).join('')}
+                        </ul>
                     </div>
                 `;
             });
@@ -309,312 +352,235 @@ function getImprovementStrategies() {
         });
 }
 
-// Fetch yield trend
-function fetchYieldTrend(region, crop, elementId) {
-    let url = `/api/yield-trend?region=${encodeURIComponent(region)}`;
-    if (crop) {
-        url += `&crop=${encodeURIComponent(crop)}`;
+// Render yield trend
+function renderYieldTrend(data, region, crop, elementId) {
+    if (!data || data.length === 0) {
+        document.getElementById(elementId).innerHTML = `
+            <div class="alert alert-info" role="alert">
+                No yield trend data available for the selected parameters.
+            </div>
+        `;
+        return;
     }
     
-    fetch(url)
-        .then(response => response.json())
-        .then(data => {
-            if (data.length === 0) {
-                document.getElementById(elementId).innerHTML = `
-                    <div class="alert alert-info" role="alert">
-                        No yield trend data available for the selected parameters.
-                    </div>
-                `;
-                return;
+    // Extract data from API response
+    const years = data.map(item => item.Year);
+    const yields = data.map(item => item['Average Yield']);
+    
+    // Create trace for the chart
+    const traces = [
+        {
+            x: years,
+            y: yields,
+            type: 'scatter',
+            mode: 'lines+markers',
+            name: 'Average Yield',
+            line: {
+                color: '#28a745',
+                width: 2
+            },
+            marker: {
+                size: 8,
+                color: '#28a745'
             }
-            
-            // Extract data from API response
-            const years = data.map(item => item.Year);
-            const yields = data.map(item => item['Yield (tonnes/ha)']);
-            
-            // Create trace for the chart
-            const traces = [
-                {
-                    x: years,
-                    y: yields,
-                    type: 'scatter',
-                    mode: 'lines+markers',
-                    name: 'Average Yield',
-                    line: {
-                        color: '#28a745',
-                        width: 2
-                    },
-                    marker: {
-                        size: 8,
-                        color: '#28a745'
-                    }
-                }
-            ];
-            
-            const layout = {
-                title: `Yield Trend for ${crop || 'All Crops'} in ${region}`,
-                xaxis: {
-                    title: 'Year'
-                },
-                yaxis: {
-                    title: 'Yield (tonnes/ha)'
-                },
-                margin: {
-                    l: 50,
-                    r: 50,
-                    b: 50,
-                    t: 50,
-                    pad: 4
-                },
-                hovermode: 'closest'
-            };
-            
-            Plotly.newPlot(elementId, traces, layout, {responsive: true});
-        })
-        .catch(error => {
-            console.error('Error fetching yield trend:', error);
-            document.getElementById(elementId).innerHTML = `
-                <div class="alert alert-danger" role="alert">
-                    An error occurred while fetching yield trend. Please try again.
-                </div>
-            `;
-        });
+        }
+    ];
+    
+    const layout = {
+        title: `Yield Trend for ${crop || 'All Crops'} in ${region}`,
+        xaxis: {
+            title: 'Year'
+        },
+        yaxis: {
+            title: 'Yield (tonnes/ha)'
+        },
+        margin: {
+            l: 50,
+            r: 50,
+            b: 50,
+            t: 50,
+            pad: 4
+        },
+        hovermode: 'closest'
+    };
+    
+    Plotly.newPlot(elementId, traces, layout, {responsive: true});
 }
 
-// Fetch yield by region
-function fetchYieldByRegion(crop, elementId) {
-    const url = `/api/yield-by-region?crop=${encodeURIComponent(crop)}`;
+// Render yield by region
+function renderYieldByRegion(data, crop, elementId) {
+    if (!data || data.length === 0) {
+        document.getElementById(elementId).innerHTML = `
+            <div class="alert alert-info" role="alert">
+                No yield data available for the selected crop.
+            </div>
+        `;
+        return;
+    }
     
-    fetch(url)
-        .then(response => response.json())
-        .then(data => {
-            if (data.length === 0) {
-                document.getElementById(elementId).innerHTML = `
-                    <div class="alert alert-info" role="alert">
-                        No yield data available for the selected crop.
-                    </div>
-                `;
-                return;
-            }
-            
-            // Sort data by yield
-            data.sort((a, b) => b['Yield (tonnes/ha)'] - a['Yield (tonnes/ha)']);
-            
-            const regions = data.map(item => item['Agro-Climatic Zone']);
-            const yields = data.map(item => item['Yield (tonnes/ha)']);
-            
-            const trace = {
-                x: regions,
-                y: yields,
-                type: 'bar',
-                marker: {
-                    color: '#28a745'
-                }
-            };
-            
-            const layout = {
-                title: `Average Yield of ${crop} by Region`,
-                xaxis: {
-                    title: 'Region',
-                    tickangle: -45
-                },
-                yaxis: {
-                    title: 'Yield (tonnes/ha)'
-                },
-                margin: {
-                    l: 50,
-                    r: 50,
-                    b: 150,
-                    t: 50,
-                    pad: 4
-                }
-            };
-            
-            Plotly.newPlot(elementId, [trace], layout, {responsive: true});
-        })
-        .catch(error => {
-            console.error('Error fetching yield by region:', error);
-            document.getElementById(elementId).innerHTML = `
-                <div class="alert alert-danger" role="alert">
-                    An error occurred while fetching yield by region. Please try again.
-                </div>
-            `;
-        });
+    // Sort data by yield
+    data.sort((a, b) => b['Average Yield'] - a['Average Yield']);
+    
+    const regions = data.map(item => item.Region);
+    const yields = data.map(item => item['Average Yield']);
+    
+    const trace = {
+        x: regions,
+        y: yields,
+        type: 'bar',
+        marker: {
+            color: '#28a745'
+        }
+    };
+    
+    const layout = {
+        title: `Average Yield of ${crop} by Region`,
+        xaxis: {
+            title: 'Region',
+            tickangle: -45
+        },
+        yaxis: {
+            title: 'Yield (tonnes/ha)'
+        },
+        margin: {
+            l: 50,
+            r: 50,
+            b: 150,
+            t: 50,
+            pad: 4
+        }
+    };
+    
+    Plotly.newPlot(elementId, [trace], layout, {responsive: true});
 }
 
-// Fetch factor impact
-function fetchFactorImpact(region, crop, elementId) {
-    let url = '/api/factor-impact';
-    const params = [];
+// Render factor impact
+function renderFactorImpact(data, elementId) {
+    if (!data || Object.keys(data).length === 0) {
+        document.getElementById(elementId).innerHTML = `
+            <div class="alert alert-info" role="alert">
+                No factor impact data available for the selected parameters.
+            </div>
+        `;
+        return;
+    }
     
-    if (region) {
-        params.push(`region=${encodeURIComponent(region)}`);
+    const factors = Object.keys(data);
+    const impacts = Object.values(data);
+    
+    const trace = {
+        x: factors,
+        y: impacts,
+        type: 'bar',
+        marker: {
+            color: '#28a745'
+        }
+    };
+    
+    const layout = {
+        title: `Factor Impact on Yield`,
+        xaxis: {
+            title: 'Factor'
+        },
+        yaxis: {
+            title: 'Impact (%)'
+        },
+        margin: {
+            l: 50,
+            r: 50,
+            b: 100,
+            t: 50,
+            pad: 4
+        }
+    };
+    
+    Plotly.newPlot(elementId, [trace], layout, {responsive: true});
+}
+
+// Render regional insights
+function renderRegionalInsights(data) {
+    if (data.error) {
+        document.getElementById('region-insights').innerHTML = `
+            <div class="alert alert-warning" role="alert">
+                ${data.error}
+            </div>
+        `;
+        return;
     }
     
-    if (crop) {
-        params.push(`crop=${encodeURIComponent(crop)}`);
+    let insightsHTML = `
+        <h6>Insights for ${data.region} (${data.crop})</h6>
+    `;
+    
+    if (data.trend_analysis) {
+        insightsHTML += `<p><strong>Yield Trend:</strong> ${data.trend_analysis}</p>`;
     }
     
-    if (params.length > 0) {
-        url += '?' + params.join('&');
+    if (data.soil_analysis) {
+        insightsHTML += `<p><strong>Soil Type:</strong> ${data.soil_analysis}</p>`;
     }
     
-    fetch(url)
-        .then(response => response.json())
-        .then(data => {
-            if (Object.keys(data).length === 0) {
-                document.getElementById(elementId).innerHTML = `
-                    <div class="alert alert-info" role="alert">
-                        No factor impact data available for the selected parameters.
-                    </div>
-                `;
-                return;
-            }
-            
-            const factors = Object.keys(data);
-            const impacts = Object.values(data);
-            
-            const trace = {
-                x: factors,
-                y: impacts,
-                type: 'bar',
-                marker: {
-                    color: '#28a745'
-                }
-            };
-            
-            const layout = {
-                title: `Factor Impact on Yield`,
-                xaxis: {
-                    title: 'Factor'
-                },
-                yaxis: {
-                    title: 'Impact (%)'
-                },
-                margin: {
-                    l: 50,
-                    r: 50,
-                    b: 100,
-                    t: 50,
-                    pad: 4
-                }
-            };
-            
-            Plotly.newPlot(elementId, [trace], layout, {responsive: true});
-        })
-        .catch(error => console.error('Error fetching factor impact:', error));
-}
-
-// Fetch regional insights
-function fetchRegionalInsights(region, crop) {
-    let url = `/api/regional-insights?region=${encodeURIComponent(region)}`;
+    if (data.factor_impact) {
+        insightsHTML += `
+            <p><strong>Factor Impact:</strong></p>
+            <ul>
+                ${Object.entries(data.factor_impact).map(([factor, impact]) => 
+                    `<li>${factor}: ${impact.toFixed(2)}</li>`).join('')}
+            </ul>
+        `;
+    }
     
-    if (crop) {
-        url += `&crop=${encodeURIComponent(crop)}`;
+    if (data.recommendations && data.recommendations.length > 0) {
+        insightsHTML += `
+            <p><strong>Recommendations:</strong></p>
+            <ul>
+                ${data.recommendations.map(recommendation => `<li>${recommendation}</li>`).join('')}
+            </ul>
+        `;
     }
     
-    fetch(url)
-        .then(response => response.json())
-        .then(data => {
-            if (data.error) {
-                document.getElementById('region-insights').innerHTML = `
-                    <div class="alert alert-warning" role="alert">
-                        ${data.error}
-                    </div>
-                `;
-                return;
-            }
-            
-            let insightsHTML = `
-                <h6>Insights for ${data.region}</h6>
-                <p><strong>Average Yield:</strong> ${data.average_yield} tonnes/ha</p>
-                <p><strong>Yield Trend:</strong> ${data.yield_trend}</p>
-            `;
-            
-            if (data.top_crops && data.top_crops.length > 0) {
-                insightsHTML += `
-                    <p><strong>Top Performing Crops:</strong></p>
-                    <ul>
-                        ${data.top_crops.map(crop => `<li>${crop}</li>`).join('')}
-                    </ul>
-                `;
-            }
-            
-            if (data.factor_impact) {
-                insightsHTML += `
-                    <p><strong>Factor Impact:</strong></p>
-                    <ul>
-                        ${Object.entries(data.factor_impact).map(([factor, impact]) => 
-                            `<li>${factor}: ${impact.toFixed(2)}</li>`).join('')}
-                    </ul>
-                `;
-            }
-            
-            document.getElementById('region-insights').innerHTML = insightsHTML;
-        })
-        .catch(error => {
-            console.error('Error fetching regional insights:', error);
-            document.getElementById('region-insights').innerHTML = `
-                <div class="alert alert-danger" role="alert">
-                    An error occurred while fetching regional insights. Please try again.
-                </div>
-            `;
-        });
+    document.getElementById('region-insights').innerHTML = insightsHTML;
 }
 
-// Fetch crop insights
-function fetchCropInsights(crop, region) {
-    let url = `/api/crop-insights?crop=${encodeURIComponent(crop)}`;
-    
-    if (region) {
-        url += `&region=${encodeURIComponent(region)}`;
+// Render crop insights
+function renderCropInsights(data) {
+    if (data.error) {
+        document.getElementById('crop-insights').innerHTML = `
+            <div class="alert alert-warning" role="alert">
+                ${data.error}
+            </div>
+        `;
+        return;
     }
     
-    fetch(url)
-        .then(response => response.json())
-        .then(data => {
-            if (data.error) {
-                document.getElementById('crop-insights').innerHTML = `
-                    <div class="alert alert-warning" role="alert">
-                        ${data.error}
-                    </div>
-                `;
-                return;
-            }
-            
-            let insightsHTML = `
-                <h6>Insights for ${data.crop}</h6>
-                <p><strong>Average Yield:</strong> ${data.average_yield} tonnes/ha</p>
-                <p><strong>Yield Trend:</strong> ${data.yield_trend}</p>
-            `;
-            
-            if (data.top_regions && data.top_regions.length > 0) {
-                insightsHTML += `
-                    <p><strong>Top Performing Regions:</strong></p>
-                    <ul>
-                        ${data.top_regions.map(region => `<li>${region}</li>`).join('')}
-                    </ul>
-                `;
-            }
-            
-            if (data.factor_impact) {
-                insightsHTML += `
-                    <p><strong>Factor Impact:</strong></p>
-                    <ul>
-                        ${Object.entries(data.factor_impact).map(([factor, impact]) => 
-                            `<li>${factor}: ${impact.toFixed(2)}</li>`).join('')}
-                    </ul>
-                `;
-            }
-            
-            document.getElementById('crop-insights').innerHTML = insightsHTML;
-        })
-        .catch(error => {
-            console.error('Error fetching crop insights:', error);
-            document.getElementById('crop-insights').innerHTML = `
-                <div class="alert alert-danger" role="alert">
-                    An error occurred while fetching crop insights. Please try again.
-                </div>
-            `;
+    let insightsHTML = `
+        <h6>Insights for ${data.crop} (${data.region})</h6>
+    `;
+    
+    [data.region_analysis, data.factor_analysis, data.season_analysis]
+        .filter(analysis => analysis)
+        .forEach(analysis => {
+            insightsHTML += `<p>${analysis}</p>`;
         });
-} 
\ No newline at end of file
+    
+    if (data.factor_impact) {
+        insightsHTML += `
+            <p><strong>Factor Impact:</strong></p>
+            <ul>
+                ${Object.entries(data.factor_impact).map(([factor, impact]) => 
+                    `<li>${factor}: ${impact.toFixed(2)}</li>`).join('')}
+            </ul>
+        `;
+    }
+    
+    if (data.recommendations && data.recommendations.length > 0) {
+        insightsHTML += `
+            <p><strong>Recommendations:</strong></p>
+            <ul>
+                ${data.recommendations.map(recommendation => `<li>${recommendation}</li>`).join('')}
+            </ul>
+        `;
+    }
+    
+    document.getElementById('crop-insights').innerHTML = insightsHTML;
+}
\ No newline at end of file
@@ -0,0 +1,353 @@
+import time
+import math
+import types
+import bisect
+import asyncio
+import inspect
+import functools
+import threading
+
+# Upper bounds of the latency histograms, in seconds
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Upper bounds of the rows-scanned histogram
+ROW_BUCKETS = (0, 10, 100, 1000, 10000, 100000, 1000000, 10000000, 100000000)
+
+def _format_value(value):
+    if value == math.inf:
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+def _format_labels(names, values):
+    if not names:
+        return ''
+    pairs = []
+    for name, value in zip(names, values):
+        escaped = str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+        pairs.append(f'{name}="{escaped}"')
+    return '{' + ','.join(pairs) + '}'
+
+class Counter:
+    """
+    Monotonic counter with optional labels
+    """
+    
+    kind = 'counter'
+    
+    def __init__(self, name, documentation, labelnames=()):
+        """
+        Initialize the counter
+        
+        Args:
+            name (str): Metric name
+            documentation (str): Help text
+            labelnames (tuple): Label names, in the order they are rendered
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+    
+    def inc(self, amount=1, **labels):
+        """
+        Add to the counter
+        
+        Args:
+            amount (float): Non-negative increment
+            **labels: Value of every label
+        """
+        key = tuple(labels[name] for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+    
+    def samples(self):
+        """
+        Get the samples of the counter
+        
+        Returns:
+            list: (suffix, label names, label values, value) tuples
+        """
+        with self._lock:
+            values = dict(self._values)
+        return [('_total', self.labelnames, key, value) for key, value in sorted(values.items())]
+
+class Histogram:
+    """
+    Histogram with fixed buckets and optional labels
+    
+    Observing a value costs one bisection and one locked increment, so
+    histograms can stay on in hot paths.
+    """
+    
+    kind = 'histogram'
+    
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        """
+        Initialize the histogram
+        
+        Args:
+            name (str): Metric name
+            documentation (str): Help text
+            labelnames (tuple): Label names, in the order they are rendered
+            buckets (tuple): Sorted upper bounds of the buckets
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._values = {}
+        self._lock = threading.Lock()
+    
+    def observe(self, value, **labels):
+        """
+        Record a value
+        
+        Args:
+            value (float): Observed value
+            **labels: Value of every label
+        """
+        key = tuple(labels[name] for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                # Bucket counts, then the sum of the values
+                entry = self._values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            entry[index] += 1
+            entry[-1] += value
+    
+    def time(self, **labels):
+        """
+        Time a block of code
+        
+        Args:
+            **labels: Value of every label
+        
+        Returns:
+            context manager: Observes the elapsed seconds on exit
+        """
+        return _Timer(self, labels)
+    
+    def samples(self):
+        """
+        Get the samples of the histogram, with cumulative buckets
+        
+        Returns:
+            list: (suffix, label names, label values, value) tuples
+        """
+        with self._lock:
+            values = {key: list(entry) for key, entry in self._values.items()}
+        
+        samples = []
+        names = self.labelnames + ('le',)
+        for key, entry in sorted(values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), entry[:-1]):
+                cumulative += count
+                samples.append(('_bucket', names, key + (_format_value(bound),), cumulative))
+            samples.append(('_sum', self.labelnames, key, entry[-1]))
+            samples.append(('_count', self.labelnames, key, cumulative))
+        return samples
+
+class _Timer:
+    def __init__(self, histogram, labels):
+        self.histogram = histogram
+        self.labels = labels
+    
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.histogram.observe(time.perf_counter() - self.start, **self.labels)
+
+class CallbackMetric:
+    """
+    Gauge or counter whose value is read from a function at scrape time
+    """
+    
+    def __init__(self, name, documentation, fn, kind='gauge'):
+        """
+        Initialize the metric
+        
+        Args:
+            name (str): Metric name
+            documentation (str): Help text
+            fn (callable): Returns the current value
+            kind (str): 'gauge' or 'counter'
+        """
+        self.name = name
+        self.documentation = documentation
+        self.fn = fn
+        self.kind = kind
+    
+    def samples(self):
+        """
+        Get the current sample
+        
+        Returns:
+            list: One (suffix, label names, label values, value) tuple
+        """
+        suffix = '_total' if self.kind == 'counter' else ''
+        return [(suffix, (), (), self.fn())]
+
+class MetricsRegistry:
+    """
+    Collection of metrics rendered together in the Prometheus text format
+    """
+    
+    def __init__(self):
+        """Initialize an empty registry"""
+        self._metrics = {}
+        self._lock = threading.Lock()
+    
+    def register(self, metric):
+        """
+        Add a metric, replacing any metric of the same name
+        
+        Args:
+            metric: Counter, Histogram or CallbackMetric
+        
+        Returns:
+            The registered metric
+        """
+        with self._lock:
+            self._metrics[metric.name] = metric
+        return metric
+    
+    def counter(self, name, documentation, labelnames=()):
+        """Create and register a Counter"""
+        return self.register(Counter(name, documentation, labelnames))
+    
+    def histogram(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        """Create and register a Histogram"""
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+    
+    def callback(self, name, documentation, fn, kind='gauge'):
+        """Create and register a CallbackMetric"""
+        return self.register(CallbackMetric(name, documentation, fn, kind))
+    
+    def render(self):
+        """
+        Render every metric in the Prometheus text exposition format
+        
+        Returns:
+            str: Exposition text
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for suffix, names, values, value in metric.samples():
+                lines.append(f"{metric.name}{suffix}{_format_labels(names, values)} {_format_value(value)}")
+        return '\n'.join(lines) + '\n'
+
+registry = MetricsRegistry()
+
+http_request_duration = registry.histogram(
+    'agri_http_request_duration_seconds', 'Latency of HTTP requests by route',
+    ('method', 'path', 'status')
+)
+method_duration = registry.histogram(
+    'agri_method_duration_seconds', 'Latency of data processor and yield analyzer methods',
+    ('component', 'method')
+)
+rows_scanned = registry.histogram(
+    'agri_rows_scanned', 'Dataset rows scanned per query',
+    ('method',), buckets=ROW_BUCKETS
+)
+model_training_duration = registry.histogram(
+    'agri_model_training_seconds', 'Duration of yield model training runs',
+    ('model',)
+)
+model_cache_requests = registry.counter(
+    'agri_model_cache_requests', 'Yield model lookups by whether the model was already in memory',
+    ('result',)
+)
+event_loop_lag = registry.histogram(
+    'agri_event_loop_lag_seconds', 'Delay of the event loop monitor wake-ups'
+)
+event_loop_blocked = registry.counter(
+    'agri_event_loop_blocked_seconds', 'Time the event loop was blocked beyond the monitor threshold'
+)
+
+def instrument_methods(component):
+    """
+    Class decorator that times every public method defined by the class
+    
+    Generator methods are left alone, since their work happens after the
+    call returns.
+    
+    Args:
+        component (str): Value of the component label
+    
+    Returns:
+        callable: Decorator
+    """
+    def decorate(cls):
+        for name, attribute in list(vars(cls).items()):
+            if name.startswith('_') or not isinstance(attribute, types.FunctionType):
+                continue
+            if inspect.isgeneratorfunction(attribute):
+                continue
+            setattr(cls, name, _timed(attribute, component, name))
+        return cls
+    return decorate
+
+def _timed(fn, component, name):
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            method_duration.observe(time.perf_counter() - start, component=component, method=name)
+    return wrapper
+
+class EventLoopMonitor:
+    """
+    Measures how long the event loop is blocked
+    
+    A task sleeps for ``interval`` seconds at a time; any extra delay
+    before it wakes up is time the loop spent running something else
+    without yielding.
+    """
+    
+    def __init__(self, interval=0.05, threshold=0.01):
+        """
+        Initialize the monitor
+        
+        Args:
+            interval (float): Seconds between wake-ups
+            threshold (float): Lag in seconds counted as blocking
+        """
+        self.interval = interval
+        self.threshold = threshold
+        self._task = None
+    
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - expected)
+            event_loop_lag.observe(lag)
+            if lag > self.threshold:
+                event_loop_blocked.inc(lag)
+    
+    def start(self):
+        """Start monitoring the running event loop"""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+    
+    def stop(self):
+        """Stop monitoring"""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
\ No newline at end of file
@@ -0,0 +1,227 @@
+import os
+import sys
+import json
+import time
+import threading
+import contextvars
+import functools
+
+# Profiler of the request being served, visible to the calls it makes
+_active_profiler = contextvars.ContextVar('active_profiler', default=None)
+
+# Values of the X-Profile header or profile query parameter
+PROFILE_FORMATS = {'1': 'collapsed', 'true': 'collapsed', 'collapsed': 'collapsed', 'json': 'json'}
+
+class SamplingProfiler:
+    """
+    Sampling profiler of the threads that serve one request
+    
+    A background thread reads the Python stack of every tracked thread
+    each ``interval`` seconds and counts identical stacks. Time spent in C
+    code, such as pandas groupbys or sklearn fits, is attributed to the
+    Python frame that called it. The stack of each thread starts with a
+    frame naming the thread, so work on the event loop and in the
+    analytics workers shows up side by side.
+    """
+    
+    def __init__(self, interval=0.002, max_depth=128):
+        """
+        Initialize the profiler
+        
+        Args:
+            interval (float): Seconds between samples
+            max_depth (int): Innermost frames kept per stack
+        """
+        self.interval = interval
+        self.max_depth = max_depth
+        self.stacks = {}
+        self.samples = 0
+        self.started = None
+        self.duration = None
+        self._threads = {}
+        self._labels = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sampler = None
+    
+    def add_thread(self, ident=None):
+        """
+        Start sampling a thread
+        
+        Args:
+            ident (int, optional): Thread identifier, the current thread by default
+        """
+        ident = threading.get_ident() if ident is None else ident
+        with self._lock:
+            self._threads[ident] = self._threads.get(ident, 0) + 1
+    
+    def remove_thread(self, ident=None):
+        """
+        Stop sampling a thread added as many times before
+        
+        Args:
+            ident (int, optional): Thread identifier, the current thread by default
+        """
+        ident = threading.get_ident() if ident is None else ident
+        with self._lock:
+            count = self._threads.get(ident, 0) - 1
+            if count > 0:
+                self._threads[ident] = count
+            else:
+                self._threads.pop(ident, None)
+    
+    def start(self):
+        """Start the sampler thread"""
+        self.started = time.perf_counter()
+        self._sampler = threading.Thread(target=self._run, name='profiler', daemon=True)
+        self._sampler.start()
+    
+    def stop(self):
+        """Stop the sampler thread and record the profiled duration"""
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+        self.duration = time.perf_counter() - self.started
+    
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+    
+    def _sample(self):
+        frames = sys._current_frames()
+        with self._lock:
+            idents = list(self._threads)
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        
+        for ident in idents:
+            frame = frames.get(ident)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None and len(stack) < self.max_depth:
+                stack.append(self._label(frame.f_code))
+                frame = frame.f_back
+            stack.append(f"thread:{names.get(ident, ident)}")
+            key = tuple(reversed(stack))
+            self.stacks[key] = self.stacks.get(key, 0) + 1
+        self.samples += 1
+    
+    def _label(self, code):
+        label = self._labels.get(code)
+        if label is None:
+            label = self._labels[code] = f"{code.co_name} ({_short_path(code.co_filename)}:{code.co_firstlineno})"
+        return label
+    
+    def collapsed(self):
+        """
+        Get the profile in the collapsed-stack format
+        
+        Every line holds the frames of one stack from the outermost,
+        separated by semicolons, and the number of samples it was seen in.
+        flamegraph.pl, inferno and speedscope read this format directly.
+        
+        Returns:
+            str: Collapsed stacks
+        """
+        lines = [f"{';'.join(stack)} {count}" for stack, count in sorted(self.stacks.items())]
+        return '\n'.join(lines) + '\n'
+    
+    def to_dict(self):
+        """
+        Get the profile as a JSON-serializable dict
+        
+        Returns:
+            dict: Sampling parameters and the stacks by sample count
+        """
+        stacks = sorted(self.stacks.items(), key=lambda item: -item[1])
+        return {
+            'interval': self.interval,
+            'duration': self.duration,
+            'samples': self.samples,
+            'stacks': [{'frames': list(stack), 'count': count} for stack, count in stacks]
+        }
+
+def _short_path(filename):
+    # Paths relative to the longest matching sys.path entry, as in import names
+    best = filename
+    for entry in sys.path:
+        if entry and filename.startswith(entry + os.sep) and len(filename) - len(entry) - 1 < len(best):
+            best = filename[len(entry) + 1:]
+    return best
+
+def requested_format(request):
+    """
+    Get the profile format a request asks for
+    
+    Args:
+        request (starlette.requests.Request): Incoming request
+    
+    Returns:
+        str: 'collapsed' or 'json', or None when the request is not profiled
+    """
+    value = request.headers.get('x-profile') or request.query_params.get('profile')
+    return PROFILE_FORMATS.get((value or '').lower())
+
+def activate(profiler):
+    """
+    Make a profiler the one of the current request context
+    
+    Args:
+        profiler (SamplingProfiler): Profiler of the request
+    
+    Returns:
+        contextvars.Token: Token for deactivate
+    """
+    return _active_profiler.set(profiler)
+
+def deactivate(token):
+    """Restore the profiler that was active before activate"""
+    _active_profiler.reset(token)
+
+def is_profiling():
+    """Check whether the current request is being profiled"""
+    return _active_profiler.get() is not None
+
+def bind_thread(fn):
+    """
+    Wrap a call so the thread running it is sampled by the active profiler
+    
+    The profiler is looked up when the wrapper runs, in the context it was
+    given, so the wrapper can be created on the event loop and run in a
+    worker thread under a copy of the request context.
+    
+    Args:
+        fn (callable): Call to wrap
+    
+    Returns:
+        callable: Wrapped call
+    """
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        profiler = _active_profiler.get()
+        if profiler is None:
+            return fn(*args, **kwargs)
+        profiler.add_thread()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            profiler.remove_thread()
+    return wrapper
+
+def render(profiler, fmt, status_code):
+    """
+    Render a finished profile as a response body
+    
+    Args:
+        profiler (SamplingProfiler): Stopped profiler
+        fmt (str): 'collapsed' or 'json'
+        status_code (int): Status of the profiled response
+    
+    Returns:
+        tuple: (body, media type)
+    """
+    if fmt == 'json':
+        profile = profiler.to_dict()
+        profile['status'] = status_code
+        return json.dumps(profile), 'application/json'
+    return profiler.collapsed(), 'text/plain; charset=utf-8'
\ No newline at end of file
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+"""
+Compare compiled forests with the sklearn RandomForestRegressor they come from
+
+A forest is trained, as YieldAnalyzer does, for every region and crop
+pair with enough rows for one (--max-models at most). For every forest
+the node memory of the sklearn trees and of the compiled buffer is
+reported, with the latency of a single-row and a batch prediction and
+the largest difference between both predictions. The script exits with
+status 1 if a difference is above 1e-9.
+
+Usage:
+    python benchmarks/bench_compiled_forest.py [--max-models 10] [--batch 1000]
+"""
+import os
+import sys
+import time
+import argparse
+import statistics
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+def sklearn_nbytes(forest):
+    """Memory of the node and value arrays of every tree"""
+    total = 0
+    for estimator in forest.estimators_:
+        state = estimator.tree_.__getstate__()
+        total += state['nodes'].nbytes + state['values'].nbytes
+    return total
+
+def latency(fn, repeat):
+    """Median seconds per call"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark compiled forests")
+    parser.add_argument('--data-path', default=os.path.join(ROOT, 'app/data/crop_yield_dataset.csv'))
+    parser.add_argument('--max-models', type=int, default=10, help="Forests to train")
+    parser.add_argument('--batch', type=int, default=1000, help="Rows of the batch prediction")
+    parser.add_argument('--repeat', type=int, default=20, help="Calls per latency")
+    args = parser.parse_args()
+    
+    import numpy as np
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.preprocessing import StandardScaler
+    from app.models.data_processor import DataProcessor
+    from app.models.compiled_forest import CompiledForest
+    
+    data_processor = DataProcessor(args.data_path)
+    counts = data_processor.get_group_counts(['Agro-Climatic Zone', 'Crop'])
+    counts = counts[counts['Sample Count'] >= 50].head(args.max_models)
+    rng = np.random.default_rng(0)
+    
+    print(f"{'region / crop':<44}{'rows':>7}{'sklearn MB':>12}{'compiled MB':>13}"
+          f"{'1-row sk ms':>13}{'1-row ms':>10}{'batch sk ms':>13}{'batch ms':>10}{'max diff':>10}")
+    failures = 0
+    totals = np.zeros(2)
+    for region, crop in zip(counts['Agro-Climatic Zone'], counts['Crop']):
+        df = data_processor.filter_data({'Agro-Climatic Zone': region, 'Crop': crop})
+        X = StandardScaler().fit_transform(df[data_processor.feature_columns].values)
+        forest = RandomForestRegressor(n_estimators=100, random_state=42).fit(X, df[data_processor.target_column].values)
+        compiled = CompiledForest.from_sklearn(forest)
+        
+        batch = X[rng.integers(0, len(X), args.batch)] + rng.normal(scale=0.1, size=(args.batch, X.shape[1]))
+        diff = np.abs(forest.predict(batch) - compiled.predict(batch)).max()
+        failures += diff > 1e-9
+        sizes = np.array([sklearn_nbytes(forest), compiled.nbytes]) / 1e6
+        totals += sizes
+        
+        print(f"{(region + ' / ' + crop)[:43]:<44}{len(df):>7}{sizes[0]:>12.2f}{sizes[1]:>13.2f}"
+              f"{latency(lambda: forest.predict(batch[:1]), args.repeat) * 1000:>13.3f}"
+              f"{latency(lambda: compiled.predict(batch[:1]), args.repeat) * 1000:>10.3f}"
+              f"{latency(lambda: forest.predict(batch), args.repeat) * 1000:>13.3f}"
+              f"{latency(lambda: compiled.predict(batch), args.repeat) * 1000:>10.3f}{diff:>10.1e}")
+    
+    print(f"\nTotal node memory: {totals[0]:.1f} MB sklearn, {totals[1]:.1f} MB compiled")
+    sys.exit(1 if failures else 0)
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+"""
+Compare dataset load time and memory for the CSV and columnar paths
+
+Every measurement runs in a fresh interpreter and reports the growth of
+the resident set over the loaded frame, both right after loading and after
+a scan that pulls every memory-mapped page in. Pass --rows to tile the dataset up to a larger
+size first.
+
+Usage:
+    python benchmarks/bench_dataset_load.py [--rows 1000000] [--repeat 3]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import tempfile
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+def rss_mb():
+    """Resident set size of this process, or its peak where /proc is missing"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except OSError:
+        # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def measure(path, data_path, columnar_dir):
+    """Load the dataset once in this process and report time and memory"""
+    import pandas as pd
+    import numpy as np
+    from app.models.columnar_store import ColumnarStore
+    
+    baseline = rss_mb()
+    start = time.perf_counter()
+    if path == 'csv':
+        df = pd.read_csv(data_path).dropna()
+    else:
+        df = ColumnarStore(columnar_dir).read()
+    load_s = time.perf_counter() - start
+    
+    load_rss = rss_mb() - baseline
+    
+    # Touch every numeric column so memory-mapped pages are really read
+    start = time.perf_counter()
+    for column in df.select_dtypes(include=[np.number]).columns:
+        df[column].to_numpy().sum()
+    scan_s = time.perf_counter() - start
+    
+    return {
+        'path': path,
+        'rows': len(df),
+        'load_s': load_s,
+        'scan_s': scan_s,
+        'load_rss_mb': load_rss,
+        'scan_rss_mb': rss_mb() - baseline
+    }
+
+def tile_dataset(data_path, rows, directory):
+    """Write a copy of the dataset repeated up to the requested row count"""
+    import pandas as pd
+    
+    df = pd.read_csv(data_path)
+    repeats = -(-rows // len(df))
+    tiled = pd.concat([df] * repeats, ignore_index=True).iloc[:rows]
+    path = os.path.join(directory, f'dataset-{rows}.csv')
+    tiled.to_csv(path, index=False)
+    return path
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dataset loading")
+    parser.add_argument('--data-path', default=os.path.join(ROOT, 'app/data/crop_yield_dataset.csv'))
+    parser.add_argument('--rows', type=int, default=None, help="Tile the dataset to this many rows")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per path; the fastest is reported")
+    parser.add_argument('--child', nargs=3, metavar=('PATH', 'DATA', 'COLUMNAR'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.child:
+        print(json.dumps(measure(*args.child)))
+        return
+    
+    from app.models.columnar_store import ColumnarStore
+    from app.models.data_processor import DataProcessor
+    
+    with tempfile.TemporaryDirectory() as directory:
+        data_path = tile_dataset(args.data_path, args.rows, directory) if args.rows else args.data_path
+        columnar_dir = os.path.join(directory, 'columnar')
+        data_processor = DataProcessor(data_path)
+        ColumnarStore(columnar_dir).write(data_processor.df, ColumnarStore.source_stamp(data_path))
+        
+        print(f"{'path':<10}{'rows':>12}{'load s':>10}{'scan s':>10}{'RSS MB after load':>20}{'after scan':>12}")
+        for path in ('csv', 'columnar'):
+            runs = []
+            for _ in range(args.repeat):
+                output = subprocess.run(
+                    [sys.executable, __file__, '--child', path, data_path, columnar_dir],
+                    check=True, capture_output=True, text=True
+                ).stdout
+                runs.append(json.loads(output))
+            best = min(runs, key=lambda run: run['load_s'])
+            print(f"{path:<10}{best['rows']:>12}{best['load_s']:>10.3f}{best['scan_s']:>10.3f}{best['load_rss_mb']:>20.1f}{best['scan_rss_mb']:>12.1f}")
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
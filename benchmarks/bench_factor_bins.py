@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+"""
+Compare sketch-based factor binning with exact pd.qcut binning
+
+For every sketched factor, bin count and group (whole dataset, region,
+crop, region-crop) the sketch result is checked against pd.qcut over the
+filtered rows. Reported errors are the worst rank error of the bin edges
+and the worst share of the group's rows assigned to a different bin,
+along with the time per call of both paths. Pass --rows to tile the
+dataset up to a larger size first.
+
+Usage:
+    python benchmarks/bench_factor_bins.py [--rows 1000000] [--bins 5 10]
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_dataset_load import tile_dataset
+
+def exact_yield_by_factor(data_processor, factor, filters, bins):
+    """Bin the filtered rows with pd.qcut, like get_yield_by_factor did before sketches"""
+    import pandas as pd
+    
+    filtered_df = data_processor.filter_data(filters)
+    groups = pd.qcut(filtered_df[factor], bins, duplicates='drop')
+    factor_yield = filtered_df.groupby(groups, observed=True)[data_processor.target_column].agg(['mean', 'count'])
+    return factor_yield, groups.cat.categories
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return result, (time.perf_counter() - start) / repeat
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark factor binning")
+    parser.add_argument('--data-path', default=os.path.join(ROOT, 'app/data/crop_yield_dataset.csv'))
+    parser.add_argument('--rows', type=int, default=None, help="Tile the dataset to this many rows")
+    parser.add_argument('--bins', type=int, nargs='+', default=[5, 10])
+    parser.add_argument('--repeat', type=int, default=5, help="Calls per timing")
+    args = parser.parse_args()
+    
+    import numpy as np
+    from app.models.data_processor import DataProcessor
+    
+    with tempfile.TemporaryDirectory() as directory:
+        data_path = tile_dataset(args.data_path, args.rows, directory) if args.rows else args.data_path
+        data_processor = DataProcessor(data_path)
+    
+    region = data_processor.get_unique_values('Agro-Climatic Zone')[0]
+    crop = data_processor.get_unique_values('Crop')[0]
+    groups = [('all', None, None), ('region', region, None), ('crop', None, crop), ('region-crop', region, crop)]
+    
+    print(f"{'factor':<24}{'bins':>6}{'group':>13}{'rows':>10}{'edge rank err':>15}{'moved rows':>12}{'qcut ms':>10}{'sketch ms':>11}")
+    for factor in data_processor.sketches.columns:
+        for bins in args.bins:
+            for name, group_region, group_crop in groups:
+                filters = {'Agro-Climatic Zone': group_region, 'Crop': group_crop}
+                (exact, categories), exact_s = timed(lambda: exact_yield_by_factor(data_processor, factor, filters, bins), args.repeat)
+                approx, sketch_s = timed(lambda: data_processor.get_yield_by_factor(factor, group_region, group_crop, bins), args.repeat)
+                
+                values = np.sort(data_processor.filter_data(filters)[factor].to_numpy())
+                edges = data_processor.sketches.get(factor, group_region, group_crop).quantile(np.linspace(0, 1, bins + 1))
+                ranks = np.searchsorted(values, edges, side='right') / len(values)
+                exact_ranks = np.searchsorted(values, categories.right.to_numpy(), side='right') / len(values)
+                rank_error = np.abs(ranks[1:len(exact_ranks) + 1] - exact_ranks).max()
+                
+                # Rows in a different bin: half the total count difference, bin by bin
+                exact_counts = exact['count'].to_numpy()
+                approx_counts = approx['Sample Count'].to_numpy()
+                size = max(len(exact_counts), len(approx_counts))
+                moved = np.abs(np.pad(exact_counts, (0, size - len(exact_counts))) - np.pad(approx_counts, (0, size - len(approx_counts)))).sum() / 2
+                
+                print(f"{factor:<24}{bins:>6}{name:>13}{len(values):>10}{rank_error:>15.4f}{moved / len(values):>12.4f}{exact_s * 1e3:>10.2f}{sketch_s * 1e3:>11.2f}")
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
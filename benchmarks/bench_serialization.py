@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+"""
+Compare the DataFrame response path with the generic FastAPI JSON path
+
+For the DataFrames of the analytics endpoints, and a slice of raw rows
+of --rows rows, the generic path converts the frame with
+to_dict(orient='records'), validates it against List[Dict[str, Any]],
+runs jsonable_encoder and renders a JSONResponse, as FastAPI does for a
+returned list. FrameResponse renders the frame directly, in records and
+columnar layout. CPU time per response and payload size are reported,
+and every records body is checked to decode to the same values as the
+generic one.
+
+Usage:
+    python benchmarks/bench_serialization.py [--rows 100000] [--repeat 20]
+"""
+import os
+import sys
+import json
+import math
+import time
+import argparse
+from typing import Any, Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+def validator():
+    """Validate records against List[Dict[str, Any]] with the installed pydantic"""
+    try:
+        from pydantic import TypeAdapter
+        return TypeAdapter(List[Dict[str, Any]]).validate_python
+    except ImportError:
+        from pydantic import parse_obj_as
+        return lambda records: parse_obj_as(List[Dict[str, Any]], records)
+
+def generic_body(frame, validate):
+    """Body of a route returning frame.to_dict(orient='records')"""
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse
+    
+    return JSONResponse(jsonable_encoder(validate(frame.to_dict(orient='records')))).body
+
+def cpu_time(fn, repeat):
+    """Mean CPU seconds per call"""
+    start = time.process_time()
+    for _ in range(repeat):
+        result = fn()
+    return result, (time.process_time() - start) / repeat
+
+def same_values(expected, actual):
+    """Compare decoded JSON, floats within 1e-12 relative"""
+    if isinstance(expected, float) or isinstance(actual, float):
+        return math.isclose(expected, actual, rel_tol=1e-12, abs_tol=0)
+    if isinstance(expected, dict):
+        return expected.keys() == actual.keys() and all(same_values(expected[key], actual[key]) for key in expected)
+    if isinstance(expected, list):
+        return len(expected) == len(actual) and all(same_values(a, b) for a, b in zip(expected, actual))
+    return expected == actual
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark response serialization")
+    parser.add_argument('--data-path', default=os.path.join(ROOT, 'app/data/crop_yield_dataset.csv'))
+    parser.add_argument('--rows', type=int, default=100000, help="Raw rows in the largest response")
+    parser.add_argument('--repeat', type=int, default=20, help="Responses per timing")
+    args = parser.parse_args()
+    
+    from app.models.data_processor import DataProcessor
+    from app.api.serialization import FrameResponse
+    
+    data_processor = DataProcessor(args.data_path)
+    frames = {
+        'yield-by-region': data_processor.get_yield_by_region(),
+        'yield-by-factor': data_processor.get_yield_by_factor('Rainfall', bins=10),
+        'yield-trend': data_processor.get_yield_trend(),
+        'factor-impact/all': data_processor.get_all_factor_impacts(),
+        f'rows[:{args.rows}]': data_processor.df.head(args.rows).reset_index(drop=True)
+    }
+    validate = validator()
+    
+    print(f"{'response':<20}{'rows':>8}{'generic ms':>12}{'records ms':>12}{'columnar ms':>13}{'speedup':>9}"
+          f"{'generic KB':>12}{'records KB':>12}{'columnar KB':>13}{'equal':>7}")
+    failures = 0
+    for name, frame in frames.items():
+        repeat = max(1, args.repeat * 1000 // max(len(frame), 1000))
+        generic, generic_s = cpu_time(lambda: generic_body(frame, validate), repeat)
+        records, records_s = cpu_time(lambda: FrameResponse(frame).body, repeat)
+        columnar, columnar_s = cpu_time(lambda: FrameResponse(frame, 'columnar').body, repeat)
+        
+        equal = same_values(json.loads(generic), json.loads(records))
+        failures += not equal
+        print(f"{name:<20}{len(frame):>8}{generic_s * 1000:>12.3f}{records_s * 1000:>12.3f}{columnar_s * 1000:>13.3f}"
+              f"{generic_s / records_s:>8.1f}x{len(generic) / 1024:>12.1f}{len(records) / 1024:>12.1f}"
+              f"{len(columnar) / 1024:>13.1f}{'yes' if equal else 'NO':>7}")
+    
+    sys.exit(1 if failures else 0)
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
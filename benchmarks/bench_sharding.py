@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+"""
+Measure how the sharded backend scales with the number of shard workers
+
+A synthetic dataset is generated and written with its columnar copy,
+then the sharded backend is started with every requested number of
+shards. Startup time and the time of queries without a zone filter,
+which are mapped over every shard, are reported next to the in-memory
+DataProcessor and as a speedup over one shard. The speedup can only
+grow up to the number of CPUs, which is printed first.
+
+Usage:
+    python benchmarks/bench_sharding.py [--rows 5000000] [--shards 1 2 4 8]
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+import statistics
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+def queries(data_processor):
+    """Calls that touch the rows of every zone"""
+    crop = data_processor.get_unique_values('Crop')[0]
+    return {
+        'yield_by_factor': lambda: data_processor.get_yield_by_factor('Rainfall', bins=10),
+        'unique_districts': lambda: data_processor.get_unique_values('District'),
+        'filter_crop': lambda: data_processor.filter_data({'Crop': crop})
+    }
+
+def timed(fn, repeat):
+    """Median seconds per call"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+def measure(build, repeat):
+    """Start a backend and time its queries"""
+    start = time.perf_counter()
+    data_processor = build()
+    result = {'startup': time.perf_counter() - start}
+    for name, fn in queries(data_processor).items():
+        fn()
+        result[name] = timed(fn, repeat)
+    if hasattr(data_processor, 'close'):
+        data_processor.close()
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the sharded backend")
+    parser.add_argument('--data-path', default=os.path.join(ROOT, 'app/data/crop_yield_dataset.csv'))
+    parser.add_argument('--rows', type=int, default=5000000, help="Rows of the synthetic dataset")
+    parser.add_argument('--shards', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--repeat', type=int, default=5, help="Calls per query timing")
+    args = parser.parse_args()
+
+    import pandas as pd
+    from app.models.data_processor import DataProcessor
+    from app.models.sharded_processor import ShardedDataProcessor
+    from app.models.synthetic_data import SyntheticDataGenerator, write_dataset
+
+    print(f"CPUs: {os.cpu_count()}")
+    with tempfile.TemporaryDirectory() as directory:
+        data_path = os.path.join(directory, f'synthetic-{args.rows}.csv')
+        columnar_dir = os.path.join(directory, 'columnar')
+        generator = SyntheticDataGenerator.fit(pd.read_csv(args.data_path))
+        write_dataset(generator, args.rows, csv_path=data_path, columnar_dir=columnar_dir)
+
+        runs = [('memory', measure(lambda: DataProcessor(data_path, columnar_dir=columnar_dir), args.repeat))]
+        for shards in args.shards:
+            runs.append((f'{shards} shards', measure(lambda: ShardedDataProcessor(data_path, columnar_dir, shards=shards), args.repeat)))
+
+    names = list(runs[0][1])
+    print(f"{'backend':<12}" + ''.join(f"{name + ' s':>20}" for name in names))
+    for backend, result in runs:
+        print(f"{backend:<12}" + ''.join(f"{result[name]:>20.4f}" for name in names))
+
+    base = runs[1][1]
+    print(f"\n{'speedup':<12}" + ''.join(f"{name:>20}" for name in names))
+    for backend, result in runs[1:]:
+        print(f"{backend:<12}" + ''.join(f"{base[name] / result[name]:>19.2f}x" for name in names))
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,145 @@
+#!/usr/bin/env python
+"""
+Check the streaming backend against the in-memory DataProcessor
+
+Both backends load the same dataset and every region and crop filter of
+get_yield_by_region, get_yield_trend, get_correlation_matrix and
+get_factor_impact is compared, within floating-point tolerance. Load time
+and peak memory of each backend are then measured in a fresh interpreter.
+Pass --rows to generate a synthetic dataset of that size first. The
+script exits with status 1 if any result differs.
+
+Usage:
+    python benchmarks/bench_streaming.py [--rows 1000000] [--memory-limit 268435456]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import tempfile
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_dataset_load import rss_mb
+
+def peak_rss_mb():
+    """Peak resident set size of this process"""
+    # VmHWM starts over at exec, unlike ru_maxrss which keeps the parent's peak
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def load(backend, data_path, memory_limit):
+    """Build the data processor of a backend"""
+    if backend == 'streaming':
+        from app.models.streaming_processor import StreamingDataProcessor
+        return StreamingDataProcessor(data_path, memory_limit=memory_limit)
+    from app.models.data_processor import DataProcessor
+    return DataProcessor(data_path)
+
+def measure(backend, data_path, memory_limit):
+    """Load one backend in this process and report time and peak memory"""
+    # Import the libraries first so they are not counted as backend memory
+    import numpy
+    import pandas
+    from app.models import data_processor, streaming_processor
+    
+    baseline = rss_mb()
+    start = time.perf_counter()
+    data_processor = load(backend, data_path, int(memory_limit))
+    return {
+        'backend': backend,
+        'load_s': time.perf_counter() - start,
+        'peak_rss_mb': peak_rss_mb() - baseline,
+        'chunk_rows': getattr(data_processor, 'chunk_rows', None)
+    }
+
+def compare(memory_processor, streaming_processor):
+    """
+    Compare the aggregate results of both backends for every filter
+    
+    Returns:
+        list: Description of every mismatch
+    """
+    import numpy as np
+    import pandas as pd
+    
+    regions = [None] + memory_processor.get_unique_values('Agro-Climatic Zone')
+    crops = [None] + memory_processor.get_unique_values('Crop')
+    mismatches = []
+    
+    def check(name, expected, actual):
+        try:
+            if isinstance(expected, dict):
+                assert expected.keys() == actual.keys()
+                np.testing.assert_allclose(list(expected.values()), list(actual.values()), rtol=1e-7, atol=1e-9)
+            else:
+                pd.testing.assert_frame_equal(
+                    expected.reset_index(drop=True), actual.reset_index(drop=True),
+                    check_dtype=False, rtol=1e-7, atol=1e-9
+                )
+        except AssertionError as e:
+            mismatches.append(f"{name}: {str(e).splitlines()[0]}")
+    
+    if memory_processor.get_unique_values('Agro-Climatic Zone') != streaming_processor.get_unique_values('Agro-Climatic Zone'):
+        mismatches.append("regions differ")
+    for crop in crops:
+        check(f"get_yield_by_region(crop={crop})", memory_processor.get_yield_by_region(crop), streaming_processor.get_yield_by_region(crop))
+    for region in regions:
+        for crop in crops:
+            for method in ('get_yield_trend', 'get_correlation_matrix', 'get_factor_impact'):
+                expected = getattr(memory_processor, method)(region=region, crop=crop)
+                actual = getattr(streaming_processor, method)(region=region, crop=crop)
+                check(f"{method}(region={region}, crop={crop})", expected, actual)
+    return mismatches
+
+def main():
+    parser = argparse.ArgumentParser(description="Check and benchmark the streaming backend")
+    parser.add_argument('--data-path', default=os.path.join(ROOT, 'app/data/crop_yield_dataset.csv'))
+    parser.add_argument('--rows', type=int, default=None, help="Generate a synthetic dataset of this many rows")
+    parser.add_argument('--memory-limit', type=int, default=256 * 1024 * 1024, help="Memory limit of the streaming backend in bytes")
+    parser.add_argument('--child', nargs=3, metavar=('BACKEND', 'DATA', 'LIMIT'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.child:
+        print(json.dumps(measure(*args.child)))
+        return
+    
+    import pandas as pd
+    from app.models.synthetic_data import SyntheticDataGenerator, write_dataset
+    
+    with tempfile.TemporaryDirectory() as directory:
+        data_path = args.data_path
+        if args.rows:
+            data_path = os.path.join(directory, f'synthetic-{args.rows}.csv')
+            write_dataset(SyntheticDataGenerator.fit(pd.read_csv(args.data_path)), args.rows, csv_path=data_path)
+        
+        mismatches = compare(load('memory', data_path, args.memory_limit), load('streaming', data_path, args.memory_limit))
+        for mismatch in mismatches:
+            print(f"MISMATCH {mismatch}")
+        print(f"{len(mismatches)} mismatches")
+        
+        print(f"{'backend':<12}{'load s':>10}{'peak RSS MB':>14}{'chunk rows':>12}")
+        for backend in ('memory', 'streaming'):
+            output = subprocess.run(
+                [sys.executable, __file__, '--child', backend, data_path, str(args.memory_limit)],
+                check=True, capture_output=True, text=True
+            ).stdout
+            run = json.loads(output)
+            print(f"{backend:<12}{run['load_s']:>10.2f}{run['peak_rss_mb']:>14.1f}{run['chunk_rows'] or '':>12}")
+    
+    sys.exit(1 if mismatches else 0)
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
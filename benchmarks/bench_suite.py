@@ -0,0 +1,344 @@
+#!/usr/bin/env python
+"""
+Micro-benchmark suite for DataProcessor and YieldAnalyzer
+
+Every public method of both classes is timed at the real dataset and at
+synthetic datasets of the same schema. Synthetic datasets come from the
+generator behind manage.py generate-data and are cached, together with
+their columnar copy, in --cache-dir. Every scale runs in a fresh
+interpreter. The first call of a method after loading is reported as the
+cold run; the following --repeat calls are the warm runs. Methods that
+train a model for every region and crop only run up to --heavy-max-rows.
+
+Results are written as JSON. Compare mode flags every method whose cold
+or warm time grew by more than --threshold over a baseline and exits
+with status 1 if there is any.
+
+Usage:
+    python benchmarks/bench_suite.py run [--scales real 1m 10m] [--output results.json]
+    python benchmarks/bench_suite.py run --compare baseline.json [--threshold 0.1]
+    python benchmarks/bench_suite.py compare baseline.json results.json [--threshold 0.1]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import statistics
+import subprocess
+from collections import namedtuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+Case = namedtuple('Case', ['name', 'call', 'heavy'])
+
+def parse_scale(scale):
+    """Convert 'real', '250k' or '10m' to a row count, None meaning the real dataset"""
+    if scale == 'real':
+        return None
+    multiplier = {'k': 1000, 'm': 1000000}.get(scale[-1].lower(), 1)
+    digits = scale[:-1] if multiplier > 1 else scale
+    return int(float(digits) * multiplier)
+
+def synthetic_dataset(source_path, rows, cache_dir, seed=0):
+    """
+    Create or reuse a synthetic dataset with the schema of the real one
+    
+    The dataset comes from SyntheticDataGenerator fitted to the real rows
+    and is written together with its columnar copy, so loading it is as
+    cheap as loading the real copy.
+    
+    Returns:
+        tuple: (CSV path, columnar directory)
+    """
+    import pandas as pd
+    from app.models.columnar_store import ColumnarStore
+    from app.models.synthetic_data import SyntheticDataGenerator, write_dataset
+    
+    data_path = os.path.join(cache_dir, f'synthetic-{rows}-seed{seed}.csv')
+    columnar_dir = os.path.join(cache_dir, f'synthetic-{rows}-seed{seed}.columnar')
+    if os.path.exists(data_path) and ColumnarStore(columnar_dir).is_fresh(data_path):
+        return data_path, columnar_dir
+    
+    os.makedirs(cache_dir, exist_ok=True)
+    generator = SyntheticDataGenerator.fit(pd.read_csv(source_path))
+    write_dataset(generator, rows, csv_path=data_path, columnar_dir=columnar_dir, seed=seed)
+    return data_path, columnar_dir
+
+def build_cases(data_processor, yield_analyzer, model_dir, train_dir):
+    """
+    Get the benchmark cases, in the order they run
+    
+    Read-only cases come first; cases that change the dataset or the
+    loaded models run last so they cannot turn a later cold run warm.
+    train_all_models runs on a fresh analyzer with an empty registry in
+    train_dir, so its cold run trains every model and its warm runs find
+    them all stored.
+    """
+    import pandas as pd
+    from app.models.yield_analyzer import YieldAnalyzer
+    
+    dp, ya = data_processor, yield_analyzer
+    counts = dp.get_group_counts(['Agro-Climatic Zone', 'Crop'])
+    largest = counts.sort_values('Sample Count', ascending=False).iloc[0]
+    region, crop = largest['Agro-Climatic Zone'], largest['Crop']
+    pair = {'Agro-Climatic Zone': region, 'Crop': crop}
+    
+    sample = dp.df.sample(1000, replace=len(dp.df) < 1000, random_state=0)
+    raw_rows = sample.astype(str).reset_index(drop=True)
+    new_rows, _ = dp.validate_rows(raw_rows)
+    inputs = pd.DataFrame({
+        'region': sample['Agro-Climatic Zone'].to_numpy(),
+        'crop': sample['Crop'].to_numpy(),
+        'rainfall': sample['Rainfall (mm)'].to_numpy(),
+        'irrigation': sample['Irrigation (%)'].to_numpy(),
+        'fertilizer': sample['Fertilizer Use (kg/ha)'].to_numpy()
+    })
+    
+    def scan_rows():
+        return sum(len(rows) for rows, _, _ in dp.iter_row_positions({'Agro-Climatic Zone': region}))
+    
+    return [
+        Case('DataProcessor.get_unique_values', lambda: dp.get_unique_values('Agro-Climatic Zone'), False),
+        Case('DataProcessor.get_group_counts', lambda: dp.get_group_counts(['Agro-Climatic Zone', 'Crop']), False),
+        Case('DataProcessor.get_training_fingerprint', lambda: dp.get_training_fingerprint(region, crop), False),
+        Case('DataProcessor.filter_data', lambda: dp.filter_data(pair), False),
+        Case('DataProcessor.iter_row_positions', scan_rows, False),
+        Case('DataProcessor.row_snapshot', dp.row_snapshot, False),
+        Case('DataProcessor.get_rows_page', lambda: dp.get_rows_page({'Crop': crop}, limit=1000), False),
+        Case('DataProcessor.get_yield_by_region', dp.get_yield_by_region, False),
+        Case('DataProcessor.get_yield_by_factor', lambda: dp.get_yield_by_factor('Rainfall', region=region), False),
+        Case('DataProcessor.get_yield_trend', lambda: dp.get_yield_trend(region, crop), False),
+        Case('DataProcessor.get_view_statistics', lambda: dp.get_view_statistics(region, crop), False),
+        Case('DataProcessor.get_correlation_matrix', lambda: dp.get_correlation_matrix(region), False),
+        Case('DataProcessor.get_factor_impact', lambda: dp.get_factor_impact(region, crop), False),
+        Case('DataProcessor.get_all_factor_impacts', dp.get_all_factor_impacts, False),
+        Case('DataProcessor.validate_rows', lambda: dp.validate_rows(raw_rows), False),
+        Case('YieldAnalyzer.get_regional_insights', lambda: ya.get_regional_insights(region, crop), False),
+        Case('YieldAnalyzer.get_region_dashboard', lambda: ya.get_region_dashboard(region, crop), False),
+        Case('YieldAnalyzer.get_crop_insights', lambda: ya.get_crop_insights(crop, region), False),
+        Case('YieldAnalyzer.get_crop_dashboard', lambda: ya.get_crop_dashboard(crop), False),
+        Case('YieldAnalyzer.get_improvement_strategies', lambda: ya.get_improvement_strategies(region, crop), False),
+        Case('YieldAnalyzer.predict_yield', lambda: ya.predict_yield(region, crop, 1000.0, 50.0, 100.0), False),
+        Case('YieldAnalyzer.predict_yield_batch', lambda: ya.predict_yield_batch(inputs), True),
+        Case('YieldAnalyzer.train_all_models', lambda: YieldAnalyzer(dp, model_dir=train_dir).train_all_models(), True),
+        Case('YieldAnalyzer.load_models', lambda: YieldAnalyzer(dp, model_dir=model_dir).load_models(), True),
+        Case('YieldAnalyzer.mark_stale', lambda: ya.mark_stale([(region, crop)]), False),
+        Case('DataProcessor.append_rows', lambda: dp.append_rows(new_rows, persist=False), False)
+    ]
+
+def public_methods(cls):
+    """Names of the public methods defined on a class"""
+    return [name for name, value in vars(cls).items() if callable(value) and not name.startswith('_')]
+
+def time_call(call):
+    start = time.perf_counter()
+    call()
+    return time.perf_counter() - start
+
+def run_scale(data_path, columnar_dir, repeat, heavy_max_rows):
+    """Load one dataset in this process and time every case"""
+    import tempfile
+    from app.models.data_processor import DataProcessor
+    from app.models.yield_analyzer import YieldAnalyzer
+    
+    results = []
+    start = time.perf_counter()
+    data_processor = DataProcessor(data_path, columnar_dir=columnar_dir)
+    results.append({'case': 'DataProcessor.__init__', 'cold_s': time.perf_counter() - start, 'warm_s': None})
+    rows = len(data_processor.df)
+    
+    with tempfile.TemporaryDirectory() as model_dir, tempfile.TemporaryDirectory() as train_dir:
+        start = time.perf_counter()
+        yield_analyzer = YieldAnalyzer(data_processor, model_dir=model_dir)
+        results.append({'case': 'YieldAnalyzer.__init__', 'cold_s': time.perf_counter() - start, 'warm_s': None})
+        
+        cases = build_cases(data_processor, yield_analyzer, model_dir, train_dir)
+        for case in cases:
+            if case.heavy and rows > heavy_max_rows:
+                results.append({'case': case.name, 'skipped': f"heavy case above {heavy_max_rows} rows"})
+                continue
+            
+            cold = time_call(case.call)
+            warm = [time_call(case.call) for _ in range(repeat)]
+            results.append({
+                'case': case.name,
+                'cold_s': cold,
+                'warm_s': statistics.median(warm) if warm else None,
+                'warm_min_s': min(warm) if warm else None,
+                'warm_mean_s': statistics.mean(warm) if warm else None
+            })
+    
+    covered = {case.name for case in cases}
+    uncovered = [
+        f"{cls.__name__}.{name}"
+        for cls in (DataProcessor, YieldAnalyzer)
+        for name in public_methods(cls)
+        if f"{cls.__name__}.{name}" not in covered
+    ]
+    return {'rows': rows, 'results': results, 'uncovered': uncovered}
+
+def environment():
+    """Versions and machine details recorded next to the results"""
+    import numpy as np
+    import pandas as pd
+    
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'platform': platform.platform(),
+        'cpus': os.cpu_count()
+    }
+
+def run(args):
+    """Run every scale in a fresh interpreter and write the JSON report"""
+    from app.models.data_processor import DataProcessor
+    
+    report = {'environment': environment(), 'repeat': args.repeat, 'scales': {}}
+    for scale in args.scales:
+        rows = parse_scale(scale)
+        if rows is None:
+            data_path = args.data_path
+            columnar_dir = os.path.join(args.cache_dir, 'real.columnar')
+            # Loading once from CSV writes the columnar copy that is timed below
+            DataProcessor(data_path, columnar_dir=columnar_dir)
+        else:
+            data_path, columnar_dir = synthetic_dataset(args.data_path, rows, args.cache_dir, seed=args.seed)
+        
+        output = subprocess.run(
+            [sys.executable, __file__, 'child', data_path, columnar_dir,
+             '--repeat', str(args.repeat), '--heavy-max-rows', str(args.heavy_max_rows)],
+            check=True, capture_output=True, text=True
+        ).stdout
+        report['scales'][scale] = json.loads(output)
+        print_scale(scale, report['scales'][scale])
+    
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {args.output}")
+    
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        return 1 if print_comparison(baseline, report, args.threshold, args.min_delta) else 0
+    return 0
+
+def print_scale(scale, scale_report):
+    print(f"\n{scale} ({scale_report['rows']} rows)")
+    print(f"{'case':<44}{'cold ms':>12}{'warm ms':>12}")
+    for result in scale_report['results']:
+        if 'skipped' in result:
+            print(f"{result['case']:<44}{'skipped: ' + result['skipped']:>24}")
+            continue
+        warm = f"{result['warm_s'] * 1e3:.3f}" if result['warm_s'] is not None else '-'
+        print(f"{result['case']:<44}{result['cold_s'] * 1e3:>12.3f}{warm:>12}")
+    if scale_report['uncovered']:
+        print(f"Not benchmarked: {', '.join(scale_report['uncovered'])}")
+
+def compare_reports(baseline, current, threshold, min_delta):
+    """
+    Compare two reports case by case
+    
+    A measurement regresses when it is more than ``threshold`` slower
+    relative to the baseline and more than ``min_delta`` seconds slower,
+    which keeps timer noise on sub-millisecond calls from being flagged.
+    
+    Returns:
+        list: One dict per measurement present in both reports
+    """
+    rows = []
+    for scale, scale_report in current['scales'].items():
+        old_results = {result['case']: result for result in baseline.get('scales', {}).get(scale, {}).get('results', [])}
+        for result in scale_report['results']:
+            old = old_results.get(result['case'])
+            if old is None:
+                continue
+            for kind in ('cold_s', 'warm_s'):
+                if result.get(kind) is None or old.get(kind) is None:
+                    continue
+                ratio = result[kind] / old[kind] if old[kind] > 0 else float('inf')
+                rows.append({
+                    'scale': scale,
+                    'case': result['case'],
+                    'kind': kind[:-2],
+                    'baseline_s': old[kind],
+                    'current_s': result[kind],
+                    'ratio': ratio,
+                    'regression': ratio > 1 + threshold and result[kind] - old[kind] > min_delta
+                })
+    return rows
+
+def print_comparison(baseline, current, threshold, min_delta):
+    """Print a comparison table and return the regressions"""
+    rows = compare_reports(baseline, current, threshold, min_delta)
+    print(f"\n{'scale':<8}{'case':<44}{'run':<6}{'baseline ms':>13}{'current ms':>13}{'ratio':>8}")
+    for row in rows:
+        flag = '  REGRESSION' if row['regression'] else ''
+        print(f"{row['scale']:<8}{row['case']:<44}{row['kind']:<6}{row['baseline_s'] * 1e3:>13.3f}"
+              f"{row['current_s'] * 1e3:>13.3f}{row['ratio']:>8.2f}{flag}")
+    
+    regressions = [row for row in rows if row['regression']]
+    print(f"\n{len(regressions)} regressions above {threshold:.0%} in {len(rows)} measurements")
+    return regressions
+
+def compare(args):
+    """Compare two saved reports"""
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    return 1 if print_comparison(baseline, current, args.threshold, args.min_delta) else 0
+
+def child(args):
+    print(json.dumps(run_scale(args.data_path, args.columnar_dir, args.repeat, args.heavy_max_rows)))
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark DataProcessor and YieldAnalyzer")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    
+    def add_threshold_arguments(subparser):
+        subparser.add_argument('--threshold', type=float, default=0.10, help="Relative slowdown flagged as a regression")
+        subparser.add_argument('--min-delta', type=float, default=0.001, help="Absolute slowdown in seconds below which nothing is flagged")
+    
+    run_parser = subparsers.add_parser('run', help="Run the suite and write a JSON report")
+    run_parser.add_argument('--data-path', default=os.path.join(ROOT, 'app/data/crop_yield_dataset.csv'))
+    run_parser.add_argument('--scales', nargs='+', default=['real', '1m', '10m'], help="'real' or a row count such as 1m")
+    run_parser.add_argument('--repeat', type=int, default=5, help="Warm runs per case")
+    run_parser.add_argument('--heavy-max-rows', type=int, default=100000, help="Largest dataset for cases that train every model")
+    run_parser.add_argument('--cache-dir', default=os.path.join(ROOT, 'benchmarks', '.data'), help="Directory of the synthetic datasets")
+    run_parser.add_argument('--seed', type=int, default=0, help="Seed of the synthetic datasets")
+    run_parser.add_argument('--output', default='bench_results.json')
+    run_parser.add_argument('--compare', metavar='BASELINE', help="Report to compare the new results with")
+    add_threshold_arguments(run_parser)
+    run_parser.set_defaults(func=run)
+    
+    compare_parser = subparsers.add_parser('compare', help="Compare two JSON reports")
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    add_threshold_arguments(compare_parser)
+    compare_parser.set_defaults(func=compare)
+    
+    child_parser = subparsers.add_parser('child')
+    child_parser.add_argument('data_path')
+    child_parser.add_argument('columnar_dir')
+    child_parser.add_argument('--repeat', type=int, default=5)
+    child_parser.add_argument('--heavy-max-rows', type=int, default=100000)
+    child_parser.set_defaults(func=child)
+    
+    args = parser.parse_args()
+    sys.exit(args.func(args))
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
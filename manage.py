@@ -0,0 +1,161 @@
+#!/usr/bin/env python
+"""
+Management commands for the Indian Agricultural Yield Analysis application
+
+Usage:
+    python manage.py train-models [--force]
+    python manage.py convert-dataset [--force]
+    python manage.py generate-data --rows 100000000 --output data.csv [--format both]
+    python manage.py importtime [--top 15] [--path /api/yield-by-region]
+"""
+import sys
+import json
+import argparse
+import subprocess
+from collections import defaultdict
+from app.config import settings
+
+def train_models(args):
+    """Train and store a yield model for every region and crop pair"""
+    from app.models.data_processor import DataProcessor
+    from app.models.yield_analyzer import YieldAnalyzer
+    
+    data_processor = DataProcessor(args.data_path, columnar_dir=settings.columnar_dir)
+    yield_analyzer = YieldAnalyzer(data_processor, model_dir=args.model_dir)
+    summary = yield_analyzer.train_all_models(force=args.force)
+    
+    print(f"Trained {summary['trained']} models, reused {summary['reused']}, "
+          f"removed {summary['removed']} stale artifacts in {args.model_dir}")
+
+def convert_dataset(args):
+    """Write the columnar copy of the dataset that later starts memory-map"""
+    from app.models.columnar_store import ColumnarStore
+    from app.models.data_processor import DataProcessor
+    
+    store = ColumnarStore(args.columnar_dir)
+    if store.is_fresh(args.data_path) and not args.force:
+        print(f"Columnar store in {args.columnar_dir} is already up to date")
+        return
+    
+    # The stamp is taken before the CSV is read, so a change made while
+    # loading it leaves the store stale
+    source = ColumnarStore.source_stamp(args.data_path)
+    data_processor = DataProcessor(args.data_path)
+    store.write(data_processor.df, source)
+    print(f"Wrote {len(data_processor.df)} rows to {args.columnar_dir}")
+
+def generate_data(args):
+    """Write a synthetic dataset fitted to the real one"""
+    import time
+    import pandas as pd
+    from app.models.synthetic_data import SyntheticDataGenerator, write_dataset
+    
+    if args.format in ('columnar', 'both') and not args.columnar_dir:
+        sys.exit("--columnar-dir is required for the columnar format")
+    if args.format in ('csv', 'both') and not args.output:
+        sys.exit("--output is required for the csv format")
+    
+    generator = SyntheticDataGenerator.fit(pd.read_csv(args.data_path))
+    start = time.perf_counter()
+    write_dataset(
+        generator, args.rows,
+        csv_path=args.output if args.format in ('csv', 'both') else None,
+        columnar_dir=args.columnar_dir if args.format in ('columnar', 'both') else None,
+        seed=args.seed, chunk_rows=args.chunk_rows
+    )
+    elapsed = time.perf_counter() - start
+    print(f"Wrote {args.rows} rows in {elapsed:.1f} s ({args.rows / max(elapsed, 1e-9):,.0f} rows/s)")
+
+# Runs in a fresh interpreter: builds the app and serves one request in-process
+STARTUP_PROBE = '''
+import sys, json, time, asyncio
+start = time.perf_counter()
+from app.application import create_app
+imported = time.perf_counter()
+application = create_app()
+built = time.perf_counter()
+
+async def first_request(path):
+    status = {}
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+        'method': 'GET', 'scheme': 'http', 'path': path, 'raw_path': path.encode(),
+        'root_path': '', 'query_string': b'', 'headers': [],
+        'server': ('localhost', 8000), 'client': ('127.0.0.1', 0)
+    }
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            status['code'] = message['status']
+    await application(scope, receive, send)
+    return status.get('code')
+
+code = asyncio.run(first_request(sys.argv[1]))
+served = time.perf_counter()
+print(json.dumps({'import': imported - start, 'build': built - imported, 'request': served - built, 'status': code}))
+'''
+
+def importtime(args):
+    """Report where the time to the first served request goes"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', STARTUP_PROBE, args.path],
+        capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        sys.exit(result.stderr)
+    
+    # Lines look like "import time: self [us] | cumulative | package"
+    self_time = defaultdict(int)
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        own, _, name = line[len('import time:'):].split('|')
+        self_time[name.strip().split('.')[0]] += int(own)
+    
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    total = timings['import'] + timings['build'] + timings['request']
+    
+    print(f"{'Imports':<40}{timings['import']:>8.3f} s")
+    for package, micros in sorted(self_time.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"  {package:<30}{micros / 1e6:>8.3f} s")
+    print(f"{'Application build':<40}{timings['build']:>8.3f} s")
+    print(f"{'First request (' + args.path + ')':<40}{timings['request']:>8.3f} s  [{timings['status']}]")
+    print(f"{'Time to first response':<40}{total:>8.3f} s")
+
+def main():
+    parser = argparse.ArgumentParser(description="Indian Agricultural Yield Analysis management commands")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    
+    train_parser = subparsers.add_parser('train-models', help="Train all yield models offline")
+    train_parser.add_argument('--data-path', default=settings.data_path, help="Path to the CSV dataset")
+    train_parser.add_argument('--model-dir', default=settings.model_dir, help="Model registry directory")
+    train_parser.add_argument('--force', action='store_true', help="Retrain models that are already fresh")
+    train_parser.set_defaults(func=train_models)
+    
+    convert_parser = subparsers.add_parser('convert-dataset', help="Write the columnar copy of the dataset")
+    convert_parser.add_argument('--data-path', default=settings.data_path, help="Path to the CSV dataset")
+    convert_parser.add_argument('--columnar-dir', default=settings.columnar_dir, help="Columnar store directory")
+    convert_parser.add_argument('--force', action='store_true', help="Rewrite the store even if it is fresh")
+    convert_parser.set_defaults(func=convert_dataset)
+    
+    generate_parser = subparsers.add_parser('generate-data', help="Write a synthetic dataset with the schema of the real one")
+    generate_parser.add_argument('--rows', type=int, required=True, help="Number of rows")
+    generate_parser.add_argument('--output', help="Path of the CSV file")
+    generate_parser.add_argument('--columnar-dir', help="Directory of the columnar store")
+    generate_parser.add_argument('--format', choices=['csv', 'columnar', 'both'], default='csv', help="Files to write")
+    generate_parser.add_argument('--data-path', default=settings.data_path, help="Real dataset the generator is fitted to")
+    generate_parser.add_argument('--seed', type=int, default=0, help="Seed of the random generator")
+    generate_parser.add_argument('--chunk-rows', type=int, default=1000000, help="Rows generated and written at a time")
+    generate_parser.set_defaults(func=generate_data)
+    
+    importtime_parser = subparsers.add_parser('importtime', help="Report import and startup time up to the first request")
+    importtime_parser.add_argument('--top', type=int, default=15, help="Number of packages to list")
+    importtime_parser.add_argument('--path', default='/api/yield-by-region', help="Path of the first request")
+    importtime_parser.set_defaults(func=importtime)
+    
+    args = parser.parse_args()
+    args.func(args)
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
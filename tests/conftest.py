@@ -0,0 +1,33 @@
+import os
+import sys
+import pandas as pd
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from app.models.data_processor import DataProcessor
+
+DATA_PATH = os.path.join(ROOT, 'app', 'data', 'crop_yield_dataset.csv')
+
+# Views checked by the tests: every row, one crop, one region and one pair
+VIEWS = [(None, None), (None, 'Rice'), ('Western Plateau', None), ('Western Plateau', 'Rice')]
+
+@pytest.fixture(scope='session')
+def data_processor():
+    """In-memory backend on the bundled dataset"""
+    return DataProcessor(DATA_PATH)
+
+@pytest.fixture(scope='session')
+def dataset():
+    """Bundled dataset, cleaned the way the original loader did"""
+    return pd.read_csv(DATA_PATH).dropna()
+
+def view_filter(df, region=None, crop=None):
+    """Rows of a region and crop view, selected with a plain mask"""
+    mask = pd.Series(True, index=df.index)
+    if region:
+        mask &= df['Agro-Climatic Zone'] == region
+    if crop:
+        mask &= df['Crop'] == crop
+    return df[mask]
\ No newline at end of file
@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression
+from conftest import VIEWS, view_filter
+
+def assert_frames_close(actual, expected):
+    pd.testing.assert_frame_equal(
+        actual.reset_index(drop=True),
+        expected.reset_index(drop=True),
+        check_dtype=False,
+        rtol=1e-9
+    )
+
+@pytest.mark.parametrize('crop', [None, 'Rice', 'Cotton'])
+def test_yield_by_region_matches_groupby(data_processor, dataset, crop):
+    rows = view_filter(dataset, crop=crop)
+    expected = rows.groupby('Agro-Climatic Zone')['crop_yield'].agg(['mean', 'std', 'count']).reset_index()
+    expected.columns = ['Region', 'Average Yield', 'Std Dev', 'Sample Count']
+    expected = expected.sort_values('Average Yield', ascending=False)
+    
+    assert_frames_close(data_processor.get_yield_by_region(crop=crop), expected)
+
+@pytest.mark.parametrize('region, crop', VIEWS)
+def test_yield_trend_matches_groupby(data_processor, dataset, region, crop):
+    rows = view_filter(dataset, region, crop)
+    expected = rows.groupby('Year')['crop_yield'].agg(['mean', 'std', 'count']).reset_index()
+    expected.columns = ['Year', 'Average Yield', 'Std Dev', 'Sample Count']
+    expected = expected.sort_values('Year')
+    
+    assert_frames_close(data_processor.get_yield_trend(region=region, crop=crop), expected)
+
+@pytest.mark.parametrize('region, crop', VIEWS)
+def test_correlation_matrix_matches_pandas(data_processor, dataset, region, crop):
+    columns = ['Rainfall (mm)', 'Irrigation (%)', 'Fertilizer Use (kg/ha)', 'crop_yield']
+    expected = view_filter(dataset, region, crop)[columns].corr()
+    
+    actual = data_processor.get_correlation_matrix(region=region, crop=crop)
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False, rtol=1e-9)
+
+@pytest.mark.parametrize('region, crop', VIEWS)
+def test_factor_impact_matches_linear_regression(data_processor, dataset, region, crop):
+    rows = view_filter(dataset, region, crop)
+    features = ['Rainfall (mm)', 'Irrigation (%)', 'Fertilizer Use (kg/ha)']
+    coef = np.abs(LinearRegression().fit(rows[features], rows['crop_yield']).coef_)
+    expected = dict(zip(features, coef / coef.sum() * 100))
+    
+    actual = data_processor.get_factor_impact(region=region, crop=crop)
+    assert actual.keys() == expected.keys()
+    assert np.allclose([actual[f] for f in features], [expected[f] for f in features], rtol=1e-6)
\ No newline at end of file
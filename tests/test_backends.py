@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import pytest
+from conftest import DATA_PATH, VIEWS, view_filter
+from app.models.streaming_processor import StreamingDataProcessor
+from app.models.sharded_processor import ShardedDataProcessor
+
+NUMERIC_FACTORS = ['Rainfall (mm)', 'Irrigation (%)', 'Fertilizer Use (kg/ha)']
+FACTORS = NUMERIC_FACTORS + ['Year', 'Season', 'Soil Type']
+
+# Sketch bin edges are within 1% of the exact rank, so two backends are within 2%
+MAX_EDGE_RANK_GAP = 0.02
+
+@pytest.fixture(scope='module', params=['streaming', 'sharded'])
+def backend(request, tmp_path_factory):
+    """Backend that must answer like the in-memory DataProcessor"""
+    if request.param == 'streaming':
+        # Small chunks so the aggregates are merged across many of them
+        yield StreamingDataProcessor(DATA_PATH, chunk_rows=3000)
+        return
+        
+    processor = ShardedDataProcessor(DATA_PATH, str(tmp_path_factory.mktemp('columnar')), shards=3)
+    yield processor
+    processor.close()
+
+def assert_same(actual, expected):
+    """Compare results of two backends, within floating-point tolerance"""
+    if isinstance(expected, pd.DataFrame):
+        pd.testing.assert_frame_equal(
+            actual.reset_index(drop=True),
+            expected.reset_index(drop=True),
+            check_dtype=False,
+            rtol=1e-9
+        )
+    elif isinstance(expected, dict):
+        assert actual.keys() == expected.keys()
+        for key in expected:
+            assert_same(actual[key], expected[key])
+    else:
+        assert np.allclose(actual, expected, rtol=1e-9)
+
+@pytest.mark.parametrize('crop', [None, 'Rice'])
+def test_yield_by_region(backend, data_processor, crop):
+    assert_same(backend.get_yield_by_region(crop=crop), data_processor.get_yield_by_region(crop=crop))
+
+@pytest.mark.parametrize('region, crop', VIEWS)
+def test_view_aggregates(backend, data_processor, region, crop):
+    for method in ['get_yield_trend', 'get_correlation_matrix', 'get_factor_impact', 'get_view_statistics']:
+        actual = getattr(backend, method)(region=region, crop=crop)
+        assert_same(actual, getattr(data_processor, method)(region=region, crop=crop))
+
+@pytest.mark.parametrize('region, crop', VIEWS)
+@pytest.mark.parametrize('factor', FACTORS)
+def test_yield_by_factor(backend, data_processor, dataset, factor, region, crop):
+    actual = backend.get_yield_by_factor(factor, region=region, crop=crop)
+    expected = data_processor.get_yield_by_factor(factor, region=region, crop=crop)
+    if factor not in NUMERIC_FACTORS or (region and crop):
+        assert_same(actual, expected)
+        return
+        
+    # Sketches merged across partitions are exact only for a region and crop
+    values = np.sort(view_filter(dataset, region, crop)[factor].to_numpy())
+    ranks = [
+        np.searchsorted(values, right_edges(result[f'{factor} Bin']), side='right') / len(values)
+        for result in (actual, expected)
+    ]
+    assert len(actual) == len(expected)
+    assert np.abs(ranks[0] - ranks[1]).max() <= MAX_EDGE_RANK_GAP
+    assert actual['Sample Count'].sum() == expected['Sample Count'].sum()
+
+def right_edges(bins):
+    """Right edges of bin labels such as '(300.059, 636.219]'"""
+    return [float(label.split(', ')[1].rstrip(']')) for label in bins]
+
+def test_all_view_statistics(backend, data_processor):
+    assert_same(backend.get_all_view_statistics(), data_processor.get_all_view_statistics())
+
+def test_training_fingerprints(backend, data_processor):
+    for region, crop in [('Western Plateau', 'Rice'), ('Cauvery Delta Zone', 'Wheat')]:
+        assert backend.get_training_fingerprint(region, crop) == data_processor.get_training_fingerprint(region, crop)
\ No newline at end of file
@@ -0,0 +1,105 @@
+import time
+import shutil
+import threading
+import pandas as pd
+from conftest import DATA_PATH
+from app.models.data_processor import DataProcessor
+from app.models.training_scheduler import TrainingScheduler
+from app.models.yield_analyzer import YieldAnalyzer
+
+def wait_idle(scheduler, timeout=30):
+    """Wait until the scheduler has no queued or running job"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        progress = scheduler.progress()
+        if not progress['queued'] and not progress['running']:
+            return
+        time.sleep(0.01)
+    raise AssertionError("Training jobs did not finish")
+
+def test_request_while_training_queues_again():
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+    
+    def train(region, crop):
+        calls.append((region, crop))
+        started.set()
+        release.wait(10)
+        
+    scheduler = TrainingScheduler(train, lambda region, crop: False)
+    try:
+        scheduler.request('Western Plateau', 'Rice')
+        assert started.wait(10)
+        scheduler.request('Western Plateau', 'Rice', weight=0)
+        release.set()
+        wait_idle(scheduler)
+    finally:
+        scheduler.stop()
+        
+    assert calls == [('Western Plateau', 'Rice')] * 2
+
+def test_request_while_training_skipped_once_ready():
+    release = threading.Event()
+    ready = set()
+    calls = []
+    
+    def train(region, crop):
+        calls.append((region, crop))
+        release.wait(10)
+        ready.add((region, crop))
+        
+    scheduler = TrainingScheduler(train, lambda region, crop: (region, crop) in ready)
+    try:
+        scheduler.request('Western Plateau', 'Rice')
+        while not calls:
+            time.sleep(0.01)
+        scheduler.request('Western Plateau', 'Rice')
+        release.set()
+        wait_idle(scheduler)
+    finally:
+        scheduler.stop()
+        
+    assert calls == [('Western Plateau', 'Rice')]
+
+def test_append_during_slow_training(tmp_path):
+    data_path = str(tmp_path / 'dataset.csv')
+    shutil.copy(DATA_PATH, data_path)
+    data_processor = DataProcessor(data_path)
+    analyzer = YieldAnalyzer(data_processor, model_dir=str(tmp_path / 'models'), background_training=True)
+    
+    # Hold the first fit until rows of its pair have been appended
+    fitting = threading.Event()
+    appended = threading.Event()
+    fitted_rows = []
+    fit_model = analyzer._fit_model
+    
+    def slow_fit(filtered_df):
+        fitted_rows.append(len(filtered_df))
+        fitting.set()
+        appended.wait(10)
+        return fit_model(filtered_df)
+        
+    analyzer._fit_model = slow_fit
+    try:
+        _, provisional = analyzer.predict_yield('Western Plateau', 'Rice', 1000, 50, 100, with_status=True)
+        assert provisional
+        assert fitting.wait(30)
+        
+        rows = pd.read_csv(data_path, dtype=str, keep_default_na=False)
+        rows = rows[(rows['Agro-Climatic Zone'] == 'Western Plateau') & (rows['Crop'] == 'Rice')].head(3)
+        rows, errors = data_processor.validate_rows(rows)
+        assert not errors
+        summary = data_processor.append_rows(rows, persist=False)
+        analyzer.mark_stale(summary['affected'])
+        appended.set()
+        wait_idle(analyzer.scheduler)
+    finally:
+        appended.set()
+        analyzer.scheduler.stop()
+        
+    # The model served and saved is the one fitted on the appended rows
+    assert fitted_rows[-1] == fitted_rows[0] + 3
+    assert analyzer._model_ready('Western Plateau', 'Rice')
+    fingerprint = data_processor.get_training_fingerprint('Western Plateau', 'Rice')
+    assert analyzer.registry.path('Western Plateau', 'Rice', fingerprint) in analyzer.registry.artifacts('Western Plateau', 'Rice')
\ No newline at end of file